@@ -2,7 +2,7 @@ import logging
 import time
 from collections import defaultdict
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
@@ -12,15 +12,26 @@ from datetime import datetime
 
 from models.chat_models import (
     ChatRequest, 
+    BatchChatRequest,
     ChatResponse, 
     StreamingResponse as StreamModel,
     ErrorResponse,
     ConversationSummary
 )
+from models.business_models import BulkBidAnalysisRequest
 from services.chat_service import get_chat_service
+from services.bid_analysis_service import (
+    build_bid_analysis_prompt,
+    extract_bid_fields,
+    extracted_fields_from_bid,
+    get_bid_analysis_service
+)
+from core.bid_parser import build_hotel_bid, get_bid_parser
 from core.config import get_settings
-from core.mock_data import add_new_bid
-from core.mock_data import get_enhanced_mock_data
+from core.business_repository import get_business_repository
+from core.mock_data import add_hotel_bid, add_new_bid
+from core.answer_cache import get_answer_cache
+from core.semantic_cache import get_semantic_cache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -91,7 +102,9 @@ async def chat_endpoint(request: ChatRequest, client_request: Request):
                 # Stream the AI response
                 async for chunk in chat_service.process_message_stream(
                     message=request.message,
-                    conversation_id=conversation_id
+                    conversation_id=conversation_id,
+                    client_ip=client_ip,
+                    skip_semantic_cache=request.skip_semantic_cache
                 ):
                     if chunk:
                         response_content += chunk
@@ -146,9 +159,102 @@ async def chat_endpoint(request: ChatRequest, client_request: Request):
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/chat/batch")
+async def chat_batch_endpoint(request: BatchChatRequest, client_request: Request):
+    """
+    Answer a batch of standalone questions concurrently.
+    Streams one NDJSON line per answer as soon as it completes, then a summary line.
+    The whole batch counts as a single request against the rate limit.
+    """
+    try:
+        if len(request.questions) > settings.max_batch_questions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch exceeds the maximum of {settings.max_batch_questions} questions"
+            )
+        
+        client_ip = client_request.client.host
+        if not check_rate_limit(client_ip):
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded. Please try again later."
+            )
+        
+        chat_service = get_chat_service()
+        if not chat_service:
+            raise HTTPException(
+                status_code=503, 
+                detail="Chat service unavailable"
+            )
+        
+        async def generate_ndjson_stream():
+            start_time = time.time()
+            completed = 0
+            failed = 0
+            
+            try:
+                async for result in chat_service.process_batch(request.questions, client_ip=client_ip):
+                    completed += 1
+                    if result["status"] != "success":
+                        failed += 1
+                    yield json.dumps(result) + "\n"
+                
+            except Exception as e:
+                logger.error(f"Error in batch response: {e}")
+                yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+            
+            yield json.dumps({
+                "type": "summary",
+                "total": len(request.questions),
+                "completed": completed,
+                "failed": failed,
+                "processing_time": time.time() - start_time
+            }) + "\n"
+        
+        return StreamingResponse(
+            generate_ndjson_stream(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in batch endpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+async def _read_upload(request: Request, file: UploadFile) -> bytes:
+    """
+    Read an uploaded bid file, rejecting it before it is read into memory
+    when the request or the file is larger than max_bid_document_mb.
+    """
+    limit = settings.max_bid_document_mb * 1024 * 1024
+    too_large = HTTPException(status_code=413, detail=f"Bid document exceeds {settings.max_bid_document_mb} MB limit")
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit + 64 * 1024:
+        raise too_large  # Allows for the multipart framing around the file
+    if file.size is not None and file.size > limit:
+        raise too_large
+    
+    # The size is unknown for some clients; read one byte past the limit to detect overflow
+    content = await file.read(limit + 1)
+    if len(content) > limit:
+        raise too_large
+    return content
+
+
 @router.post("/process-bid-document")
-async def process_bid_document(file: UploadFile = File(None)):
-    """Process uploaded bid document OR form data - KILLER FEATURE that reduces 2 hours to 2 minutes!"""
+async def process_bid_document(request: Request, file: UploadFile = File(None)):
+    """
+    Process uploaded bid document OR form data - KILLER FEATURE that reduces 2 hours to 2 minutes!
+    A PDF bid document is parsed (pricing tables and key fields) into a validated
+    bid; any other upload is treated as the frontend's JSON form data.
+    """
     try:
         logger.info("=== BID PROCESSING STARTED ===")
         logger.info(f"File received: {file}")
@@ -161,41 +267,33 @@ async def process_bid_document(file: UploadFile = File(None)):
         
         # Extract actual form data from the uploaded file
         extracted_data = {}
+        bid_id = None
+        content = await _read_upload(request, file) if (file and file.filename) else b""
         
-        if file and file.filename:
+        if content.startswith(b"%PDF-"):
+            # Bid document path - parse pricing tables and key fields into a validated bid
+            try:
+                fields = await get_bid_parser().parse(content)
+            except Exception as e:
+                logger.error(f"Failed to parse bid document {file.filename}: {e}")
+                raise HTTPException(status_code=400, detail="Could not read bid document")
+            try:
+                bid = build_hotel_bid(fields)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            
+            bid_id = add_hotel_bid(bid)
+            extracted_data = extracted_fields_from_bid(bid)
+            logger.info(f"✅ Parsed bid document {file.filename}: {bid.hotel_name} - ${bid.total_cost:,.2f}")
+            
+        elif file and file.filename:
             # File upload path - extract JSON data from the blob
-            content = await file.read()
             try:
                 # The frontend sends a JSON blob with the form data
                 form_data = json.loads(content.decode('utf-8'))
                 
                 # Extract the actual form data sent from frontend
-                extracted_data = {
-                    "hotel_name": form_data.get("hotel_name", "Unknown Hotel"),
-                    "hotel_chain": form_data.get("hotel_name", "").split()[0] if form_data.get("hotel_name") else "Unknown",
-                    "contact_person": form_data.get("contact_person", "Unknown Contact"),
-                    "contact_email": f"{form_data.get('contact_person', 'contact').lower().replace(' ', '.')}@{form_data.get('hotel_name', 'hotel').lower().replace(' ', '')}.com",
-                    "contact_phone": "+1-555-0123",  # Could be added to form later
-                    "event_id": form_data.get("event", "Unknown Event"),
-                    "total_cost": float(form_data.get("total_cost", 0)),
-                    "room_rate": float(form_data.get("room_rate", 0)),
-                    "total_rooms": 45,  # Could calculate or add to form
-                    "meeting_space_cost": int(float(form_data.get("total_cost", 0)) * 0.05),  # Estimate 5% of total
-                    "catering_cost_per_person": 95,
-                    "total_catering_cost": 14250,
-                    "av_equipment_cost": 2500,
-                    "taxes": int(float(form_data.get("total_cost", 0)) * 0.12),  # Estimate 12% tax
-                    "deposit_required": int(float(form_data.get("total_cost", 0)) * 0.30),  # 30% deposit
-                    "payment_terms": "50% upfront, 50% on completion",
-                    "cancellation_policy": "Free cancellation up to 72 hours",
-                    "amenities": ["High-speed WiFi", "AV Equipment", "Parking", "Business Center", "Fitness Center"],
-                    "meeting_rooms": ["Grand Ballroom", "Executive Boardroom", "Conference Room A", "Conference Room B"],
-                    "special_features": ["Professional venue", "Dedicated event coordinator"],
-                    "hotel_rating": 4.2,  # Default rating
-                    "past_events": 8,
-                    "success_rate": 78.5,
-                    "response_time_hours": 4
-                }
+                extracted_data = extract_bid_fields(form_data)
                 
                 logger.info(f"✅ Extracted real form data: {form_data}")
                 
@@ -213,43 +311,21 @@ async def process_bid_document(file: UploadFile = File(None)):
                 "event_id": "DEFAULT_EVENT"
             }
         
-        # Simulate realistic processing time
-        await asyncio.sleep(2)
-        
-        # ADD NEW BID TO MOCK DATA using REAL extracted data
-        bid_data = {
-            'hotel_name': extracted_data['hotel_name'],
-            'contact_person': extracted_data['contact_person'], 
-            'total_cost': extracted_data['total_cost'],
-            'room_rate': extracted_data['room_rate'],
-            'event_id': extracted_data['event_id']
-        }
-        bid_id = add_new_bid(bid_data)
-        logger.info(f"✅ Added new bid {bid_id} to mock data with REAL form data")
+        if bid_id is None:
+            # ADD NEW BID TO MOCK DATA using REAL extracted data
+            bid_id = add_new_bid(extracted_data)
+            logger.info(f"✅ Added new bid {bid_id} to mock data with REAL form data")
 
         # Refresh AI data so it knows about the new bid
         chat_service = get_chat_service()
         if chat_service and chat_service.ai_client:
-            chat_service.ai_client.refresh_business_data()
+            await asyncio.to_thread(chat_service.ai_client.refresh_business_data)
             logger.info("🔄 Refreshed AI data with new bid")
         else:
             logger.error("❌ Chat service or AI client not available")
 
         # Use AI to generate insights about the bid using REAL data
-        ai_analysis_prompt = f"""Analyze this hotel bid data and provide competitive insights:
-
-Hotel: {extracted_data['hotel_name']}
-Total Cost: ${extracted_data['total_cost']:,}
-Room Rate: ${extracted_data['room_rate']}/night
-Meeting Space: ${extracted_data.get('meeting_space_cost', 0):,}
-Hotel Rating: {extracted_data['hotel_rating']}/5
-Success Rate: {extracted_data['success_rate']}%
-
-Provide:
-1. Competitive positioning
-2. Value assessment
-3. Key strengths/weaknesses
-4. Recommendation (Accept/Negotiate/Reject)"""
+        ai_analysis_prompt = build_bid_analysis_prompt(extracted_data)
 
         ai_insights = await chat_service.process_message(
             ai_analysis_prompt,
@@ -260,6 +336,7 @@ Provide:
         
         return {
             "status": "success",
+            "bid_id": bid_id,
             "extracted_data": extracted_data,  # Now returns REAL data
             "ai_insights": ai_insights,
             "processing_time": processing_time,
@@ -286,6 +363,45 @@ Provide:
         )
 
 
+@router.post("/bids/bulk-analysis")
+async def submit_bulk_bid_analysis(request: BulkBidAnalysisRequest):
+    """Queue a bulk bid analysis job; results are collected offline through the batch backend."""
+    if len(request.bids) > settings.max_bulk_bids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many bids: {len(request.bids)} (max {settings.max_bulk_bids})"
+        )
+
+    try:
+        job = await get_bid_analysis_service().submit(request.bids)
+        return {"status": "queued", "job": job}
+
+    except Exception as e:
+        logger.error(f"Failed to queue bulk bid analysis: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue job: {str(e)}")
+
+
+@router.get("/bids/bulk-analysis")
+async def list_bulk_bid_analyses(limit: int = 50):
+    """List recent bulk bid analysis jobs."""
+    try:
+        jobs = get_bid_analysis_service().list_jobs(limit)
+        return {"jobs": jobs, "total": len(jobs)}
+
+    except Exception as e:
+        logger.error(f"Failed to list bulk bid analyses: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list jobs")
+
+
+@router.get("/bids/bulk-analysis/{job_id}")
+async def get_bulk_bid_analysis(job_id: str, include_results: bool = True):
+    """Get a bulk bid analysis job's progress and per-bid results."""
+    job = get_bid_analysis_service().get_job(job_id, include_results=include_results)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.get("/conversations")
 async def list_conversations():
     """Get list of all conversations (bonus feature)."""
@@ -416,26 +532,16 @@ async def export_conversation(conversation_id: str, format: str = "markdown"):
 async def get_business_metrics():
     """Get real-time business metrics for dashboard."""
     try:
-        # Get fresh business data
-        chat_service = get_chat_service()
-        if chat_service and chat_service.ai_client and chat_service.ai_client.business_data:
-            business_data = chat_service.ai_client.business_data
-        else:
-            business_data = get_enhanced_mock_data()
-        
-        # Calculate real metrics from mock data
-        events = business_data['events']
-        bids = business_data['bids']
-        dashboard = business_data['dashboard']
-        
-        # Calculate dynamic metrics
-        total_pipeline = sum(bid.total_cost for bid in bids)
-        active_events = len([e for e in events if e.status.value == 'open'])
-        pending_decisions = len([e for e in events if e.status.value == 'evaluating'])
+        # Aggregates and lookups run in the business data store
+        repository = get_business_repository()
+        summary = repository.get_summary()
+        dashboard = repository.get_dashboard(summary)
         
         # Recent events for dashboard - FIX THE DAYSLEFT CALCULATION
+        events = repository.list_events(limit=4)  # Get first 4 events
+        bid_counts = repository.bid_counts_by_event(event.event_id for event in events)
         recent_events = []
-        for event in events[:4]:  # Get first 4 events
+        for event in events:
             # Calculate days left properly
             days_left = (event.rfp_deadline - datetime.now()).days
             
@@ -452,16 +558,16 @@ async def get_business_metrics():
                 "daysLeft": days_left,  # NOW CALCULATED CORRECTLY
                 "progress": 75 if event.status.value == 'evaluating' else 45 if event.status.value == 'open' else 100,
                 "manager": event.assigned_manager,
-                "bidCount": len([b for b in bids if b.event_id == event.event_id])
+                "bidCount": bid_counts[event.event_id]
             })
         
         return {
             "metrics": {
-                "totalPipeline": total_pipeline,
-                "activeEvents": active_events,
-                "pendingDecisions": pending_decisions,
+                "totalPipeline": summary['total_pipeline'],
+                "activeEvents": summary['active_events'],
+                "pendingDecisions": summary['pending_decisions'],
                 "winRate": dashboard.current_win_rate,
-                "avgDealSize": total_pipeline / len(bids) if bids else 0,
+                "avgDealSize": summary['average_deal_size'],
                 "deadlinesThisWeek": dashboard.deadlines_this_week,
                 "newRfpsToday": dashboard.new_rfps_today,
                 "bidsSubmittedToday": dashboard.bids_submitted_today,
@@ -478,16 +584,42 @@ async def get_business_metrics():
 
 # Bonus Feature: Token usage tracking
 @router.get("/usage/tokens")
-async def get_token_usage():
-    """Get token usage statistics (bonus feature)."""
+async def get_token_usage(bucket_seconds: Optional[int] = None, top: int = 10):
+    """
+    Get token usage statistics (bonus feature).
+    Includes per-model, per-conversation and per-client breakdowns plus
+    rollups bucketed by `bucket_seconds` (defaults to the configured bucket width).
+    """
     try:
+        if bucket_seconds is not None and bucket_seconds <= 0:
+            raise HTTPException(status_code=400, detail="bucket_seconds must be positive")
+        
         chat_service = get_chat_service()
         if not chat_service:
             raise HTTPException(status_code=503, detail="Chat service unavailable")
         
-        usage_stats = chat_service.get_token_usage_stats()
+        usage_stats = chat_service.get_token_usage_stats(bucket_seconds=bucket_seconds, top=top)
         return usage_stats
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting token usage: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get LLM answer cache statistics (exact and semantic) and bid document parsing statistics."""
+    try:
+        answer_cache = get_answer_cache()
+        semantic_cache = get_semantic_cache()
+        return {
+            "answer_cache": answer_cache.get_stats() if answer_cache else {"enabled": False},
+            "semantic_cache": semantic_cache.get_stats() if semantic_cache else {"enabled": False},
+            "bid_parser": get_bid_parser().get_stats()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting cache stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
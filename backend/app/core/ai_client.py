@@ -1,9 +1,17 @@
+import asyncio
 import logging
-from typing import List, Dict, Optional, AsyncGenerator
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, AsyncGenerator, Callable, Tuple
 import anthropic
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from core.config import get_settings
-from core.mock_data import get_mock_data, get_enhanced_mock_data
+from core.business_repository import get_business_repository
+from core.answer_cache import get_answer_cache
+from core.semantic_cache import get_semantic_cache
+from core.token_usage import TokenUsageTracker, get_usage_tracker, SYSTEM_CONVERSATION_ID
+from models.business_models import EventStatus
+from models.chat_models import TokenUsage
 
 
 logger = logging.getLogger(__name__)
@@ -18,10 +26,17 @@ class BusinessIntelligenceAIClient:
         self.client = Anthropic(
             api_key=settings.anthropic_api_key
         )
+        # Streams are read on the event loop, so they use the async client
+        self.async_client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key
+        )
         self.model = settings.anthropic_model
         self.max_tokens = settings.max_tokens
         self.temperature = settings.temperature
         
+        # Caps concurrent upstream calls across interactive and batch requests
+        self._upstream_semaphore = asyncio.Semaphore(settings.max_concurrent_upstream_requests)
+        
         # Load business data for context
         self.business_data = None
         self._load_business_data()
@@ -29,17 +44,19 @@ class BusinessIntelligenceAIClient:
     def _load_business_data(self):
         """Load business data for AI context."""
         try:
-            # Get fresh data each time from mock_data
-            self.business_data = get_enhanced_mock_data()
-            logger.info(f"Loaded business data: {len(self.business_data['events'])} events, {len(self.business_data['bids'])} bids")
+            self.business_data = get_business_repository().get_snapshot()
+            summary = self.business_data['summary']
+            logger.info(f"Loaded business data: {summary['total_events']} events, {summary['total_bids']} bids")
         except Exception as e:
             logger.error(f"Failed to load business data: {e}")
             self.business_data = None
         
-    def _build_business_context_prompt(self, user_message: str, conversation_history: List[Dict] = None) -> tuple:
+    def _build_business_context_prompt(self, user_message: str, conversation_history: List[Dict] = None,
+                                       business_data: Optional[Dict] = None) -> tuple:
         """Build the complete prompt with business intelligence context."""
+        business_data = business_data or self.business_data
         
-        if not self.business_data:
+        if not business_data:
             logger.warning("No business data available for context")
             # Fallback system prompt
             system_prompt = """You are MCW Digital's Event Bidding Intelligence Assistant.
@@ -55,15 +72,9 @@ I'm currently unable to access the business data. Please try your query again or
             
             return system_prompt, messages
         
-        # Extract key business metrics
-        events = self.business_data['events']
-        bids = self.business_data['bids']
-        partners = self.business_data['partners']
-        dashboard = self.business_data['dashboard']
-        
-        # Build comprehensive business context
-        active_events = [e for e in events if e.status.value == 'open']
-        total_pipeline = sum([b.total_cost for b in bids])
+        # Extract key business metrics (counted in the business data store)
+        summary = business_data['summary']
+        dashboard = business_data['dashboard']
         
         # Build system message with business intelligence context
         system_prompt = f"""You are MCW Digital's Event Bidding Intelligence Assistant - the AI-powered business intelligence layer for our Event Management Platform.
@@ -75,12 +86,12 @@ IMPORTANT IDENTITY:
 - If asked about your model, say "I'm MCW Digital's AI assistant designed for event bidding intelligence"
 
 BUSINESS CONTEXT - CURRENT DATA SUMMARY:
-- Total Events in System: {len(events)}
-- Active Events (Open for Bidding): {len(active_events)}
-- Total Revenue Pipeline: ${total_pipeline:,.0f}
-- Total Hotel Bids: {len(bids)}
-- Hotel Partners: {len(partners)}
-- Average Deal Size: ${total_pipeline/len(bids) if bids else 0:,.0f}
+- Total Events in System: {summary['total_events']}
+- Active Events (Open for Bidding): {summary['active_events']}
+- Total Revenue Pipeline: ${summary['total_pipeline']:,.0f}
+- Total Hotel Bids: {summary['total_bids']}
+- Hotel Partners: {summary['total_partners']}
+- Average Deal Size: ${summary['average_deal_size']:,.0f}
 
 PLATFORM CAPABILITIES:
 You help users analyze and understand our event bidding business through conversational intelligence. You can provide insights on:
@@ -137,7 +148,7 @@ RESPONSE APPROACH:
 6. Format information for business decision-making
 
 CURRENT BUSINESS SNAPSHOT:
-Active High-Priority Events: {len([e for e in active_events if e.priority.value == 'high'])}
+Active High-Priority Events: {summary['active_high_priority_events']}
 Urgent Deadlines (Next 7 Days): {len(dashboard.urgent_deadlines)}
 Today's Activity: {dashboard.new_rfps_today} new RFPs, {dashboard.bids_submitted_today} bids submitted
 Current Win Rate: {dashboard.current_win_rate:.1f}%
@@ -159,34 +170,50 @@ Remember: You're a business intelligence tool designed to help event managers ma
         
         return system_prompt, messages
     
-    def _get_relevant_data_for_query(self, user_message: str) -> str:
-        """Extract relevant business data based on the user's query."""
-        if not self.business_data:
+    def _get_relevant_data_for_query(self, user_message: str, business_data: Optional[Dict] = None) -> str:
+        """
+        Extract relevant business data based on the user's query.
+        Events and bids are read through the store's indexes and capped by
+        context_max_events and context_max_bids. All reads share one read
+        transaction and leave out bids added after the snapshot was taken, so
+        questions answered against one snapshot see the same records.
+        Blocking; async callers run it in a worker thread.
+        """
+        business_data = business_data or self.business_data
+        if not business_data:
             return ""
         
         query_lower = user_message.lower()
         relevant_data = []
         
-        # Check what type of data the user is asking about
-        if any(word in query_lower for word in ['event', 'events', 'conference', 'meeting']):
-            events = self.business_data['events']
-            relevant_data.append(f"\nCURRENT EVENTS DATA:")
-            for event in events: # Limit to prevent token overflow
-                relevant_data.append(f"• {event.event_name} - {event.client_company}")
-                relevant_data.append(f"  Status: {event.status.value.title()}, Priority: {event.priority.value.title()}")
-                relevant_data.append(f"  Guests: {event.guest_count}, Budget: ${event.budget_min:,} - ${event.budget_max:,}")
-                relevant_data.append(f"  Deadline: {event.rfp_deadline.strftime('%Y-%m-%d')}, Location: {event.preferred_location}")
-        
-        if any(word in query_lower for word in ['hotel', 'bid', 'bids', 'partner', 'venue']):
-            bids = self.business_data['bids']
-            relevant_data.append(f"\nHOTEL BIDDING DATA (Sample):")
-            for bid in bids:  # Shows all 75+ bids... Limit to prevent token overflow in case it does for now
-                relevant_data.append(f"• {bid.hotel_name} - ${bid.total_cost:,.0f}")
-                relevant_data.append(f"  Event ID: {bid.event_id}, Status: {bid.status.value.title()}")
-                relevant_data.append(f"  Rating: {bid.hotel_rating}/5, Response Time: {bid.response_time_hours}h")
+        repository = get_business_repository()
+        with repository.read_transaction():
+            if business_data.get('data_version') and repository.data_version() != business_data['data_version']:
+                logger.debug("Business data changed since the snapshot; listing records up to its last bid")
+            
+            # Check what type of data the user is asking about
+            if any(word in query_lower for word in ['event', 'events', 'conference', 'meeting']):
+                events = self._events_for_query(user_message, repository)
+                relevant_data.append(f"\nCURRENT EVENTS DATA:")
+                for event in events:
+                    relevant_data.append(f"• {event.event_name} - {event.client_company}")
+                    relevant_data.append(f"  Status: {event.status.value.title()}, Priority: {event.priority.value.title()}")
+                    relevant_data.append(f"  Guests: {event.guest_count}, Budget: ${event.budget_min:,} - ${event.budget_max:,}")
+                    relevant_data.append(f"  Deadline: {event.rfp_deadline.strftime('%Y-%m-%d')}, Location: {event.preferred_location}")
+            
+            if any(word in query_lower for word in ['hotel', 'bid', 'bids', 'partner', 'venue']):
+                bids = self._bids_for_query(user_message, repository, business_data.get('last_bid_rowid'))
+                relevant_data.append(f"\nHOTEL BIDDING DATA (Sample):")
+                for bid in bids:
+                    relevant_data.append(f"• {bid.hotel_name} - ${bid.total_cost:,.0f}")
+                    relevant_data.append(f"  Event ID: {bid.event_id}, Status: {bid.status.value.title()}")
+                    rating = f"{bid.hotel_rating}/5" if bid.hotel_rating is not None else "not given"
+                    if "hotel_rating" in bid.estimated_fields:
+                        rating += " (estimated)"
+                    relevant_data.append(f"  Rating: {rating}, Response Time: {bid.response_time_hours}h")
         
         if any(word in query_lower for word in ['revenue', 'pipeline', 'financial', 'money', 'profit']):
-            metrics = self.business_data['metrics']
+            metrics = business_data['metrics']
             relevant_data.append(f"\nFINANCIAL METRICS:")
             relevant_data.append(f"• Total Revenue Pipeline: ${metrics.total_revenue_pipeline:,.0f}")
             relevant_data.append(f"• Confirmed Revenue: ${metrics.confirmed_revenue:,.0f}")
@@ -195,7 +222,7 @@ Remember: You're a business intelligence tool designed to help event managers ma
             relevant_data.append(f"• Win Rate: {metrics.bid_win_rate:.1f}%")
         
         if any(word in query_lower for word in ['deadline', 'urgent', 'priority', 'week', 'today']):
-            dashboard = self.business_data['dashboard']
+            dashboard = business_data['dashboard']
             relevant_data.append(f"\nDEADLINE & PRIORITY DATA:")
             relevant_data.append(f"• Active Events: {dashboard.active_events_count}")
             relevant_data.append(f"• Deadlines This Week: {dashboard.deadlines_this_week}")
@@ -204,75 +231,240 @@ Remember: You're a business intelligence tool designed to help event managers ma
         
         return '\n'.join(relevant_data)
     
-    async def generate_response(self, user_message: str, conversation_history: List[Dict] = None) -> str:
-        """Generate a non-streaming business intelligence response."""
+    @staticmethod
+    def _events_for_query(user_message: str, repository) -> List:
+        """The events a query names by id, otherwise the open events with the soonest RFP deadlines."""
+        event_ids = dict.fromkeys(event_id.upper() for event_id in re.findall(r"\bEVT\w+", user_message, re.IGNORECASE))
+        events = [event for event in map(repository.get_event, event_ids) if event is not None]
+        if events:
+            return events[:settings.context_max_events]
+        return repository.events_due_before(
+            datetime.now() + timedelta(days=settings.context_event_window_days),
+            status=EventStatus.OPEN, limit=settings.context_max_events
+        )
+    
+    @staticmethod
+    def _bids_for_query(user_message: str, repository, up_to_rowid: Optional[int] = None) -> List:
+        """
+        Bids for the events, cities and hotel chains a query names, looked up
+        through the store's indexes; the latest bids when it names none of
+        them. At most context_max_bids are returned.
+        """
+        limit = settings.context_max_bids
+        query_lower = user_message.lower()
+        event_ids = re.findall(r"\bEVT\w+", user_message, re.IGNORECASE)
+        cities = [city for city in repository.bid_cities() if city.lower() in query_lower]
+        chains = [chain for chain in repository.bid_chains() if chain.lower() in query_lower]
+        if not (event_ids or cities or chains):
+            return repository.latest_bids(limit, up_to_rowid=up_to_rowid)
+        
+        bids = {}
+        if event_ids:
+            matching = repository.list_bids(event_ids=[event_id.upper() for event_id in event_ids],
+                                            limit=limit, up_to_rowid=up_to_rowid)
+            for bid in matching:
+                bids[bid.bid_id] = bid
+        if cities or chains:
+            # A city and a chain together narrow the bids; either alone selects them
+            matching = repository.list_bids(cities=cities or None, chains=chains or None,
+                                            limit=limit, up_to_rowid=up_to_rowid)
+            for bid in matching:
+                bids[bid.bid_id] = bid
+        return list(bids.values())[:limit]
+    
+    @staticmethod
+    def _data_version(business_data: Optional[Dict]) -> str:
+        """Get the data version a business snapshot was taken at."""
+        if business_data and business_data.get('data_version'):
+            return business_data['data_version']
+        return get_business_repository().data_version()
+    
+    def get_business_snapshot(self) -> Optional[Dict]:
+        """Refresh and return the current business data so several requests can share it."""
+        self.refresh_business_data()
+        return self.business_data
+    
+    def _answer_cache_entry(self, system_prompt: str, messages: List[Dict], data_version: str) -> Optional[Tuple[str, str]]:
+        """Get the (prompt fingerprint, data version) answer cache entry for a request."""
+        cache = get_answer_cache()
+        if not cache:
+            return None
+        return cache.fingerprint(self.model, system_prompt, messages, self.max_tokens, self.temperature), data_version
+    
+    def _get_cached_answer(self, cache_entry: Optional[Tuple[str, str]]) -> Optional[str]:
+        """Look up a previously generated answer for the same prompt and data version."""
+        cache = get_answer_cache()
+        if not cache or not cache_entry:
+            return None
+        return cache.get(*cache_entry)
+    
+    def _store_answer(self, cache_entry: Optional[Tuple[str, str]], answer: str):
+        """Persist a successful answer so other workers and restarts can reuse it."""
+        cache = get_answer_cache()
+        if cache and cache_entry and answer:
+            cache.put(*cache_entry, answer)
+    
+    @staticmethod
+    def _is_first_turn(conversation_history: List[Dict] = None) -> bool:
+        """Check whether a question stands on its own (no earlier assistant turns)."""
+        return not any(msg["role"] == "assistant" for msg in conversation_history or [])
+    
+    def _get_semantic_answer(self, user_message: str, conversation_history: List[Dict], data_version: str,
+                             skip_semantic_cache: bool = False) -> Optional[str]:
+        """Reuse the answer to a near-duplicate first-turn question, if one is cached."""
+        cache = get_semantic_cache()
+        if not cache or not self._is_first_turn(conversation_history):
+            return None
+        
+        if skip_semantic_cache:
+            cache.record_override(user_message, data_version)
+            return None
+        
+        match = cache.lookup(user_message, data_version)
+        return match.answer if match else None
+    
+    def _remember_semantic_answer(self, user_message: str, conversation_history: List[Dict], answer: str,
+                                  data_version: str):
+        """Index a fresh first-turn answer for similarity lookups."""
+        cache = get_semantic_cache()
+        if cache and answer and self._is_first_turn(conversation_history):
+            cache.add(user_message, answer, data_version)
+    
+    def _report_usage(self, message, on_usage: Optional[Callable[[TokenUsage], None]] = None):
+        """Hand the usage block of an Anthropic message to the caller's usage callback."""
+        try:
+            usage = TokenUsageTracker.usage_from_message(message, self.model)
+            if usage and on_usage:
+                on_usage(usage)
+        except Exception as e:
+            logger.warning(f"Failed to record token usage: {e}")
+    
+    async def generate_response(self, user_message: str, conversation_history: List[Dict] = None,
+                                on_usage: Optional[Callable[[TokenUsage], None]] = None,
+                                skip_semantic_cache: bool = False,
+                                business_data: Optional[Dict] = None,
+                                raise_errors: bool = False) -> str:
+        """
+        Generate a non-streaming business intelligence response.
+        Pass `business_data` (see get_business_snapshot) to answer several
+        questions against one shared snapshot instead of refreshing per call.
+        With `raise_errors`, failures propagate instead of being turned into
+        an apology, so batch callers can count them.
+        """
         try:
             # Auto-refresh business data to get latest bids
-            self.refresh_business_data()
+            if business_data is None:
+                business_data = await asyncio.to_thread(self.get_business_snapshot)
+            data_version = await asyncio.to_thread(self._data_version, business_data)
             
-            system_prompt, messages = self._build_business_context_prompt(user_message, conversation_history)
+            system_prompt, messages = self._build_business_context_prompt(user_message, conversation_history, business_data)
             
             # Add relevant data context to the system prompt
-            relevant_data = self._get_relevant_data_for_query(user_message)
+            relevant_data = await asyncio.to_thread(self._get_relevant_data_for_query, user_message, business_data)
             if relevant_data:
                 system_prompt += relevant_data
             
+            cache_entry = self._answer_cache_entry(system_prompt, messages, data_version)
+            cached_answer = self._get_cached_answer(cache_entry)
+            if cached_answer is not None:
+                logger.info(f"Serving cached business response for: {user_message[:100]}...")
+                return cached_answer
+            
+            semantic_answer = self._get_semantic_answer(user_message, conversation_history, data_version, skip_semantic_cache)
+            if semantic_answer is not None:
+                return semantic_answer
+            
             logger.info(f"Generating business intelligence response for: {user_message[:100]}...")
             
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=messages
-            )
+            # Run the blocking SDK call in a worker thread so concurrent requests overlap
+            async with self._upstream_semaphore:
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=messages
+                )
+            self._report_usage(response, on_usage)
             
             if response.content and len(response.content) > 0:
                 content = response.content[0].text
                 logger.info(f"Generated business response: {len(content)} characters")
+                self._store_answer(cache_entry, content)
+                self._remember_semantic_answer(user_message, conversation_history, content, data_version)
                 return content
             else:
                 logger.error("No response content received from Anthropic")
+                if raise_errors:
+                    raise RuntimeError("No response content received from Anthropic")
                 return "I apologize, but I couldn't generate a business intelligence response. Please try again."
                 
         except anthropic.RateLimitError as e:
             logger.error(f"Anthropic rate limit exceeded: {e}")
+            if raise_errors:
+                raise
             return "I'm currently experiencing high demand. Please try again in a moment."
         except anthropic.APIError as e:
             logger.error(f"Anthropic API error: {e}")
+            if raise_errors:
+                raise
             return "I'm experiencing technical difficulties. Please try again."
         except Exception as e:
             logger.error(f"Unexpected error generating business response: {e}")
+            if raise_errors:
+                raise
             return "I encountered an unexpected error while analyzing business data. Please try again."
     
-    async def generate_streaming_response(self, user_message: str, conversation_history: List[Dict] = None) -> AsyncGenerator[str, None]:
+    async def generate_streaming_response(self, user_message: str, conversation_history: List[Dict] = None,
+                                          on_usage: Optional[Callable[[TokenUsage], None]] = None,
+                                          skip_semantic_cache: bool = False) -> AsyncGenerator[str, None]:
         """Generate a streaming business intelligence response."""
         try:
             # Auto-refresh business data to get latest bids
-            self.refresh_business_data()
+            business_data = await asyncio.to_thread(self.get_business_snapshot)
+            data_version = await asyncio.to_thread(self._data_version, business_data)
             
-            system_prompt, messages = self._build_business_context_prompt(user_message, conversation_history)
+            system_prompt, messages = self._build_business_context_prompt(user_message, conversation_history, business_data)
             
             # Add relevant data context
-            relevant_data = self._get_relevant_data_for_query(user_message)
+            relevant_data = await asyncio.to_thread(self._get_relevant_data_for_query, user_message, business_data)
             if relevant_data:
                 system_prompt += relevant_data
             
+            cache_entry = self._answer_cache_entry(system_prompt, messages, data_version)
+            cached_answer = self._get_cached_answer(cache_entry)
+            if cached_answer is not None:
+                logger.info(f"Serving cached streaming business response for: {user_message[:100]}...")
+                yield cached_answer
+                return
+            
+            semantic_answer = self._get_semantic_answer(user_message, conversation_history, data_version, skip_semantic_cache)
+            if semantic_answer is not None:
+                yield semantic_answer
+                return
+            
             logger.info(f"Generating streaming business response for: {user_message[:100]}...")
             
-            with self.client.messages.stream(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                messages=messages
-            ) as stream:
-                full_response = ""
-                for text in stream.text_stream:
-                    full_response += text
-                    yield text
+            async with self._upstream_semaphore:
+                async with self.async_client.messages.stream(
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=messages
+                ) as stream:
+                    full_response = ""
+                    async for text in stream.text_stream:
+                        full_response += text
+                        yield text
+                    
+                    # Final message carries the complete usage, including cache tokens
+                    self._report_usage(await stream.get_final_message(), on_usage)
             
             logger.info(f"Completed streaming business response: {len(full_response)} characters")
+            self._store_answer(cache_entry, full_response)
+            self._remember_semantic_answer(user_message, conversation_history, full_response, data_version)
                     
         except anthropic.RateLimitError as e:
             logger.error(f"Anthropic rate limit exceeded: {e}")
@@ -292,6 +484,10 @@ Remember: You're a business intelligence tool designed to help event managers ma
                 max_tokens=10,
                 messages=[{"role": "user", "content": "Hello"}]
             )
+            self._report_usage(
+                response,
+                lambda usage: get_usage_tracker().record(usage, conversation_id=SYSTEM_CONVERSATION_ID)
+            )
             return bool(response.content)
         except Exception as e:
             logger.error(f"Anthropic connection validation failed: {e}", exc_info=True)
@@ -305,25 +501,22 @@ Remember: You're a business intelligence tool designed to help event managers ma
             "temperature": self.temperature,
             "api_key_configured": bool(settings.anthropic_api_key),
             "business_data_loaded": bool(self.business_data),
-            "events_count": len(self.business_data['events']) if self.business_data else 0,
-            "bids_count": len(self.business_data['bids']) if self.business_data else 0
+            "events_count": self.business_data['summary']['total_events'] if self.business_data else 0,
+            "bids_count": self.business_data['summary']['total_bids'] if self.business_data else 0
         }
 
     def refresh_business_data(self):
         """Refresh business data - useful for when new events are added."""
         try:
-            # Import here to avoid circular imports
-            from core.mock_data import get_enhanced_mock_data
-            
             # Reload fresh data including new bids
-            self.business_data = get_enhanced_mock_data()
-            logger.info(f"✅ Business data refreshed: {len(self.business_data['events'])} events, {len(self.business_data['bids'])} bids")
+            repository = get_business_repository()
+            self.business_data = repository.get_snapshot()
+            summary = self.business_data['summary']
+            logger.info(f"✅ Business data refreshed: {summary['total_events']} events, {summary['total_bids']} bids")
             
             # Log the latest bids for debugging
-            if self.business_data and 'bids' in self.business_data:
-                latest_bids = self.business_data['bids'][-3:]  # Get last 3 bids
-                for bid in latest_bids:
-                    logger.info(f"   Latest bid: {bid.hotel_name} - ${bid.total_cost:,}")
+            for bid in repository.latest_bids(3):
+                logger.info(f"   Latest bid: {bid.hotel_name} - ${bid.total_cost:,}")
                     
         except Exception as e:
             logger.error(f"Failed to refresh business data: {e}")
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.config import get_settings
+from core.database import connect_sqlite
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class PersistentAnswerCache:
+    """
+    On-disk LLM answer cache shared by every uvicorn worker on the host.
+    Entries are keyed by prompt fingerprint and business data version, stored
+    zlib-compressed, and evicted least-recently-used once the size cap is hit.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """Initialize the cache database at the given path."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = connect_sqlite(self.path)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        """Create the cache table and LRU index if needed."""
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                cache_key TEXT NOT NULL,
+                data_version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (cache_key, data_version)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_last_access ON answers (last_access)")
+
+    @staticmethod
+    def fingerprint(model: str, system_prompt: str, messages: List[Dict], max_tokens: int, temperature: float) -> str:
+        """Build a stable fingerprint for a complete upstream request."""
+        request = {
+            "model": model,
+            "system": system_prompt,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        encoded = json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, cache_key: str, data_version: str) -> Optional[str]:
+        """Get a cached answer, refreshing its LRU position."""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM answers WHERE cache_key = ? AND data_version = ?",
+                (cache_key, data_version)
+            ).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            conn.execute(
+                "UPDATE answers SET last_access = ?, hits = hits + 1 WHERE cache_key = ? AND data_version = ?",
+                (time.time(), cache_key, data_version)
+            )
+            self._hits += 1
+            return zlib.decompress(row[0]).decode("utf-8")
+
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+            return None
+
+    def put(self, cache_key: str, data_version: str, answer: str):
+        """Store an answer and evict least-recently-used entries above the size cap."""
+        try:
+            payload = zlib.compress(answer.encode("utf-8"), 6)
+            now = time.time()
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (cache_key, data_version, payload, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key, data_version, payload, len(payload), now, now)
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        except Exception as e:
+            logger.warning(f"Answer cache store failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least-recently-used entries until the cache fits its size cap."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+
+        victims = []
+        for cache_key, data_version, size in conn.execute(
+            "SELECT cache_key, data_version, size FROM answers ORDER BY last_access"
+        ):
+            victims.append((cache_key, data_version))
+            excess -= size
+            if excess <= 0:
+                break
+
+        conn.executemany("DELETE FROM answers WHERE cache_key = ? AND data_version = ?", victims)
+        self._evictions += len(victims)
+        logger.info(f"Answer cache evicted {len(victims)} entries")
+
+    def clear(self) -> int:
+        """Remove every cached answer and return the number removed."""
+        cursor = self._connection().execute("DELETE FROM answers")
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics (hit counters are per process, sizes are shared)."""
+        try:
+            entries, total_bytes = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers"
+            ).fetchone()
+        except Exception as e:
+            logger.warning(f"Answer cache stats failed: {e}")
+            entries, total_bytes = 0, 0
+
+        lookups = self._hits + self._misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": self._hits / lookups if lookups else 0.0
+        }
+
+
+# Global answer cache instance
+_answer_cache: Optional[PersistentAnswerCache] = None
+
+
+def get_answer_cache() -> Optional[PersistentAnswerCache]:
+    """Get the global answer cache, or None when caching is disabled."""
+    global _answer_cache
+
+    if not settings.answer_cache_enabled:
+        return None
+
+    if _answer_cache is None:
+        try:
+            _answer_cache = PersistentAnswerCache(
+                settings.answer_cache_path,
+                settings.answer_cache_max_mb * 1024 * 1024
+            )
+            logger.info(f"Answer cache initialized at {settings.answer_cache_path}")
+        except Exception as e:
+            logger.error(f"Failed to initialize answer cache: {e}")
+            return None
+
+    return _answer_cache
@@ -0,0 +1,391 @@
+import asyncio
+import io
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pdfplumber
+from pydantic import ValidationError
+
+from core.config import get_settings
+from models.business_models import HotelBid
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# "Label: value" lines outside tables
+_LABEL_LINE = re.compile(r"^([A-Za-z][A-Za-z &/().#-]{1,40}?)\s*:\s*(.*)$")
+_AMOUNT = re.compile(r"\$?\s*(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?")
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+# "Total", "Grand Total", "Total Bid"... but not "Subtotal" or "Total Room Cost"
+_TOTAL_ROW = re.compile(r"^(grand |bid |estimated )?total( bid| cost| due| amount)?$")
+
+# Normalized labels of key fields, as they appear in bid documents
+FIELD_LABELS = {
+    "hotel": "hotel_name",
+    "hotel name": "hotel_name",
+    "property": "hotel_name",
+    "chain": "hotel_chain",
+    "brand": "hotel_chain",
+    "hotel chain": "hotel_chain",
+    "address": "hotel_address",
+    "hotel address": "hotel_address",
+    "city": "hotel_city",
+    "state": "hotel_state",
+    "country": "hotel_country",
+    "rating": "hotel_rating",
+    "star rating": "hotel_rating",
+    "hotel rating": "hotel_rating",
+    "contact": "contact_person",
+    "contact person": "contact_person",
+    "contact name": "contact_person",
+    "email": "contact_email",
+    "contact email": "contact_email",
+    "phone": "contact_phone",
+    "contact phone": "contact_phone",
+    "sales manager": "sales_manager",
+    "event": "event_id",
+    "event id": "event_id",
+    "rfp reference": "event_id",
+    "room rate": "room_rate_per_night",
+    "nightly rate": "room_rate_per_night",
+    "rooms available": "rooms_available",
+    "room block": "rooms_available",
+    "meeting rooms": "meeting_rooms",
+    "max meeting capacity": "max_meeting_capacity",
+    "meeting capacity": "max_meeting_capacity",
+    "amenities": "amenities",
+    "deposit": "deposit",
+    "deposit required": "deposit",
+    "cancellation policy": "cancellation_policy",
+    "cancellation": "cancellation_policy",
+    "payment terms": "payment_terms",
+    "total": "total_cost",
+    "total cost": "total_cost",
+    "grand total": "total_cost"
+}
+# Free-text fields whose value may wrap onto following lines
+WRAPPING_FIELDS = {"hotel_address", "cancellation_policy", "payment_terms", "amenities", "meeting_rooms"}
+# A wrapped line fills the text width; a shorter one ends its paragraph
+WRAPPED_LINE_MIN_CHARS = 60
+LIST_FIELDS = {"amenities", "meeting_rooms"}
+AMOUNT_FIELDS = {"room_rate_per_night", "total_cost"}
+INTEGER_FIELDS = {"rooms_available", "max_meeting_capacity"}
+
+# Pricing table rows by keywords in their description, checked in order
+LINE_ITEMS = [
+    ("meeting_space_cost", ("meeting", "function space", "ballroom")),
+    ("total_catering_cost", ("catering", "food", "f&b", "banquet")),
+    ("av_equipment_cost", ("audio", "a/v", " av ")),
+    ("taxes_and_fees", ("tax",)),
+    ("service_fees", ("service", "gratuity", "resort fee")),
+    ("total_room_cost", ("room", "accommodation", "guest"))
+]
+# Header words marking a table as pricing, and the columns within it
+AMOUNT_HEADERS = ("amount", "total", "cost", "price", "usd", "subtotal")
+UNIT_HEADERS = ("rate", "unit", "per")
+QUANTITY_HEADERS = ("qty", "quantity", "nights", "rooms", "guests", "count")
+
+
+def parse_amount(value: Optional[str]) -> Optional[float]:
+    """Parse a money amount such as "$12,450.00" or "USD 229"."""
+    if not value:
+        return None
+    match = _AMOUNT.search(value)
+    if not match:
+        return None
+    whole, cents = match.groups()
+    return float(whole.replace(",", "") + (f".{cents}" if cents else ""))
+
+
+def _normalize_label(label: str) -> str:
+    return " ".join(re.sub(r"[^a-z&/ ]", " ", label.lower()).split())
+
+
+def _line_item(description: str) -> Optional[str]:
+    """The HotelBid cost field a pricing row's description names."""
+    label = _normalize_label(description)
+    if _TOTAL_ROW.match(label):
+        return "total_cost"
+    text = f" {label} "
+    for field, keywords in LINE_ITEMS:
+        if any(keyword in text for keyword in keywords):
+            return field
+    return None
+
+
+def _column(header: List[str], keywords: Tuple[str, ...], exclude: Optional[int] = None) -> Optional[int]:
+    """Rightmost column whose header contains one of the keywords."""
+    for index in range(len(header) - 1, -1, -1):
+        if index != exclude and any(keyword in header[index] for keyword in keywords):
+            return index
+    return None
+
+
+def parse_pricing_table(rows: List[List[Optional[str]]]) -> Dict[str, float]:
+    """
+    Read cost fields from a table whose header has an amount column.
+    Returns an empty dict for tables that are not pricing tables.
+    """
+    if len(rows) < 2:
+        return {}
+    header = [_normalize_label(cell or "") for cell in rows[0]]
+    amount_column = _column(header, AMOUNT_HEADERS)
+    if amount_column is None or amount_column == 0:
+        return {}
+    unit_column = _column(header, UNIT_HEADERS, exclude=amount_column)
+    quantity_column = _column(header, QUANTITY_HEADERS, exclude=amount_column)
+
+    fields: Dict[str, float] = {}
+    for row in rows[1:]:
+        cells = [(cell or "").replace("\n", " ").strip() for cell in row]
+        if len(cells) <= amount_column or not cells[0]:
+            continue
+        field = _line_item(cells[0])
+        amount = parse_amount(cells[amount_column])
+        if field is None or amount is None:
+            continue
+        # Several rows can feed one field (e.g. two room types); the total row is taken as stated
+        fields[field] = amount if field == "total_cost" else fields.get(field, 0.0) + amount
+
+        unit = parse_amount(cells[unit_column]) if unit_column is not None and unit_column < len(cells) else None
+        quantity = parse_amount(cells[quantity_column]) if quantity_column is not None and quantity_column < len(cells) else None
+        if field == "total_room_cost":
+            if unit is not None:
+                fields.setdefault("room_rate_per_night", unit)
+            if quantity is not None and "rooms" in header[quantity_column]:
+                fields["rooms_available"] = fields.get("rooms_available", 0) + int(quantity)
+        elif field == "total_catering_cost" and unit is not None:
+            fields.setdefault("catering_cost_per_person", unit)
+    return fields
+
+
+def parse_labeled_lines(lines: Iterable[str]) -> Dict[str, str]:
+    """Read "Label: value" key fields from text lines; free-text values may wrap."""
+    fields: Dict[str, str] = {}
+    current = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            current = None
+            continue
+        match = _LABEL_LINE.match(line)
+        field = FIELD_LABELS.get(_normalize_label(match.group(1))) if match else None
+        if field:
+            current = None
+            # The first occurrence wins; later mentions are usually in terms and conditions
+            if match.group(2) and field not in fields:
+                fields[field] = match.group(2).strip()
+                current = field if field in WRAPPING_FIELDS else None
+        elif current and not match:
+            fields[current] = f"{fields[current]} {line}"
+        else:
+            current = None
+        if len(line) < WRAPPED_LINE_MIN_CHARS:
+            current = None
+    return fields
+
+
+def _text_outside_tables(page) -> Tuple[str, List[List[List[Optional[str]]]]]:
+    """A page's text with table regions removed, and the page's tables."""
+    tables = page.find_tables()
+    if not tables:
+        return page.extract_text() or "", []
+
+    boxes = [table.bbox for table in tables]
+
+    def outside(obj) -> bool:
+        center_x = (obj["x0"] + obj["x1"]) / 2
+        center_y = (obj["top"] + obj["bottom"]) / 2
+        return not any(x0 <= center_x <= x1 and top <= center_y <= bottom for x0, top, x1, bottom in boxes)
+
+    return page.filter(outside).extract_text() or "", [table.extract() for table in tables]
+
+
+def _coerce(field: str, value: str) -> Any:
+    """Convert a labeled value to the type HotelBid expects."""
+    if field in AMOUNT_FIELDS:
+        return parse_amount(value)
+    if field in INTEGER_FIELDS:
+        amount = parse_amount(value)
+        return int(amount) if amount is not None else None
+    if field == "hotel_rating":
+        match = re.search(r"\d+(?:\.\d+)?", value)
+        return float(match.group()) if match else None
+    if field in LIST_FIELDS:
+        return [item.strip() for item in re.split(r"[,;]", value) if item.strip()]
+    return value
+
+
+def parse_bid_pdf(content: bytes) -> Dict[str, Any]:
+    """
+    Extract HotelBid fields from a bid PDF.
+    Costs come from pricing tables; key fields such as contact details, room
+    rate, deposit and cancellation policy come from "Label: value" lines
+    outside the tables. Table values win over labeled lines, since totals in
+    prose are often rounded. Runs in pool workers, so it takes and returns
+    plain data.
+    """
+    lines: List[str] = []
+    table_fields: Dict[str, float] = {}
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        page_count = len(pdf.pages)
+        for page in pdf.pages:
+            text, tables = _text_outside_tables(page)
+            # A blank line keeps values from wrapping across pages
+            lines.extend(text.split("\n") + [""])
+            for rows in tables:
+                for field, amount in parse_pricing_table(rows).items():
+                    table_fields.setdefault(field, amount)
+
+    fields: Dict[str, Any] = {}
+    deposit = None
+    for field, value in parse_labeled_lines(lines).items():
+        if field == "deposit":
+            deposit = value
+            continue
+        coerced = _coerce(field, value)
+        if coerced is not None:
+            fields[field] = coerced
+    fields.update(table_fields)
+
+    if deposit:
+        percent = _PERCENT.search(deposit)
+        amount = parse_amount(_PERCENT.sub("", deposit))
+        total = fields.get("total_cost")
+        if percent:
+            fields["deposit_percentage"] = float(percent.group(1))
+        if amount is not None:
+            fields["deposit_required"] = amount
+        elif percent and total:
+            fields["deposit_required"] = round(total * fields["deposit_percentage"] / 100, 2)
+        if amount is not None and not percent and total:
+            fields["deposit_percentage"] = round(amount / total * 100, 2)
+
+    if "hotel_name" in fields and "hotel_chain" not in fields:
+        fields["hotel_chain"] = fields["hotel_name"].split()[0]
+    fields["_pages"] = page_count
+    return fields
+
+
+def build_hotel_bid(fields: Dict[str, Any], bid_id: Optional[str] = None) -> HotelBid:
+    """
+    Validate extracted fields as a HotelBid.
+    Raises ValueError naming the missing or invalid fields.
+    """
+    data = {field: value for field, value in fields.items() if not field.startswith("_")}
+    if bid_id:
+        data["bid_id"] = bid_id
+    data.setdefault("competitive_advantages", ["PDF processed"])
+    try:
+        return HotelBid(**data)
+    except ValidationError as e:
+        problems = [
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ]
+        raise ValueError(f"Bid document is missing or has invalid fields: {'; '.join(problems)}")
+
+
+class BidParser:
+    """
+    Parses bid PDFs in a process pool.
+    PDF layout analysis is CPU-bound, so documents are parsed in worker
+    processes and intake scales with cores instead of blocking the event loop.
+    """
+
+    def __init__(self, workers: int = 0):
+        """Initialize the parser; the pool starts on first use."""
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._parsed = 0
+        self._failed = 0
+        self._pages = 0
+        self._seconds = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                logger.info(f"Bid parser pool started with {self.workers} workers")
+            return self._executor
+
+    def _record(self, fields: Optional[Dict[str, Any]], seconds: float):
+        with self._lock:
+            self._seconds += seconds
+            if fields is None:
+                self._failed += 1
+            else:
+                self._parsed += 1
+                self._pages += fields.get("_pages", 0)
+
+    async def parse(self, content: bytes) -> Dict[str, Any]:
+        """Extract a bid PDF's fields in the pool."""
+        start = time.perf_counter()
+        try:
+            fields = await asyncio.get_running_loop().run_in_executor(self._pool(), parse_bid_pdf, content)
+        except Exception:
+            self._record(None, time.perf_counter() - start)
+            raise
+        self._record(fields, time.perf_counter() - start)
+        return fields
+
+    def parse_many(self, documents: List[bytes]) -> List[Any]:
+        """Extract many bid PDFs in the pool; failed documents yield their exception."""
+        start = time.perf_counter()
+        futures = [self._pool().submit(parse_bid_pdf, content) for content in documents]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        seconds = (time.perf_counter() - start) / max(1, len(documents))
+        for result in results:
+            self._record(None if isinstance(result, Exception) else result, seconds)
+        return results
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get parsing statistics."""
+        with self._lock:
+            documents = self._parsed + self._failed
+            return {
+                "workers": self.workers,
+                "documents_parsed": self._parsed,
+                "documents_failed": self._failed,
+                "pages_parsed": self._pages,
+                "avg_parse_seconds": self._seconds / documents if documents else 0.0
+            }
+
+
+# Global bid parser instance
+_bid_parser: Optional[BidParser] = None
+
+
+def get_bid_parser() -> BidParser:
+    """Get the global bid parser instance."""
+    global _bid_parser
+
+    if _bid_parser is None:
+        _bid_parser = BidParser(settings.bid_parser_workers)
+
+    return _bid_parser
+
+
+def shutdown_bid_parser():
+    """Stop the global bid parser's workers, if started."""
+    if _bid_parser is not None:
+        _bid_parser.shutdown()
@@ -0,0 +1,413 @@
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.config import get_settings
+from core.database import connect_sqlite
+from models.business_models import (
+    Event, HotelBid, HotelPartner, BusinessMetrics,
+    DashboardSummary, EventStatus, EventPriority, BidStatus
+)
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Prefix of bids added at runtime (uploads, bulk intake), numbered in arrival order
+RUNTIME_BID_PREFIX = "BID-NEW-"
+
+
+class BusinessRepository:
+    """
+    SQLite store for events, hotel bids and partners.
+    Each record is kept as its model's JSON next to indexed columns for the
+    fields queries filter on (event, status, deadline, city, chain), so
+    lookups and aggregates run in SQLite instead of scanning Python lists.
+    The database is seeded with generated business data on first use and
+    shared by every uvicorn worker on the host. Generated event dates are
+    relative to the seed time, so data older than business_data_max_age_days
+    is re-seeded (keeping runtime bids) before deadlines drift into the past.
+    """
+
+    def __init__(self, db_path: str):
+        """Initialize the store, seeding it when empty."""
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._init_schema()
+        self._seed_if_needed()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = connect_sqlite(self.db_path)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        """Create business tables and query indexes if needed."""
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                event_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                rfp_deadline TEXT NOT NULL,
+                budget_max REAL NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bids (
+                bid_id TEXT PRIMARY KEY,
+                event_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                hotel_city TEXT NOT NULL,
+                hotel_chain TEXT,
+                total_cost REAL NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS partners (
+                partner_id TEXT PRIMARY KEY,
+                hotel_chain TEXT,
+                primary_location TEXT NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS business_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_status ON events (status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_rfp_deadline ON events (rfp_deadline)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bids_event_id ON bids (event_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bids_status ON bids (status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bids_hotel_city ON bids (hotel_city)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bids_hotel_chain ON bids (hotel_chain)")
+
+    def _needs_seed(self) -> bool:
+        """Whether the store is empty or its generated data is older than business_data_max_age_days."""
+        generated_at = self._get_meta("generated_at")
+        if generated_at is None:
+            return True
+        max_age = settings.business_data_max_age_days
+        return max_age > 0 and datetime.fromisoformat(generated_at) < datetime.now() - timedelta(days=max_age)
+
+    def _seed_if_needed(self):
+        """
+        Load generated business data into an empty store, or replace stale
+        generated data. Runtime bids are kept, after the new seeded bids.
+        """
+        if not self._needs_seed():
+            return
+
+        # Import here to avoid circular imports
+        from core.mock_data import MockDataGenerator
+
+        data = MockDataGenerator().generate_all_mock_data()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have seeded while this one generated
+            if not self._needs_seed():
+                conn.execute("ROLLBACK")
+                return
+            runtime_rows = conn.execute(
+                "SELECT * FROM bids WHERE bid_id LIKE ? ORDER BY rowid", (f"{RUNTIME_BID_PREFIX}%",)
+            ).fetchall()
+            for table in ("events", "bids", "partners"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", [self._event_row(e) for e in data["events"]])
+            conn.executemany("INSERT INTO bids VALUES (?, ?, ?, ?, ?, ?, ?)", [self._bid_row(b) for b in data["bids"]])
+            conn.executemany("INSERT INTO bids VALUES (?, ?, ?, ?, ?, ?, ?)", runtime_rows)
+            conn.executemany("INSERT INTO partners VALUES (?, ?, ?, ?)", [self._partner_row(p) for p in data["partners"]])
+            conn.executemany("INSERT OR REPLACE INTO business_meta (key, value) VALUES (?, ?)", [
+                ("generated_at", data["generated_at"].isoformat()),
+                ("metrics", data["metrics"].model_dump_json()),
+                ("dashboard", data["dashboard"].model_dump_json())
+            ])
+            conn.executemany("INSERT OR IGNORE INTO business_meta (key, value) VALUES (?, ?)", [
+                ("runtime_bids", "0"),
+                ("last_bid_id", "none")
+            ])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"✅ Seeded business data: {len(data['events'])} events, {len(data['bids'])} bids, "
+                    f"{len(data['partners'])} partners ({len(runtime_rows)} runtime bids kept)")
+
+    @contextmanager
+    def read_transaction(self):
+        """Run the enclosed reads (in this thread) against one state of the database."""
+        conn = self._connection()
+        if conn.in_transaction:
+            yield
+            return
+        conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _event_row(event: Event) -> tuple:
+        return (event.event_id, event.status.value, event.priority.value, event.rfp_deadline.isoformat(),
+                event.budget_max, event.model_dump_json())
+
+    @staticmethod
+    def _bid_row(bid: HotelBid) -> tuple:
+        return (bid.bid_id, bid.event_id, bid.status.value, bid.hotel_city or "", bid.hotel_chain,
+                bid.total_cost, bid.model_dump_json())
+
+    @staticmethod
+    def _partner_row(partner: HotelPartner) -> tuple:
+        return (partner.partner_id, partner.hotel_chain, partner.primary_location, partner.model_dump_json())
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM business_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # Events
+
+    def list_events(self, status: Optional[EventStatus] = None, limit: Optional[int] = None) -> List[Event]:
+        """Events in creation order, optionally filtered by status."""
+        sql, params = "SELECT payload FROM events", []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status.value)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Event.model_validate_json(row[0]) for row in self._connection().execute(sql, params)]
+
+    def get_event(self, event_id: str) -> Optional[Event]:
+        """Look up one event by id."""
+        row = self._connection().execute("SELECT payload FROM events WHERE event_id = ?", (event_id,)).fetchone()
+        return Event.model_validate_json(row[0]) if row else None
+
+    def events_due_before(self, deadline: datetime, status: Optional[EventStatus] = None,
+                          limit: Optional[int] = None) -> List[Event]:
+        """Events whose RFP deadline is at or before `deadline`, soonest first."""
+        sql, params = "SELECT payload FROM events WHERE rfp_deadline <= ?", [deadline.isoformat()]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status.value)
+        sql += " ORDER BY rfp_deadline"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Event.model_validate_json(row[0]) for row in self._connection().execute(sql, params)]
+
+    def count_events(self, status: Optional[EventStatus] = None, priority: Optional[EventPriority] = None,
+                     due_before: Optional[datetime] = None) -> int:
+        """Count events matching every given filter."""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if priority is not None:
+            clauses.append("priority = ?")
+            params.append(priority.value)
+        if due_before is not None:
+            clauses.append("rfp_deadline <= ?")
+            params.append(due_before.isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._connection().execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    # Bids
+
+    def list_bids(self, event_ids: Optional[Iterable[str]] = None, status: Optional[BidStatus] = None,
+                  cities: Optional[Iterable[str]] = None, chains: Optional[Iterable[str]] = None,
+                  limit: Optional[int] = None, up_to_rowid: Optional[int] = None) -> List[HotelBid]:
+        """
+        Bids in arrival order, filtered by any of the given events, cities and
+        chains and by status; up_to_rowid (see get_snapshot) leaves out bids
+        added after a snapshot.
+        """
+        clauses, params = [], []
+        if up_to_rowid is not None:
+            clauses.append("rowid <= ?")
+            params.append(up_to_rowid)
+        for column, values in (("event_id", event_ids), ("hotel_city", cities), ("hotel_chain", chains)):
+            if values is not None:
+                values = list(values)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT payload FROM bids{where} ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [HotelBid.model_validate_json(row[0]) for row in self._connection().execute(sql, params)]
+
+    def get_bid(self, bid_id: str) -> Optional[HotelBid]:
+        """Look up one bid by id."""
+        row = self._connection().execute("SELECT payload FROM bids WHERE bid_id = ?", (bid_id,)).fetchone()
+        return HotelBid.model_validate_json(row[0]) if row else None
+
+    def latest_bids(self, count: int, up_to_rowid: Optional[int] = None) -> List[HotelBid]:
+        """The most recently added bids (as of a snapshot's up_to_rowid), oldest first."""
+        sql, params = "SELECT payload FROM bids", []
+        if up_to_rowid is not None:
+            sql += " WHERE rowid <= ?"
+            params.append(up_to_rowid)
+        rows = self._connection().execute(f"{sql} ORDER BY rowid DESC LIMIT ?", params + [count]).fetchall()
+        return [HotelBid.model_validate_json(row[0]) for row in reversed(rows)]
+
+    def bid_costs(self, event_id: Optional[str] = None) -> List[float]:
+        """Total costs of an event's bids, or of every bid."""
+        if event_id is None:
+            rows = self._connection().execute("SELECT total_cost FROM bids")
+        else:
+            rows = self._connection().execute("SELECT total_cost FROM bids WHERE event_id = ?", (event_id,))
+        return [row[0] for row in rows]
+
+    def bid_counts_by_event(self, event_ids: Iterable[str]) -> Dict[str, int]:
+        """Number of bids per event, for the given events."""
+        event_ids = list(event_ids)
+        counts = dict.fromkeys(event_ids, 0)
+        if event_ids:
+            rows = self._connection().execute(
+                f"SELECT event_id, COUNT(*) FROM bids WHERE event_id IN ({', '.join('?' * len(event_ids))}) GROUP BY event_id",
+                event_ids
+            )
+            counts.update(rows)
+        return counts
+
+    def bid_cities(self) -> List[str]:
+        """Distinct hotel cities that have bids."""
+        return [row[0] for row in self._connection().execute("SELECT DISTINCT hotel_city FROM bids WHERE hotel_city != ''")]
+
+    def bid_chains(self) -> List[str]:
+        """Distinct hotel chains that have bids."""
+        return [row[0] for row in self._connection().execute("SELECT DISTINCT hotel_chain FROM bids WHERE hotel_chain IS NOT NULL")]
+
+    def add_bid(self, bid: HotelBid) -> str:
+        """Store a new bid under the next runtime bid id and return the id."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            runtime_bids = int(self._get_meta("runtime_bids") or 0) + 1
+            bid.bid_id = f"{RUNTIME_BID_PREFIX}{runtime_bids:03d}"
+            conn.execute("INSERT INTO bids VALUES (?, ?, ?, ?, ?, ?, ?)", self._bid_row(bid))
+            conn.executemany("INSERT OR REPLACE INTO business_meta (key, value) VALUES (?, ?)", [
+                ("runtime_bids", str(runtime_bids)),
+                ("last_bid_id", bid.bid_id)
+            ])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return bid.bid_id
+
+    # Partners
+
+    def list_partners(self) -> List[HotelPartner]:
+        """All hotel partners."""
+        rows = self._connection().execute("SELECT payload FROM partners ORDER BY rowid")
+        return [HotelPartner.model_validate_json(row[0]) for row in rows]
+
+    # Aggregates
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Record counts and pipeline totals, computed in SQLite."""
+        conn = self._connection()
+        total_bids, total_pipeline = conn.execute("SELECT COUNT(*), COALESCE(SUM(total_cost), 0) FROM bids").fetchone()
+        return {
+            "total_events": self.count_events(),
+            "active_events": self.count_events(status=EventStatus.OPEN),
+            "active_high_priority_events": self.count_events(status=EventStatus.OPEN, priority=EventPriority.HIGH),
+            "pending_decisions": self.count_events(status=EventStatus.EVALUATING),
+            "total_bids": total_bids,
+            "total_pipeline": total_pipeline,
+            "average_deal_size": total_pipeline / total_bids if total_bids else 0,
+            "total_partners": conn.execute("SELECT COUNT(*) FROM partners").fetchone()[0]
+        }
+
+    def get_metrics(self) -> BusinessMetrics:
+        """Business metrics recorded when the store was seeded."""
+        return BusinessMetrics.model_validate_json(self._get_meta("metrics"))
+
+    def get_dashboard(self, summary: Optional[Dict[str, Any]] = None) -> DashboardSummary:
+        """Dashboard summary with counts and pipeline value brought up to date."""
+        summary = summary or self.get_summary()
+        dashboard = DashboardSummary.model_validate_json(self._get_meta("dashboard"))
+        dashboard.active_events_count = summary["active_events"]
+        dashboard.pending_decisions = summary["pending_decisions"]
+        dashboard.total_pipeline_value = summary["total_pipeline"]
+        dashboard.average_deal_size = summary["average_deal_size"]
+        dashboard.deadlines_this_week = self.count_events(
+            status=EventStatus.OPEN, due_before=datetime.now() + timedelta(days=7)
+        )
+        return dashboard
+
+    def data_version(self) -> str:
+        """A version string that changes whenever the business data changes."""
+        generated_at = datetime.fromisoformat(self._get_meta("generated_at"))
+        return f"{generated_at.timestamp():.0f}-{self._get_meta('runtime_bids')}-{self._get_meta('last_bid_id')}"
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Summary, dashboard and metrics at one data version, for building AI
+        context. last_bid_rowid bounds later bid lookups to the bids counted here.
+        """
+        self._seed_if_needed()
+        with self.read_transaction():
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        summary = self.get_summary()
+        return {
+            "summary": summary,
+            "dashboard": self.get_dashboard(summary),
+            "metrics": self.get_metrics(),
+            "data_version": self.data_version(),
+            "last_bid_rowid": self._connection().execute("SELECT COALESCE(MAX(rowid), 0) FROM bids").fetchone()[0]
+        }
+
+    def export_data(self) -> Dict[str, Any]:
+        """Every record, in the shape of MockDataGenerator.generate_all_mock_data."""
+        self._seed_if_needed()
+        with self.read_transaction():
+            snapshot = self._snapshot()
+            bids = self.list_bids()
+            return {
+                "events": self.list_events(),
+                "bids": bids,
+                "partners": self.list_partners(),
+                "metrics": snapshot["metrics"],
+                "dashboard": snapshot["dashboard"],
+                "generated_at": datetime.fromisoformat(self._get_meta("generated_at")),
+                "total_bids": len(bids),
+                "data_version": snapshot["data_version"]
+            }
+
+
+# Global business repository instance
+_business_repository: Optional[BusinessRepository] = None
+
+
+def get_business_repository() -> BusinessRepository:
+    """Get the global business data repository."""
+    global _business_repository
+
+    if _business_repository is None:
+        _business_repository = BusinessRepository(settings.business_db_path)
+        logger.info(f"Business data repository initialized at {settings.business_db_path}")
+
+    return _business_repository
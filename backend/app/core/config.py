@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -16,6 +16,52 @@ class Settings(BaseSettings):
     max_tokens: int = 4000
     temperature: float = 0.7
 
+    # Upstream Concurrency Configuration
+    max_concurrent_upstream_requests: int = 4
+    max_batch_questions: int = 50
+
+    # Business Data Configuration
+    business_db_path: str = "cache/business.db"  # Events, bids and partners, seeded on first start
+    business_data_max_age_days: int = 7  # Re-seed generated data older than this, so deadlines stay ahead; 0 keeps it
+    context_max_events: int = 20  # Events listed in a question's business context
+    context_max_bids: int = 30  # Bids listed in a question's business context
+    context_event_window_days: int = 90  # Listed open events have RFP deadlines within this many days
+
+    # Bulk Bid Analysis Configuration
+    bid_batch_backend: str = "anthropic"  # "anthropic" (Message Batches API) or "local"
+    bid_batch_size: int = 20
+    bid_batch_poll_seconds: int = 30
+    bid_batch_timeout_seconds: int = 86400  # Cancel a message batch that has not ended by then
+    bid_jobs_db_path: str = "cache/bid_jobs.db"
+    bid_job_lease_seconds: int = 120  # A running job is resumed elsewhere once its owner stops renewing
+    max_bulk_bids: int = 500
+
+    # Bid Document Parsing Configuration
+    bid_parser_workers: int = 0  # Worker processes for bid PDF parsing (0 = one per CPU)
+    max_bid_document_mb: int = 20
+
+    # Token Accounting Configuration
+    # Prices in USD per million tokens, matched by longest model name prefix
+    token_prices: Dict[str, Dict[str, float]] = {
+        "claude-opus-4": {"input": 15.0, "output": 75.0, "cache_write": 18.75, "cache_read": 1.50},
+        "claude-sonnet-4": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30},
+        "claude-4-sonnet": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30},
+        "claude-3-5-haiku": {"input": 0.80, "output": 4.0, "cache_write": 1.0, "cache_read": 0.08},
+        "default": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30}
+    }
+    usage_history_size: int = 10000  # Recent responses kept for time-bucketed rollups
+    usage_bucket_seconds: int = 3600
+
+    # Answer Cache Configuration
+    answer_cache_enabled: bool = True
+    answer_cache_path: str = "cache/answer_cache.db"
+    answer_cache_max_mb: int = 64
+
+    # Semantic Cache Configuration
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.75  # Cosine similarity required to reuse an answer; named entities must also match
+    semantic_cache_max_entries: int = 1000
+
     # PDF Configuration
     pdf_path: str = "documents/accessibility_guide.pdf"
 
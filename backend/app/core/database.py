@@ -0,0 +1,16 @@
+import sqlite3
+from pathlib import Path
+
+
+def connect_sqlite(path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite connection tuned for concurrent access.
+    WAL mode lets several uvicorn worker processes on the same host read
+    while one writes; the busy timeout makes writers wait instead of failing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
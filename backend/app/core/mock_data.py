@@ -1,3 +1,4 @@
+import logging
 import random
 import sys
 import os
@@ -11,6 +12,9 @@ from models.business_models import (
     DashboardSummary, EventStatus, EventPriority, 
     EventType, BidStatus
 )
+from core.business_repository import get_business_repository
+
+logger = logging.getLogger(__name__)
 
 
 class MockDataGenerator:
@@ -489,122 +493,82 @@ def get_sample_bids_for_event(event: Event, count: int = 5) -> List[HotelBid]:
     """Get sample bids for a specific event."""
     return mock_generator.generate_hotel_bids([event])[:count]
 
-# Global storage for runtime data
-_runtime_bids = []
-_runtime_events = []
+# Extracted bid fields (see extract_bid_fields) and the HotelBid fields they fill
+_EXTRACTED_BID_FIELDS = {
+    "hotel_city": "hotel_city",
+    "contact_email": "contact_email",
+    "contact_phone": "contact_phone",
+    "total_rooms": "rooms_available",
+    "meeting_space_cost": "meeting_space_cost",
+    "catering_cost_per_person": "catering_cost_per_person",
+    "total_catering_cost": "total_catering_cost",
+    "av_equipment_cost": "av_equipment_cost",
+    "taxes": "taxes_and_fees",
+    "deposit_required": "deposit_required",
+    "payment_terms": "payment_terms",
+    "cancellation_policy": "cancellation_policy",
+    "amenities": "amenities",
+    "meeting_rooms": "meeting_rooms",
+    "special_features": "special_features",
+    "hotel_rating": "hotel_rating",
+    "past_events": "past_events_with_us",
+    "success_rate": "success_rate",
+    "response_time_hours": "response_time_hours",
+    "estimated_fields": "estimated_fields"
+}
+
 
 def add_new_bid(bid_data: dict) -> str:
-    """Add a new bid to the runtime mock data."""
-    print(f"🔍 DEBUG: add_new_bid called with: {bid_data}")
-    print(f"🔍 DEBUG: Current _runtime_bids count: {len(_runtime_bids)}")
-    
+    """
+    Add a new bid built from extracted bid fields to the business data store.
+    Only submitted values are stored; fields the submission left out stay
+    unset, and estimated values keep their estimated_fields marking.
+    """
     try:
-        # Generate new bid ID
-        existing_bids = len(_runtime_bids)
-        bid_id = f"BID-NEW-{existing_bids + 1:03d}"
-        
-        # Create bid object
-        from datetime import datetime
+        bid_fields = {
+            target: bid_data[source] for source, target in _EXTRACTED_BID_FIELDS.items()
+            if bid_data.get(source) is not None
+        }
+        if "estimated_fields" in bid_fields:
+            # Named after the HotelBid fields they fill
+            bid_fields["estimated_fields"] = [
+                _EXTRACTED_BID_FIELDS.get(field, field) for field in bid_fields["estimated_fields"]
+            ]
+        # Create bid object (the repository assigns its id)
         new_bid = HotelBid(
-            bid_id=bid_id,
             event_id=bid_data.get('event_id', 'EVT001'),
             hotel_name=bid_data['hotel_name'],
-            hotel_chain=bid_data.get('hotel_chain', bid_data['hotel_name'].split()[0]),
-            hotel_address=f"123 Business St",
-            hotel_city=bid_data.get('city', 'Downtown'),
-            hotel_country="USA",
-            hotel_rating=4.5,
+            hotel_chain=bid_data.get('hotel_chain') or bid_data['hotel_name'].split()[0],
             contact_person=bid_data['contact_person'],
-            contact_email=f"{bid_data['contact_person'].lower().replace(' ', '.')}@{bid_data['hotel_name'].lower().replace(' ', '')}.com",
-            contact_phone="+1-555-123-4567",
             room_rate_per_night=float(bid_data['room_rate']),
-            total_room_cost=float(bid_data['total_cost']) * 0.6,  # Estimate
-            meeting_space_cost=5000,
-            catering_cost_per_person=75,
-            total_catering_cost=15000,
-            av_equipment_cost=2000,
-            service_fees=float(bid_data['total_cost']) * 0.08,
-            taxes_and_fees=float(bid_data['total_cost']) * 0.12,
             total_cost=float(bid_data['total_cost']),
-            rooms_available=50,
-            meeting_rooms=["Conference Room A", "Boardroom"],
-            max_meeting_capacity=200,
-            amenities=["WiFi", "Parking", "AV Equipment"],
-            cancellation_policy="Standard cancellation policy",
-            deposit_required=float(bid_data['total_cost']) * 0.25,
-            deposit_percentage=25,
-            payment_terms="Net 30",
-            submitted_date=datetime.now(),
-            response_time_hours=2,
             status=BidStatus.SUBMITTED,
-            past_events_with_us=5,
-            success_rate=85.0,
-            average_client_rating=4.3,
-            competitive_advantages=["New bid", "AI processed"]
+            competitive_advantages=["New bid", "AI processed"],
+            **bid_fields
         )
         
-        # Add to runtime storage
-        _runtime_bids.append(new_bid)
-        
-        print(f"✅ Added new bid: {bid_id} for {bid_data['hotel_name']}")
-        print(f"🔍 DEBUG: _runtime_bids count after adding: {len(_runtime_bids)}")
-        
+        # Add to the business data store
+        bid_id = get_business_repository().add_bid(new_bid)
+        logger.info(f"✅ Added new bid: {bid_id} for {bid_data['hotel_name']}")
         return bid_id
         
     except Exception as e:
-        print(f"❌ Error adding bid: {e}")
+        logger.error(f"❌ Error adding bid: {e}")
         return None
 
+def add_hotel_bid(bid: HotelBid) -> str:
+    """Add an already validated bid (e.g. parsed from a bid document) to the business data store."""
+    bid_id = get_business_repository().add_bid(bid)
+    logger.info(f"✅ Added new bid: {bid_id} for {bid.hotel_name}")
+    return bid_id
+
 def get_all_bids_including_new():
     """Get all bids including newly added ones."""
-    # Get original mock bids
-    original_data = mock_generator.generate_all_mock_data()
-    all_bids = original_data['bids'].copy()
-    
-    # Add runtime bids
-    all_bids.extend(_runtime_bids)
-    
-    return all_bids
-
-# Global variable to store consistent data
-_consistent_data = None
+    return get_business_repository().list_bids()
 
 def get_enhanced_mock_data():
-    """Get mock data including any newly added bids."""
-    global _consistent_data
-    
-    # Only generate once, then reuse
-    if _consistent_data is None:
-        _consistent_data = mock_generator.generate_all_mock_data()
-    
-    # Use the same base data every time
-    original_data = _consistent_data.copy()
-    # Create a deep copy of bids to avoid modifying the original
-    original_data['bids'] = original_data['bids'].copy()
-    
-    # Add new runtime bids to the data (only new ones, avoid duplicates)
-    if _runtime_bids:
-        print(f"🔄 Adding {len(_runtime_bids)} runtime bids to business data")
-        # Clear any existing runtime bids first, then add current ones
-        original_data['bids'] = [bid for bid in original_data['bids'] if not hasattr(bid, 'competitive_advantages') or "AI processed" not in bid.competitive_advantages]
-        original_data['bids'].extend(_runtime_bids)
-        
-        # Log the added bids for debugging
-        for bid in _runtime_bids:
-            print(f"   Added runtime bid: {bid.hotel_name} - ${bid.total_cost:,}")
-    
-    # Update counts
-    original_data['total_bids'] = len(original_data['bids'])
-    
-    # Update dashboard metrics to reflect new bids
-    if _runtime_bids:
-        # Recalculate pipeline value including new bids
-        total_pipeline = sum([bid.total_cost for bid in original_data['bids']])
-        original_data['dashboard'].total_pipeline_value = total_pipeline
-        
-        print(f"📊 Updated pipeline value to ${total_pipeline:,}")
-    
-    return original_data
+    """Get all business data, including newly added bids, from the business data store."""
+    return get_business_repository().export_data()
 
 def refresh_business_data_with_new_bids():
     """Refresh the business data to include new bids for AI chat."""
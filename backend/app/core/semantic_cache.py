@@ -0,0 +1,278 @@
+import logging
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from core.business_repository import get_business_repository
+from core.config import get_settings
+from models.business_models import BidStatus, EventPriority, EventStatus
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Width of the hashed feature space; collisions are rare for question-length text
+FEATURE_DIMS = 2048
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "at", "be", "by", "can", "do", "does", "for", "from", "give",
+    "had", "has", "have", "how", "i", "in", "is", "it", "list", "me", "much", "of", "on", "or", "our", "please",
+    "show", "tell", "that", "the", "their", "there", "these", "this", "to", "us", "we",
+    "what", "whats", "which", "who", "with", "you"
+}
+
+# Words that phrase the same ranking or outcome differently
+_SYNONYMS = {
+    "best": "top", "biggest": "top", "highest": "top", "largest": "top", "most": "top",
+    "won": "win", "wins": "win", "winning": "win"
+}
+
+# Status and priority words that select different records, so two questions must agree on them
+_STATUS_TERMS = frozenset(
+    [member.value.replace("_", " ") for enum in (EventStatus, BidStatus, EventPriority) for member in enum]
+    + ["pending"]
+)
+
+
+def _normalize_token(token: str) -> str:
+    """Map synonyms and apply light suffix stripping so simple inflections share features."""
+    token = _SYNONYMS.get(token, token)
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize_question(text: str) -> List[str]:
+    """Split a question into normalized content tokens."""
+    return [
+        _normalize_token(token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS
+    ]
+
+
+def question_entities(text: str, names: Iterable[str] = ()) -> FrozenSet[str]:
+    """
+    The entity terms a question names: event ids, numbers, statuses and
+    priorities, and any of the given names (hotel chains, cities).
+    Questions that differ in these ask about different records.
+    """
+    words = _TOKEN_PATTERN.findall(text.lower())
+    padded = f" {' '.join(words)} "
+    entities = {word for word in words if word.isdigit() or (word.startswith("evt") and len(word) > 3)}
+    for term in _STATUS_TERMS.union(names):
+        phrase = " ".join(_TOKEN_PATTERN.findall(term.lower()))
+        if phrase and f" {phrase} " in padded:
+            entities.add(phrase)
+    return frozenset(entities)
+
+
+def vectorize_question(text: str) -> np.ndarray:
+    """
+    Embed a question as an L2-normalized hashed n-gram vector.
+    Uses word unigrams, word bigrams and character trigrams with signed hashing.
+    """
+    vector = np.zeros(FEATURE_DIMS, dtype=np.float32)
+    tokens = tokenize_question(text)
+
+    features: List[Tuple[str, float]] = [(f"w:{token}", 1.0) for token in tokens]
+    features += [(f"b:{first} {second}", 0.7) for first, second in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"^{token}$"
+        features += [(f"c:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2)]
+
+    for feature, weight in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        vector[digest % FEATURE_DIMS] += sign * weight
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+@dataclass
+class SemanticMatch:
+    """A cached answer whose question is similar to the incoming one."""
+    question: str
+    answer: str
+    similarity: float
+    serial: int
+
+
+class SemanticAnswerCache:
+    """
+    In-memory similarity cache for near-duplicate first-turn questions.
+    Questions are stored as rows of a float32 matrix; lookup is a single
+    matrix-vector product restricted to the current business data version.
+    A stored question only matches when it names exactly the same entities.
+    """
+
+    def __init__(self, threshold: float, max_entries: int,
+                 entity_names: Optional[Callable[[], Iterable[str]]] = None):
+        """
+        Initialize an empty cache with a similarity threshold and row capacity.
+        entity_names supplies the hotel chain and city names to match exactly;
+        it is read again whenever the business data version changes.
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entity_names_source = entity_names
+        self._entity_names: FrozenSet[str] = frozenset()
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((max_entries, FEATURE_DIMS), dtype=np.float32)
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        self._size = 0
+        self._next_row = 0
+        self._next_serial = 0
+        self._data_version: Optional[str] = None
+        # (normalized question, entry serial) pairs reported as false positives
+        self._suppressed: Set[Tuple[str, int]] = set()
+        self._hits = 0
+        self._misses = 0
+        self._overrides = 0
+
+    @staticmethod
+    def _question_key(question: str) -> str:
+        """Normalize a question for false-positive bookkeeping."""
+        return " ".join(tokenize_question(question))
+
+    def _reset_for_version(self, data_version: str):
+        """Drop every entry when the business data changes; cached answers are stale."""
+        if self._data_version == data_version:
+            return
+        if self._size:
+            logger.info(f"Semantic cache reset for data version {data_version}")
+        self._matrix[:] = 0.0
+        self._entries = [None] * self.max_entries
+        self._size = 0
+        self._next_row = 0
+        self._suppressed.clear()
+        self._data_version = data_version
+        if self._entity_names_source:
+            try:
+                self._entity_names = frozenset(self._entity_names_source())
+            except Exception as e:
+                logger.warning(f"Semantic cache could not load entity names: {e}")
+                self._entity_names = frozenset()
+
+    def _best_match(self, question: str) -> Optional[SemanticMatch]:
+        """Find the most similar stored question (caller holds the lock)."""
+        if not self._size:
+            return None
+
+        similarities = self._matrix[:self._size] @ vectorize_question(question)
+        question_key = self._question_key(question)
+        entities = question_entities(question, self._entity_names)
+
+        for row in np.argsort(similarities)[::-1]:
+            similarity = float(similarities[row])
+            if similarity < self.threshold:
+                return None
+            entry = self._entries[row]
+            if entry["entities"] != entities or (question_key, entry["serial"]) in self._suppressed:
+                continue
+            return SemanticMatch(entry["question"], entry["answer"], similarity, entry["serial"])
+
+        return None
+
+    def lookup(self, question: str, data_version: str) -> Optional[SemanticMatch]:
+        """Get a cached answer for a similar question under the same data version."""
+        with self._lock:
+            self._reset_for_version(data_version)
+            match = self._best_match(question)
+            if match:
+                self._hits += 1
+                logger.info(f"Semantic cache hit ({match.similarity:.3f}): '{question[:60]}' ~ '{match.question[:60]}'")
+            else:
+                self._misses += 1
+            return match
+
+    def record_override(self, question: str, data_version: str) -> bool:
+        """
+        Record that the caller rejected the semantic match for this question.
+        The pairing is suppressed so the same phrasing is never matched to that answer again.
+        """
+        with self._lock:
+            self._reset_for_version(data_version)
+            match = self._best_match(question)
+            if not match:
+                return False
+            self._suppressed.add((self._question_key(question), match.serial))
+            self._overrides += 1
+            logger.info(f"Semantic cache false positive recorded: '{question[:60]}' ~ '{match.question[:60]}'")
+            return True
+
+    def add(self, question: str, answer: str, data_version: str):
+        """Store an answer, overwriting the oldest row when full."""
+        if not answer:
+            return
+
+        vector = vectorize_question(question)
+        if not vector.any():
+            return
+
+        with self._lock:
+            self._reset_for_version(data_version)
+            row = self._next_row
+            self._matrix[row] = vector
+            self._entries[row] = {
+                "question": question,
+                "answer": answer,
+                "entities": question_entities(question, self._entity_names),
+                "serial": self._next_serial
+            }
+            self._next_serial += 1
+            self._next_row = (row + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "data_version": self._data_version,
+            "hits": self._hits,
+            "misses": self._misses,
+            "false_positive_overrides": self._overrides,
+            "hit_rate": self._hits / lookups if lookups else 0.0
+        }
+
+
+def _business_entity_names() -> List[str]:
+    """Hotel chains and cities that appear in the business data."""
+    repository = get_business_repository()
+    return repository.bid_chains() + repository.bid_cities()
+
+
+# Global semantic cache instance
+_semantic_cache: Optional[SemanticAnswerCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticAnswerCache]:
+    """Get the global semantic cache, or None when it is disabled."""
+    global _semantic_cache
+
+    if not settings.semantic_cache_enabled:
+        return None
+
+    if _semantic_cache is None:
+        _semantic_cache = SemanticAnswerCache(
+            settings.semantic_cache_threshold,
+            settings.semantic_cache_max_entries,
+            entity_names=_business_entity_names
+        )
+        logger.info("Semantic answer cache initialized")
+
+    return _semantic_cache
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from core.config import get_settings
+from models.chat_models import TokenUsage
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Conversation id used for usage that does not belong to a chat (startup/health probes)
+SYSTEM_CONVERSATION_ID = "system"
+
+_DIMENSIONS = ("conversation", "client", "model")
+
+
+def _empty_totals() -> Dict[str, Any]:
+    """Create an empty usage aggregate."""
+    return {
+        "requests": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_creation_tokens": 0,
+        "cache_read_tokens": 0,
+        "total_tokens": 0,
+        "total_cost": 0.0
+    }
+
+
+def _add_usage(totals: Dict[str, Any], usage: TokenUsage):
+    """Add a single response's usage to an aggregate in place."""
+    totals["requests"] += 1
+    totals["input_tokens"] += usage.prompt_tokens
+    totals["output_tokens"] += usage.completion_tokens
+    totals["cache_creation_tokens"] += usage.cache_creation_tokens
+    totals["cache_read_tokens"] += usage.cache_read_tokens
+    totals["total_tokens"] += usage.total_tokens
+    totals["total_cost"] += usage.estimated_cost or 0.0
+
+
+class TokenUsageTracker:
+    """Aggregates Anthropic token usage per conversation, client IP and model."""
+
+    def __init__(self, price_table: Optional[Dict[str, Dict[str, float]]] = None, history_size: Optional[int] = None):
+        """Initialize the tracker with a price table (USD per million tokens)."""
+        self.price_table = price_table or settings.token_prices
+        self._lock = threading.Lock()
+        self._totals = _empty_totals()
+        self._breakdowns: Dict[str, Dict[str, Dict[str, Any]]] = {
+            dimension: defaultdict(_empty_totals) for dimension in _DIMENSIONS
+        }
+        # Recent (timestamp, usage) pairs used for time-bucketed rollups
+        self._events: Deque[Tuple[float, TokenUsage]] = deque(maxlen=history_size or settings.usage_history_size)
+
+    @staticmethod
+    def usage_from_message(message: Any, model: Optional[str] = None) -> Optional[TokenUsage]:
+        """Convert the `usage` block of an Anthropic message into a TokenUsage record."""
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return None
+
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+
+        return TokenUsage(
+            prompt_tokens=input_tokens,
+            completion_tokens=output_tokens,
+            cache_creation_tokens=cache_creation,
+            cache_read_tokens=cache_read,
+            total_tokens=input_tokens + output_tokens + cache_creation + cache_read,
+            model=model or getattr(message, "model", None)
+        )
+
+    def get_prices(self, model: Optional[str]) -> Dict[str, float]:
+        """Get the price entry for a model, matching the longest configured name prefix."""
+        if model:
+            matches = [name for name in self.price_table if name != "default" and model.startswith(name)]
+            if matches:
+                return self.price_table[max(matches, key=len)]
+        return self.price_table.get("default", {})
+
+    def estimate_cost(self, usage: TokenUsage) -> float:
+        """Estimate the USD cost of a single response."""
+        prices = self.get_prices(usage.model)
+        cost = (
+            usage.prompt_tokens * prices.get("input", 0.0)
+            + usage.completion_tokens * prices.get("output", 0.0)
+            + usage.cache_creation_tokens * prices.get("cache_write", 0.0)
+            + usage.cache_read_tokens * prices.get("cache_read", 0.0)
+        )
+        return cost / 1_000_000
+
+    def record(self, usage: TokenUsage, conversation_id: Optional[str] = None, client_ip: Optional[str] = None) -> TokenUsage:
+        """Record usage for a response and return it with the estimated cost filled in."""
+        usage.estimated_cost = self.estimate_cost(usage)
+
+        with self._lock:
+            _add_usage(self._totals, usage)
+            _add_usage(self._breakdowns["conversation"][conversation_id or SYSTEM_CONVERSATION_ID], usage)
+            _add_usage(self._breakdowns["client"][client_ip or "unknown"], usage)
+            _add_usage(self._breakdowns["model"][usage.model or "unknown"], usage)
+            self._events.append((time.time(), usage))
+
+        logger.debug(f"Recorded token usage: {usage.total_tokens} tokens (${usage.estimated_cost:.6f}) "
+                     f"for conversation {conversation_id}")
+        return usage
+
+    def get_totals(self) -> Dict[str, Any]:
+        """Get usage totals since startup."""
+        with self._lock:
+            return dict(self._totals)
+
+    def get_breakdown(self, dimension: str, top: int = 10) -> List[Dict[str, Any]]:
+        """Get the most expensive keys for a dimension ('conversation', 'client' or 'model')."""
+        if dimension not in self._breakdowns:
+            raise ValueError(f"Unknown usage dimension: {dimension}")
+
+        with self._lock:
+            rows = [{"key": key, **dict(totals)} for key, totals in self._breakdowns[dimension].items()]
+
+        rows.sort(key=lambda row: (row["total_cost"], row["total_tokens"]), reverse=True)
+        return rows[:top] if top > 0 else rows
+
+    def get_rollups(self, bucket_seconds: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Roll recent usage up into fixed-width time buckets, oldest first."""
+        bucket_seconds = max(1, bucket_seconds or settings.usage_bucket_seconds)
+
+        with self._lock:
+            events = list(self._events)
+
+        buckets: Dict[int, Dict[str, Any]] = defaultdict(_empty_totals)
+        for timestamp, usage in events:
+            _add_usage(buckets[int(timestamp // bucket_seconds)], usage)
+
+        return [
+            {
+                "bucket_start": datetime.fromtimestamp(bucket * bucket_seconds).isoformat(),
+                "bucket_seconds": bucket_seconds,
+                **totals
+            }
+            for bucket, totals in sorted(buckets.items())
+        ]
+
+
+# Global usage tracker instance
+_usage_tracker: Optional[TokenUsageTracker] = None
+
+
+def get_usage_tracker() -> TokenUsageTracker:
+    """Get the global token usage tracker instance."""
+    global _usage_tracker
+
+    if _usage_tracker is None:
+        _usage_tracker = TokenUsageTracker()
+        logger.info("Token usage tracker initialized")
+
+    return _usage_tracker
@@ -17,6 +17,8 @@ from core.config import get_settings
 from core.pdf_processor import initialize_pdf_processor
 from core.ai_client import validate_ai_setup
 from services.chat_service import initialize_chat_service
+from services.bid_analysis_service import get_bid_analysis_service
+from core.bid_parser import shutdown_bid_parser
 from api.chat import router as chat_router
 from api.health import router as health_router
 
@@ -46,9 +48,9 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize Business Data
         logger.info("Loading business intelligence data...")
-        from core.mock_data import get_mock_data
-        business_data = get_mock_data()
-        logger.info(f"✅ Business data loaded: {len(business_data['events'])} events, {len(business_data['bids'])} bids")  
+        from core.business_repository import get_business_repository
+        business_summary = get_business_repository().get_summary()
+        logger.info(f"✅ Business data loaded: {business_summary['total_events']} events, {business_summary['total_bids']} bids")  
         
         # Validate AI setup
         logger.info("Validating AI setup...")
@@ -63,6 +65,11 @@ async def lifespan(app: FastAPI):
         logger.info("Initializing chat service...")
         chat_service = initialize_chat_service()
         logger.info("✅ Chat service initialized successfully")
+
+        # Start bulk bid analysis worker (resumes unfinished jobs)
+        bid_analysis_service = get_bid_analysis_service()
+        await bid_analysis_service.start()
+        logger.info("✅ Bulk bid analysis worker started")
         
         logger.info(f"🚀 {settings.app_name} startup complete!")
         
@@ -74,6 +81,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    await get_bid_analysis_service().stop()
+    shutdown_bid_parser()
     logger.info("👋 Application shutdown complete")
 
 
@@ -118,21 +118,21 @@ class HotelBid(BaseModel):
     # Hotel Information
     hotel_name: str = Field(..., min_length=1, max_length=100)
     hotel_chain: str = Field(..., min_length=1, max_length=50)
-    hotel_address: str = Field(..., min_length=1)
-    hotel_city: str = Field(..., min_length=1)
+    hotel_address: Optional[str] = Field(default=None, min_length=1)
+    hotel_city: Optional[str] = Field(default=None, min_length=1)
     hotel_state: Optional[str] = None
     hotel_country: str = Field(default="USA")
-    hotel_rating: float = Field(..., ge=1.0, le=5.0)
+    hotel_rating: Optional[float] = Field(default=None, ge=1.0, le=5.0)
     
     # Contact Information
     contact_person: str = Field(..., min_length=1)
-    contact_email: str = Field(..., pattern=r'^[^@]+@[^@]+\.[^@]+$')
-    contact_phone: str = Field(..., min_length=1)
+    contact_email: Optional[str] = Field(default=None, pattern=r'^[^@]+@[^@]+\.[^@]+$')
+    contact_phone: Optional[str] = Field(default=None, min_length=1)
     sales_manager: Optional[str] = None
     
     # Pricing Breakdown
     room_rate_per_night: float = Field(..., ge=0)
-    total_room_cost: float = Field(..., ge=0)
+    total_room_cost: Optional[float] = Field(default=None, ge=0)
     meeting_space_cost: float = Field(default=0, ge=0)
     catering_cost_per_person: float = Field(default=0, ge=0)
     total_catering_cost: float = Field(default=0, ge=0)
@@ -142,7 +142,7 @@ class HotelBid(BaseModel):
     total_cost: float = Field(..., ge=0)
     
     # Capacity and Amenities
-    rooms_available: int = Field(..., ge=1)
+    rooms_available: Optional[int] = Field(default=None, ge=1)
     meeting_rooms: List[str] = Field(default_factory=list)
     max_meeting_capacity: int = Field(default=0, ge=0)
     amenities: List[str] = Field(default_factory=list)
@@ -166,6 +166,9 @@ class HotelBid(BaseModel):
     success_rate: float = Field(default=0.0, ge=0.0, le=100.0)
     average_client_rating: float = Field(default=0.0, ge=0.0, le=5.0)
     
+    # Fields holding estimates rather than values the hotel submitted
+    estimated_fields: List[str] = Field(default_factory=list)
+    
     # Internal Notes
     internal_notes: str = Field(default="")
     competitive_advantages: List[str] = Field(default_factory=list)
@@ -334,4 +337,21 @@ class BusinessQueryResponse(BaseModel):
     metrics_used: Dict[str, Any] = Field(default_factory=dict)
     suggested_followups: List[str] = Field(default_factory=list)
     conversation_id: str
-    processing_time: float = Field(default=0.0, ge=0)
\ No newline at end of file
+    processing_time: float = Field(default=0.0, ge=0)
+
+# Bulk Bid Analysis Models
+class BulkBidAnalysisRequest(BaseModel):
+    """Bulk bid analysis job request; each bid uses the bid form fields."""
+    bids: List[Dict[str, Any]] = Field(..., min_items=1, description="Bid form payloads to analyze")
+
+    @validator('bids')
+    def validate_bids(cls, v):
+        for index, bid in enumerate(v):
+            if not bid.get('hotel_name'):
+                raise ValueError(f"Bid {index} is missing hotel_name")
+            for field in ('total_cost', 'room_rate', 'hotel_rating', 'success_rate'):
+                try:
+                    float(bid.get(field, 0))
+                except (TypeError, ValueError):
+                    raise ValueError(f"Bid {index} has a non-numeric {field}")
+        return v
@@ -8,6 +8,7 @@ class ChatRequest(BaseModel):
     """Chat message request model."""
     message: str = Field(..., min_length=1, max_length=8000, description="User message")
     conversation_id: Optional[str] = Field(None, description="Optional conversation ID for context")
+    skip_semantic_cache: bool = Field(False, description="Bypass similarity-matched cached answers (reported as a false positive)")
     
     @validator('message')
     def validate_message(cls, v):
@@ -24,6 +25,21 @@ class ChatRequest(BaseModel):
         return v
 
 
+class BatchChatRequest(BaseModel):
+    """Batch of standalone questions answered against one business data snapshot."""
+    questions: List[str] = Field(..., min_length=1, description="Questions to answer")
+    
+    @validator('questions')
+    def validate_questions(cls, v):
+        """Validate and normalize batch questions."""
+        questions = [q.strip() for q in v]
+        if any(not q for q in questions):
+            raise ValueError("Questions cannot be empty or whitespace only")
+        if any(len(q) > 8000 for q in questions):
+            raise ValueError("Questions cannot exceed 8000 characters")
+        return questions
+
+
 class ChatMessage(BaseModel):
     """Individual chat message model."""
     role: str = Field(..., description="Message role: 'user' or 'assistant'")
@@ -140,13 +156,16 @@ class AppStatus(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now, description="Status timestamp")
 
 
-# Bonus Feature Models (for later implementation)
+# Bonus Feature Models
 
 class TokenUsage(BaseModel):
     """Token usage tracking model."""
-    prompt_tokens: int = Field(..., description="Tokens used in prompt")
+    prompt_tokens: int = Field(..., description="Uncached input tokens used in prompt")
     completion_tokens: int = Field(..., description="Tokens used in completion")
+    cache_creation_tokens: int = Field(default=0, description="Input tokens written to the prompt cache")
+    cache_read_tokens: int = Field(default=0, description="Input tokens read from the prompt cache")
     total_tokens: int = Field(..., description="Total tokens used")
+    model: Optional[str] = Field(None, description="Model that served the request")
     estimated_cost: Optional[float] = Field(None, description="Estimated API cost")
 
 
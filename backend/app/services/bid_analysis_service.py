@@ -0,0 +1,609 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.config import get_settings
+from core.business_repository import get_business_repository
+from core.database import connect_sqlite
+from core.mock_data import add_new_bid
+from core.token_usage import TokenUsageTracker, get_usage_tracker
+from models.business_models import HotelBid
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _form_number(form_data: Dict[str, Any], field: str, cast=float) -> Optional[float]:
+    """A numeric form field, or None when the form left it out."""
+    value = form_data.get(field)
+    return cast(float(value)) if value not in (None, "") else None
+
+
+def extract_bid_fields(form_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map submitted bid form data onto the extracted bid fields used for analysis.
+    Fields the form does not carry are None rather than invented; costs
+    derived from the total, and the default rating and success rate, are
+    listed in estimated_fields.
+    """
+    total_cost = float(form_data.get("total_cost", 0))
+    hotel_name = form_data.get("hotel_name", "Unknown Hotel")
+    contact_person = form_data.get("contact_person", "Unknown Contact")
+    estimated_fields = []
+
+    def estimate(field: str, value):
+        """The form's value for a field, or the given estimate, which is recorded as such."""
+        submitted = _form_number(form_data, field)
+        if submitted is not None:
+            return submitted
+        estimated_fields.append(field)
+        return value
+
+    fields = {
+        "hotel_name": hotel_name,
+        "hotel_chain": form_data.get("hotel_name", "").split()[0] if form_data.get("hotel_name") else "Unknown",
+        "contact_person": contact_person,
+        "contact_email": form_data.get("contact_email"),
+        "contact_phone": form_data.get("contact_phone"),
+        "event_id": form_data.get("event", form_data.get("event_id", "Unknown Event")),
+        "total_cost": total_cost,
+        "room_rate": float(form_data.get("room_rate", 0)),
+        "total_rooms": _form_number(form_data, "total_rooms", int),
+        "meeting_space_cost": estimate("meeting_space_cost", int(total_cost * 0.05)),  # 5% of total
+        "catering_cost_per_person": _form_number(form_data, "catering_cost_per_person"),
+        "total_catering_cost": _form_number(form_data, "total_catering_cost"),
+        "av_equipment_cost": _form_number(form_data, "av_equipment_cost"),
+        "taxes": estimate("taxes", int(total_cost * 0.12)),  # 12% tax
+        "deposit_required": estimate("deposit_required", int(total_cost * 0.30)),  # 30% deposit
+        "payment_terms": form_data.get("payment_terms"),
+        "cancellation_policy": form_data.get("cancellation_policy"),
+        "amenities": form_data.get("amenities", []),
+        "meeting_rooms": form_data.get("meeting_rooms", []),
+        "special_features": form_data.get("special_features", []),
+        "hotel_rating": estimate("hotel_rating", 4.2),
+        "past_events": _form_number(form_data, "past_events", int),
+        "success_rate": estimate("success_rate", 78.5),
+        "response_time_hours": _form_number(form_data, "response_time_hours")
+    }
+    fields["estimated_fields"] = estimated_fields
+    return fields
+
+
+def extracted_fields_from_bid(bid: HotelBid) -> Dict[str, Any]:
+    """Map a bid parsed from a bid document onto the extracted bid fields used for analysis."""
+    return {
+        "hotel_name": bid.hotel_name,
+        "hotel_chain": bid.hotel_chain,
+        "hotel_city": bid.hotel_city,
+        "contact_person": bid.contact_person,
+        "contact_email": bid.contact_email,
+        "contact_phone": bid.contact_phone,
+        "event_id": bid.event_id,
+        "total_cost": bid.total_cost,
+        "room_rate": bid.room_rate_per_night,
+        "total_rooms": bid.rooms_available,
+        "total_room_cost": bid.total_room_cost,
+        "meeting_space_cost": bid.meeting_space_cost,
+        "catering_cost_per_person": bid.catering_cost_per_person,
+        "total_catering_cost": bid.total_catering_cost,
+        "av_equipment_cost": bid.av_equipment_cost,
+        "service_fees": bid.service_fees,
+        "taxes": bid.taxes_and_fees,
+        "deposit_required": bid.deposit_required,
+        "deposit_percentage": bid.deposit_percentage,
+        "payment_terms": bid.payment_terms,
+        "cancellation_policy": bid.cancellation_policy,
+        "amenities": bid.amenities,
+        "meeting_rooms": bid.meeting_rooms,
+        "special_features": bid.special_features,
+        "hotel_rating": bid.hotel_rating,
+        "past_events": bid.past_events_with_us,
+        "success_rate": bid.success_rate,
+        "response_time_hours": bid.response_time_hours
+    }
+
+
+def build_bid_analysis_prompt(extracted_data: Dict[str, Any]) -> str:
+    """Build the analysis prompt for a single extracted bid; estimated values are labelled as such."""
+    estimated = set(extracted_data.get("estimated_fields", ()))
+
+    def note(field: str) -> str:
+        return " (estimated)" if field in estimated else ""
+
+    return f"""Analyze this hotel bid data and provide competitive insights:
+
+Hotel: {extracted_data['hotel_name']}
+Total Cost: ${extracted_data['total_cost']:,}
+Room Rate: ${extracted_data['room_rate']}/night
+Meeting Space: ${extracted_data.get('meeting_space_cost', 0):,}{note('meeting_space_cost')}
+Hotel Rating: {extracted_data['hotel_rating']}/5{note('hotel_rating')}
+Success Rate: {extracted_data['success_rate']}%{note('success_rate')}
+
+Provide:
+1. Competitive positioning
+2. Value assessment
+3. Key strengths/weaknesses
+4. Recommendation (Accept/Negotiate/Reject)"""
+
+
+class LeaseLostError(RuntimeError):
+    """Raised when a worker writes to a job whose lease another worker has taken over."""
+
+
+class LocalBatchBackend:
+    """
+    Offline stand-in for the batch API.
+    Produces a rule-based competitive analysis against the stored bids,
+    so bulk jobs can run in tests and without network access.
+    """
+
+    name = "local"
+
+    async def run_batch(self, requests: List[Dict[str, Any]], business_data: Optional[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Analyze every request and return results keyed by custom_id."""
+        return await asyncio.to_thread(
+            lambda: {request["custom_id"]: self._analyze(request["bid"], business_data) for request in requests}
+        )
+
+    @staticmethod
+    def _analyze(bid: Dict[str, Any], business_data: Optional[Dict]) -> Dict[str, Any]:
+        """Compare a bid against other bids for the same event (or all bids)."""
+        repository = get_business_repository()
+        comparables = repository.bid_costs(bid["event_id"]) or repository.bid_costs()
+
+        total_cost = bid["total_cost"]
+        if comparables:
+            cheaper_than = sum(1 for cost in comparables if total_cost <= cost) / len(comparables) * 100
+            median_cost = statistics.median(comparables)
+        else:
+            cheaper_than, median_cost = 50.0, total_cost
+
+        if cheaper_than >= 60 and bid["hotel_rating"] >= 4.0:
+            recommendation = "Accept"
+        elif cheaper_than >= 25:
+            recommendation = "Negotiate"
+        else:
+            recommendation = "Reject"
+
+        strengths = []
+        weaknesses = []
+        (strengths if bid["hotel_rating"] >= 4.0 else weaknesses).append(f"Hotel rating {bid['hotel_rating']}/5")
+        (strengths if bid["success_rate"] >= 75 else weaknesses).append(f"Success rate {bid['success_rate']}%")
+        (strengths if total_cost <= median_cost else weaknesses).append(
+            f"Total cost ${total_cost:,.0f} vs median ${median_cost:,.0f}"
+        )
+
+        analysis = "\n".join([
+            f"1. Competitive positioning: priced at or below {cheaper_than:.0f}% of {len(comparables)} comparable bids.",
+            f"2. Value assessment: {'below' if total_cost <= median_cost else 'above'} the median comparable cost.",
+            f"3. Strengths: {', '.join(strengths) or 'None identified'}. Weaknesses: {', '.join(weaknesses) or 'None identified'}.",
+            f"4. Recommendation: {recommendation}"
+        ])
+        return {"status": "succeeded", "analysis": analysis, "recommendation": recommendation}
+
+
+class AnthropicBatchBackend:
+    """Submits analyses through the Anthropic Message Batches API and polls until they end."""
+
+    name = "anthropic"
+
+    def __init__(self, ai_client):
+        """Initialize with the business intelligence AI client."""
+        self.ai_client = ai_client
+
+    async def run_batch(self, requests: List[Dict[str, Any]], business_data: Optional[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Submit one message batch, wait for it to end and collect results keyed by custom_id."""
+        batch_requests = []
+        for request in requests:
+            system_prompt, messages = self.ai_client._build_business_context_prompt(
+                request["prompt"], None, business_data
+            )
+            relevant_data = await asyncio.to_thread(
+                self.ai_client._get_relevant_data_for_query, request["prompt"], business_data
+            )
+            if relevant_data:
+                system_prompt += relevant_data
+            batch_requests.append({
+                "custom_id": request["custom_id"],
+                "params": {
+                    "model": self.ai_client.model,
+                    "max_tokens": self.ai_client.max_tokens,
+                    "temperature": self.ai_client.temperature,
+                    "system": system_prompt,
+                    "messages": messages
+                }
+            })
+
+        batches = self.ai_client.client.messages.batches
+        batch = await asyncio.to_thread(batches.create, requests=batch_requests)
+        logger.info(f"Submitted message batch {batch.id} with {len(batch_requests)} requests")
+
+        deadline = time.monotonic() + settings.bid_batch_timeout_seconds
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                await asyncio.to_thread(batches.cancel, batch.id)
+                raise TimeoutError(f"Message batch {batch.id} did not end within {settings.bid_batch_timeout_seconds}s")
+            await asyncio.sleep(settings.bid_batch_poll_seconds)
+            batch = await asyncio.to_thread(batches.retrieve, batch.id)
+
+        entries = await asyncio.to_thread(lambda: list(batches.results(batch.id)))
+        tracker = get_usage_tracker()
+        results = {}
+        for entry in entries:
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                usage = TokenUsageTracker.usage_from_message(message, self.ai_client.model)
+                if usage:
+                    job_id = entry.custom_id.rsplit("-", 1)[0]
+                    tracker.record(usage, conversation_id=f"bulk-{job_id}")
+                text = message.content[0].text if message.content else ""
+                results[entry.custom_id] = {"status": "succeeded", "analysis": text}
+            else:
+                error = getattr(entry.result, "error", None)
+                results[entry.custom_id] = {"status": entry.result.type, "error": str(error or entry.result.type)}
+        return results
+
+
+class BidAnalysisJobService:
+    """
+    Queue-backed bulk bid analysis.
+    Jobs and per-bid results are persisted in SQLite; a single background worker
+    drains the queue and submits analyses in batches through the configured
+    backend, outside the interactive chat concurrency limit.
+    Every uvicorn worker runs this service against the same database, so a
+    job is claimed before it runs and its owner renews a lease while it
+    works; a running job whose lease expired (its owner died) is claimed again.
+    """
+
+    def __init__(self, db_path: str, backend):
+        """Initialize the job store and backend."""
+        self.db_path = Path(db_path)
+        self.backend = backend
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._local = threading.local()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = connect_sqlite(self.db_path)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        """Create job tables if needed."""
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bid_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                owner TEXT,
+                lease_expires REAL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        # Job stores created before jobs were claimed lack the lease columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(bid_jobs)")}
+        for column, column_type in (("owner", "TEXT"), ("lease_expires", "REAL")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE bid_jobs ADD COLUMN {column} {column_type}")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bid_job_items (
+                job_id TEXT NOT NULL,
+                item_index INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                bid_id TEXT,
+                extracted_data TEXT NOT NULL,
+                analysis TEXT,
+                error TEXT,
+                PRIMARY KEY (job_id, item_index)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bid_jobs_status ON bid_jobs (status)")
+
+    async def start(self):
+        """Start the background worker and resume jobs interrupted by a restart."""
+        if self._worker_task and not self._worker_task.done():
+            return
+
+        self._queue = asyncio.Queue()
+        unfinished = await self._enqueue_claimable()
+        if unfinished:
+            logger.info(f"Found {unfinished} unfinished bulk bid analysis jobs to resume")
+
+        self._worker_task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        """Stop the background worker; unfinished jobs resume on next start."""
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+    def _claimable_jobs(self) -> List[str]:
+        """Queued jobs, and running jobs whose owner let the lease expire."""
+        rows = self._connection().execute(
+            "SELECT job_id FROM bid_jobs WHERE status = 'queued' "
+            "OR (status = 'running' AND (lease_expires IS NULL OR lease_expires < ?)) ORDER BY created_at",
+            (time.time(),)
+        ).fetchall()
+        return [job_id for (job_id,) in rows]
+
+    async def _enqueue_claimable(self) -> int:
+        """Queue every job this worker could claim; claiming happens when it is taken off the queue."""
+        job_ids = await asyncio.to_thread(self._claimable_jobs)
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        return len(job_ids)
+
+    def _claim(self, job_id: str) -> bool:
+        """Atomically take a queued job, or a running one with an expired lease, for this worker."""
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE bid_jobs SET status = 'running', owner = ?, lease_expires = ?, updated_at = ? "
+            "WHERE job_id = ? AND (status = 'queued' "
+            "OR (status = 'running' AND (lease_expires IS NULL OR lease_expires < ?)))",
+            (self.owner, now + settings.bid_job_lease_seconds, datetime.now().isoformat(), job_id, now)
+        )
+        return cursor.rowcount == 1
+
+    def _renew_lease(self, job_id: str) -> bool:
+        """Extend this worker's lease on a job; False when another worker has taken it over."""
+        cursor = self._connection().execute(
+            "UPDATE bid_jobs SET lease_expires = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+            (time.time() + settings.bid_job_lease_seconds, job_id, self.owner)
+        )
+        return cursor.rowcount == 1
+
+    async def _keep_lease(self, job_id: str, job_task: asyncio.Task):
+        """Renew a job's lease until cancelled; cancel the job's processing if the lease is lost."""
+        while True:
+            await asyncio.sleep(max(1, settings.bid_job_lease_seconds / 3))
+            if not await asyncio.to_thread(self._renew_lease, job_id):
+                logger.warning(f"Lost the lease on bulk bid analysis job {job_id}; abandoning it")
+                job_task.cancel()
+                return
+
+    async def submit(self, bids: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Persist and queue a new bulk analysis job."""
+        await self.start()
+
+        job_id = uuid.uuid4().hex[:16]
+        items = [(job_id, index, "pending", json.dumps(extract_bid_fields(bid))) for index, bid in enumerate(bids)]
+        await asyncio.to_thread(self._insert_job, job_id, items)
+
+        self._queue.put_nowait(job_id)
+        logger.info(f"Queued bulk bid analysis job {job_id} with {len(items)} bids")
+        return await asyncio.to_thread(self.get_job, job_id)
+
+    def _insert_job(self, job_id: str, items: List[tuple]):
+        """Persist a new queued job and its pending items."""
+        now = datetime.now().isoformat()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO bid_jobs (job_id, status, backend, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "queued", self.backend.name, len(items), now, now)
+            )
+            conn.executemany(
+                "INSERT INTO bid_job_items (job_id, item_index, status, extracted_data) VALUES (?, ?, ?, ?)",
+                items
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def _worker(self):
+        """Process queued jobs one at a time, rescanning for abandoned jobs when idle."""
+        while True:
+            try:
+                job_id = await asyncio.wait_for(self._queue.get(), timeout=settings.bid_job_lease_seconds)
+            except asyncio.TimeoutError:
+                await self._enqueue_claimable()
+                continue
+            try:
+                if not await asyncio.to_thread(self._claim, job_id):
+                    continue  # Finished, or running in another worker
+                job_task = asyncio.create_task(self._process_job(job_id))
+                lease = asyncio.create_task(self._keep_lease(job_id, job_task))
+                try:
+                    await job_task
+                except asyncio.CancelledError:
+                    if not lease.done():
+                        raise  # The worker itself is stopping
+                finally:
+                    lease.cancel()
+            except asyncio.CancelledError:
+                raise
+            except LeaseLostError as e:
+                logger.warning(f"Abandoned bulk bid analysis job {job_id}: {e}")
+            except Exception as e:
+                logger.error(f"Bulk bid analysis job {job_id} failed: {e}")
+                await asyncio.to_thread(self._update_job, job_id, "failed", str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _process_job(self, job_id: str):
+        """Add a claimed job's pending bids to the pipeline and analyze them in batches."""
+        from services.chat_service import get_chat_service
+
+        items = await asyncio.to_thread(self._register_bids, job_id)
+
+        ai_client = get_chat_service().ai_client
+        business_data = await asyncio.to_thread(ai_client.get_business_snapshot)
+
+        batch_size = max(1, settings.bid_batch_size)
+        for offset in range(0, len(items), batch_size):
+            batch = items[offset:offset + batch_size]
+            requests = [
+                {
+                    "custom_id": f"{job_id}-{item_index}",
+                    "bid": extracted_data,
+                    "prompt": build_bid_analysis_prompt(extracted_data)
+                }
+                for item_index, extracted_data in batch
+            ]
+
+            start_time = time.time()
+            results = await self.backend.run_batch(requests, business_data)
+            await asyncio.to_thread(self._store_results, job_id, batch, results)
+            logger.info(f"Job {job_id}: analyzed {offset + len(batch)}/{len(items)} bids "
+                        f"(batch took {time.time() - start_time:.2f}s)")
+
+        await asyncio.to_thread(self._update_job, job_id, "completed")
+
+    def _register_bids(self, job_id: str) -> List[tuple]:
+        """
+        Add a job's pending bids to the pipeline and return (item index, extracted data) pairs.
+        Registered bid ids are saved per item, so a resumed job does not add them again.
+        """
+        conn = self._connection()
+        pending = conn.execute(
+            "SELECT item_index, extracted_data, bid_id FROM bid_job_items "
+            "WHERE job_id = ? AND status = 'pending' ORDER BY item_index",
+            (job_id,)
+        ).fetchall()
+
+        # Register bids first so every analysis compares against the full intake
+        items = []
+        for item_index, extracted_json, bid_id in pending:
+            extracted_data = json.loads(extracted_json)
+            if not bid_id:
+                bid_id = add_new_bid(extracted_data)
+                conn.execute(
+                    "UPDATE bid_job_items SET bid_id = ? WHERE job_id = ? AND item_index = ?",
+                    (bid_id, job_id, item_index)
+                )
+            items.append((item_index, extracted_data))
+        return items
+
+    def _store_results(self, job_id: str, batch: List, results: Dict[str, Dict[str, Any]]):
+        """
+        Persist one batch of results and update job progress.
+        Nothing is written unless this worker still owns the job, so a worker
+        whose lease was taken over cannot count the batch a second time.
+        """
+        conn = self._connection()
+        completed = failed = 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for item_index, _ in batch:
+                result = results.get(f"{job_id}-{item_index}", {"status": "missing", "error": "No result returned"})
+                if result["status"] == "succeeded":
+                    completed += 1
+                    conn.execute(
+                        "UPDATE bid_job_items SET status = 'completed', analysis = ? "
+                        "WHERE job_id = ? AND item_index = ? AND status = 'pending'",
+                        (result["analysis"], job_id, item_index)
+                    )
+                else:
+                    failed += 1
+                    conn.execute(
+                        "UPDATE bid_job_items SET status = 'failed', error = ? "
+                        "WHERE job_id = ? AND item_index = ? AND status = 'pending'",
+                        (result.get("error", result["status"]), job_id, item_index)
+                    )
+            cursor = conn.execute(
+                "UPDATE bid_jobs SET completed = completed + ?, failed = failed + ?, updated_at = ? "
+                "WHERE job_id = ? AND owner = ? AND status = 'running'",
+                (completed, failed, datetime.now().isoformat(), job_id, self.owner)
+            )
+            if cursor.rowcount != 1:
+                raise LeaseLostError(f"job {job_id} is owned by another worker")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _update_job(self, job_id: str, status: str, error: Optional[str] = None):
+        """Finish a job this worker owns, releasing its lease."""
+        self._connection().execute(
+            "UPDATE bid_jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ? WHERE job_id = ? AND owner = ?",
+            (status, error, datetime.now().isoformat(), job_id, self.owner)
+        )
+
+    def get_job(self, job_id: str, include_results: bool = False) -> Optional[Dict[str, Any]]:
+        """Get a job's progress, optionally with per-bid results."""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT job_id, status, backend, total, completed, failed, error, created_at, updated_at "
+            "FROM bid_jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        keys = ["job_id", "status", "backend", "total", "completed", "failed", "error", "created_at", "updated_at"]
+        job = dict(zip(keys, row))
+        job["progress"] = (job["completed"] + job["failed"]) / job["total"] if job["total"] else 1.0
+
+        if include_results:
+            job["results"] = [
+                {
+                    "index": item_index,
+                    "status": status,
+                    "bid_id": bid_id,
+                    "extracted_data": json.loads(extracted_json),
+                    "analysis": analysis,
+                    "error": error
+                }
+                for item_index, status, bid_id, extracted_json, analysis, error in conn.execute(
+                    "SELECT item_index, status, bid_id, extracted_data, analysis, error "
+                    "FROM bid_job_items WHERE job_id = ? ORDER BY item_index",
+                    (job_id,)
+                )
+            ]
+        return job
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """List the most recent jobs."""
+        rows = self._connection().execute(
+            "SELECT job_id FROM bid_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self.get_job(job_id) for (job_id,) in rows]
+
+
+# Global bid analysis service instance
+_bid_analysis_service: Optional[BidAnalysisJobService] = None
+
+
+def get_bid_analysis_service() -> BidAnalysisJobService:
+    """Get the global bulk bid analysis service instance."""
+    global _bid_analysis_service
+
+    if _bid_analysis_service is None:
+        if settings.bid_batch_backend == "local":
+            backend = LocalBatchBackend()
+        else:
+            from core.ai_client import get_ai_client
+            backend = AnthropicBatchBackend(get_ai_client())
+        _bid_analysis_service = BidAnalysisJobService(settings.bid_jobs_db_path, backend)
+        logger.info(f"Bulk bid analysis service initialized ({backend.name} backend)")
+
+    return _bid_analysis_service
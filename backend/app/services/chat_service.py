@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import uuid
@@ -14,6 +15,7 @@ from models.chat_models import (
     ConversationExport
 )
 from core.ai_client import get_ai_client
+from core.token_usage import get_usage_tracker
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ class ChatService:
         """Initialize chat service."""
         self.conversations: Dict[str, ConversationHistory] = {}
         self.ai_client = get_ai_client()
+        self.usage_tracker = get_usage_tracker()
         self.token_usage_stats = {
             "total_conversations": 0,
             "total_messages": 0,
@@ -35,7 +38,22 @@ class ChatService:
             "session_start": datetime.now()
         }
         
-    async def process_message_stream(self, message: str, conversation_id: str) -> AsyncGenerator[str, None]:
+    def _usage_recorder(self, conversation_id: str, client_ip: Optional[str] = None):
+        """Build a callback that records response usage against a conversation and client."""
+        def record(usage: TokenUsage):
+            self.usage_tracker.record(usage, conversation_id=conversation_id, client_ip=client_ip)
+            self._sync_token_totals()
+        return record
+    
+    def _sync_token_totals(self):
+        """Mirror tracker totals into the token usage statistics."""
+        totals = self.usage_tracker.get_totals()
+        self.token_usage_stats["total_tokens"] = totals["total_tokens"]
+        self.token_usage_stats["total_cost"] = totals["total_cost"]
+    
+    async def process_message_stream(self, message: str, conversation_id: str,
+                                     client_ip: Optional[str] = None,
+                                     skip_semantic_cache: bool = False) -> AsyncGenerator[str, None]:
         """
         Process a user message and return streaming AI response.
         This is the core method for handling chat interactions.
@@ -55,7 +73,11 @@ class ChatService:
             response_content = ""
             start_time = time.time()
             
-            async for chunk in self.ai_client.generate_streaming_response(message, conversation_history):
+            async for chunk in self.ai_client.generate_streaming_response(
+                message, conversation_history,
+                on_usage=self._usage_recorder(conversation_id, client_ip),
+                skip_semantic_cache=skip_semantic_cache
+            ):
                 if chunk:
                     response_content += chunk
                     yield chunk
@@ -78,7 +100,7 @@ class ChatService:
             logger.error(f"Error in process_message_stream: {e}")
             yield f"I encountered an error: {str(e)}. Please try again."
     
-    async def process_message(self, message: str, conversation_id: str) -> str:
+    async def process_message(self, message: str, conversation_id: str, client_ip: Optional[str] = None) -> str:
         """
         Process a user message and return complete AI response (non-streaming).
         """
@@ -94,7 +116,9 @@ class ChatService:
             
             # Generate AI response
             start_time = time.time()
-            response = await self.ai_client.generate_response(message, conversation_history)
+            response = await self.ai_client.generate_response(
+                message, conversation_history, on_usage=self._usage_recorder(conversation_id, client_ip)
+            )
             
             if response:
                 # Add AI response to conversation
@@ -115,6 +139,55 @@ class ChatService:
             logger.error(f"Error in process_message: {e}")
             return f"I encountered an error: {str(e)}. Please try again."
     
+    async def process_batch(self, questions: List[str], client_ip: Optional[str] = None) -> AsyncGenerator[Dict, None]:
+        """
+        Answer standalone questions concurrently against one business data snapshot.
+        Results are yielded as soon as each completes, so they arrive out of order;
+        concurrency is bounded by the AI client's upstream semaphore.
+        """
+        batch_id = f"batch-{uuid.uuid4()}"
+        batch_start = time.time()
+        snapshot = await asyncio.to_thread(self.ai_client.get_business_snapshot)
+        on_usage = self._usage_recorder(batch_id, client_ip)
+        
+        async def answer(index: int, question: str) -> Dict:
+            item_start = time.time()
+            try:
+                response = await self.ai_client.generate_response(
+                    question, on_usage=on_usage, business_data=snapshot, raise_errors=True
+                )
+                status = "success"
+            except Exception as e:
+                logger.error(f"Batch {batch_id} item {index} failed: {e}")
+                response = f"I encountered an error: {str(e)}. Please try again."
+                status = "error"
+            
+            finished = time.time()
+            return {
+                "type": "result",
+                "batch_id": batch_id,
+                "index": index,
+                "question": question,
+                "answer": response,
+                "status": status,
+                "processing_time": finished - item_start,
+                "elapsed_time": finished - batch_start
+            }
+        
+        logger.info(f"Processing batch {batch_id}: {len(questions)} questions")
+        tasks = [asyncio.create_task(answer(index, question)) for index, question in enumerate(questions)]
+        
+        try:
+            for completed in asyncio.as_completed(tasks):
+                result = await completed
+                self.token_usage_stats["total_messages"] += 2  # question + answer
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        logger.info(f"Completed batch {batch_id} in {time.time() - batch_start:.2f}s")
+    
     def _get_or_create_conversation(self, conversation_id: str) -> ConversationHistory:
         """Get existing conversation or create new one."""
         if conversation_id not in self.conversations:
@@ -279,8 +352,9 @@ class ChatService:
         
         return "\n".join(lines)
     
-    def get_token_usage_stats(self) -> Dict:
-        """Get token usage statistics (bonus feature)."""
+    def get_token_usage_stats(self, bucket_seconds: Optional[int] = None, top: int = 10) -> Dict:
+        """Get token usage statistics with per-dimension breakdowns and time-bucketed rollups."""
+        self._sync_token_totals()
         uptime = (datetime.now() - self.token_usage_stats["session_start"]).total_seconds()
         
         return {
@@ -289,7 +363,12 @@ class ChatService:
             "avg_messages_per_conversation": (
                 self.token_usage_stats["total_messages"] / max(1, self.token_usage_stats["total_conversations"])
             ),
-            "conversations_active": len(self.conversations)
+            "conversations_active": len(self.conversations),
+            "usage_totals": self.usage_tracker.get_totals(),
+            "by_model": self.usage_tracker.get_breakdown("model", top),
+            "by_conversation": self.usage_tracker.get_breakdown("conversation", top),
+            "by_client": self.usage_tracker.get_breakdown("client", top),
+            "rollups": self.usage_tracker.get_rollups(bucket_seconds)
         }
     
     def get_conversation_count(self) -> int:
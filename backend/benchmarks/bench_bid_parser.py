@@ -0,0 +1,216 @@
+"""
+Benchmark bid PDF intake: parsing throughput and extraction accuracy.
+
+Generates a seeded set of hotel bid PDFs (a header block of key fields, a
+pricing table, terms with deposit and cancellation policy, and optional
+filler pages), then parses them
+
+  serially     parse_bid_pdf in this process, one document at a time
+  pool         BidParser with --workers processes
+
+and reports documents/s and pages/s for each, plus how many documents
+validated as a HotelBid and how many extracted fields match the generated
+values.
+
+Usage:
+    python backend/benchmarks/bench_bid_parser.py [--documents 200] [--workers 4] [--extra-pages 2]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from core.bid_parser import BidParser, build_hotel_bid, parse_bid_pdf
+
+
+CHAINS = ["Marriott", "Hilton", "Hyatt", "Westin", "Sheraton", "Fairmont", "Omni", "Loews", "Kimpton", "Renaissance"]
+CITIES = [("Chicago", "IL"), ("Boston", "MA"), ("Denver", "CO"), ("Austin", "TX"), ("Seattle", "WA"),
+          ("Atlanta", "GA"), ("San Diego", "CA"), ("Nashville", "TN"), ("Orlando", "FL"), ("Phoenix", "AZ")]
+FIRST_NAMES = ["Maria", "James", "Aisha", "Kenji", "Sofia", "Daniel", "Priya", "Lucas", "Emma", "Omar"]
+LAST_NAMES = ["Garcia", "Smith", "Khan", "Tanaka", "Rossi", "Miller", "Patel", "Silva", "Brown", "Haddad"]
+AMENITIES = ["High-speed WiFi", "Parking", "Business Center", "Fitness Center", "Spa", "Pool", "Airport Shuttle"]
+ROOMS = ["Grand Ballroom", "Executive Boardroom", "Conference Room A", "Conference Room B", "Terrace"]
+CANCELLATION = [
+    "Free cancellation up to 60 days before arrival; 50% of the room block is charged thereafter.",
+    "Cancellations within 30 days of the event are charged in full, except for rooms resold by the hotel.",
+    "Free cancellation up to 72 hours before arrival."
+]
+FILLER = (
+    "The hotel will hold the room block until the cutoff date stated in the contract. Attrition below "
+    "80% of the contracted block is billed at the group rate. Food and beverage minimums apply to all "
+    "function space, and final guarantees are due five business days before the event."
+)
+# Fields compared against the generated values
+CHECKED_FIELDS = [
+    "hotel_name", "hotel_chain", "hotel_city", "contact_email", "event_id", "room_rate_per_night",
+    "rooms_available", "total_room_cost", "meeting_space_cost", "total_catering_cost", "av_equipment_cost",
+    "service_fees", "taxes_and_fees", "total_cost", "deposit_percentage", "cancellation_policy"
+]
+
+
+def create_bid_pdf(path: Path, rng: random.Random, extra_pages: int) -> Dict:
+    """Write one bid PDF and return the values drawn into it."""
+    styles = getSampleStyleSheet()
+    chain = rng.choice(CHAINS)
+    city, state = rng.choice(CITIES)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    hotel_name = f"{chain} {city} {rng.choice(['Downtown', 'Riverside', 'Convention Center', 'Airport'])}"
+    rooms = rng.randint(20, 200)
+    nights = rng.randint(1, 4)
+    rate = float(rng.randint(129, 459))
+    guests = rng.randint(50, 400)
+    per_person = float(rng.randint(45, 140))
+    expected = {
+        "hotel_name": hotel_name,
+        "hotel_chain": chain,
+        "hotel_city": city,
+        "contact_email": f"{first.lower()}.{last.lower()}@{chain.lower()}.com",
+        "event_id": f"EVT{rng.randint(1, 999):03d}",
+        "room_rate_per_night": rate,
+        "rooms_available": rooms,
+        "total_room_cost": rate * rooms * nights,
+        "meeting_space_cost": float(rng.randint(20, 150) * 100),
+        "total_catering_cost": per_person * guests,
+        "av_equipment_cost": float(rng.randint(5, 60) * 100),
+        "deposit_percentage": float(rng.choice([10, 20, 25, 30, 50])),
+        "cancellation_policy": rng.choice(CANCELLATION)
+    }
+    subtotal = sum(expected[field] for field in ["total_room_cost", "meeting_space_cost", "total_catering_cost", "av_equipment_cost"])
+    expected["service_fees"] = round(subtotal * 0.08, 2)
+    expected["taxes_and_fees"] = round(subtotal * 0.12, 2)
+    expected["total_cost"] = round(subtotal + expected["service_fees"] + expected["taxes_and_fees"], 2)
+    deposit = round(expected["total_cost"] * expected["deposit_percentage"] / 100, 2)
+
+    story = [
+        Paragraph(f"Proposal for {expected['event_id']}", styles['Title']),
+        Paragraph(f"Hotel: {hotel_name}", styles['Normal']),
+        Paragraph(f"Chain: {chain}", styles['Normal']),
+        Paragraph(f"Address: {rng.randint(10, 9999)} {rng.choice(['Main', 'Lake', 'Market', 'Harbor'])} Street", styles['Normal']),
+        Paragraph(f"City: {city}", styles['Normal']),
+        Paragraph(f"State: {state}", styles['Normal']),
+        Paragraph(f"Rating: {rng.choice([3.5, 4.0, 4.2, 4.5, 4.8])} stars", styles['Normal']),
+        Paragraph(f"Contact: {first} {last}", styles['Normal']),
+        Paragraph(f"Email: {expected['contact_email']}", styles['Normal']),
+        Paragraph(f"Phone: +1-{rng.randint(200, 999)}-555-{rng.randint(1000, 9999)}", styles['Normal']),
+        Paragraph(f"Event ID: {expected['event_id']}", styles['Normal']),
+        Paragraph(f"Amenities: {', '.join(rng.sample(AMENITIES, 3))}", styles['Normal']),
+        Paragraph(f"Meeting Rooms: {', '.join(rng.sample(ROOMS, 2))}", styles['Normal']),
+        Paragraph("Pricing", styles['Heading2'])
+    ]
+    rows = [
+        ["Item", "Rooms", "Rate (USD)", "Amount (USD)"],
+        [f"Guest rooms ({nights} nights)", str(rooms), f"${rate:,.2f}", f"${expected['total_room_cost']:,.2f}"],
+        ["Meeting space", "", "", f"${expected['meeting_space_cost']:,.2f}"],
+        [f"Catering ({guests} guests)", "", f"${per_person:,.2f}", f"${expected['total_catering_cost']:,.2f}"],
+        ["AV equipment", "", "", f"${expected['av_equipment_cost']:,.2f}"],
+        ["Subtotal", "", "", f"${subtotal:,.2f}"],
+        ["Service charge (8%)", "", "", f"${expected['service_fees']:,.2f}"],
+        ["Taxes (12%)", "", "", f"${expected['taxes_and_fees']:,.2f}"],
+        ["Total", "", "", f"${expected['total_cost']:,.2f}"]
+    ]
+    table = Table(rows)
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("FONTSIZE", (0, 0), (-1, -1), 9)
+    ]))
+    story += [
+        table,
+        Paragraph("Terms", styles['Heading2']),
+        Paragraph(f"Deposit: {expected['deposit_percentage']:.0f}% (${deposit:,.2f}) due at signing", styles['Normal']),
+        Paragraph(f"Cancellation Policy: {expected['cancellation_policy']}", styles['Normal']),
+        Paragraph("Payment Terms: Net 30", styles['Normal'])
+    ]
+    for _ in range(extra_pages):
+        story.append(PageBreak())
+        story += [Paragraph(FILLER, styles['Normal']) for _ in range(8)]
+
+    SimpleDocTemplate(str(path), pagesize=letter, invariant=True).build(story)
+    return expected
+
+
+def accuracy(fields: Dict, expected: Dict) -> Tuple[int, int]:
+    """Matching and total checked fields of one document."""
+    matches = 0
+    for field in CHECKED_FIELDS:
+        value = fields.get(field)
+        if isinstance(expected[field], float):
+            matches += value is not None and abs(value - expected[field]) < 0.01
+        else:
+            matches += value == expected[field]
+    return matches, len(CHECKED_FIELDS)
+
+
+def report(label: str, seconds: float, results: List, expected: List[Dict]):
+    """Print throughput, validation and field accuracy of one run."""
+    valid = matched = checked = pages = 0
+    for fields, truth in zip(results, expected):
+        if isinstance(fields, Exception):
+            continue
+        pages += fields.get("_pages", 0)
+        try:
+            build_hotel_bid(fields)
+            valid += 1
+        except ValueError:
+            pass
+        document_matched, document_checked = accuracy(fields, truth)
+        matched += document_matched
+        checked += document_checked
+    print(f"{label:>10} {seconds:>9.2f} {len(results) / seconds:>8.1f} {pages / seconds:>8.1f} "
+          f"{valid / len(results):>9.1%} {matched / max(1, checked):>10.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--extra-pages", type=int, default=2, help="filler pages after the pricing page")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        expected = []
+        documents = []
+        for number in range(args.documents):
+            path = Path(tmp) / f"bid-{number:04d}.pdf"
+            expected.append(create_bid_pdf(path, rng, args.extra_pages))
+            documents.append(path.read_bytes())
+        print(f"Generated {args.documents} bid PDFs in {time.perf_counter() - start:.1f} s\n")
+
+    print(f"{'mode':>10} {'seconds':>9} {'docs/s':>8} {'pages/s':>8} {'validated':>9} {'field acc':>10}")
+
+    start = time.perf_counter()
+    results = []
+    for content in documents:
+        try:
+            results.append(parse_bid_pdf(content))
+        except Exception as e:
+            results.append(e)
+    report("serial", time.perf_counter() - start, results, expected)
+
+    bid_parser = BidParser(args.workers)
+    bid_parser.parse_many(documents[:args.workers])  # Start the worker processes
+    start = time.perf_counter()
+    results = bid_parser.parse_many(documents)
+    report(f"pool x{args.workers}", time.perf_counter() - start, results, expected)
+    bid_parser.shutdown()
+
+
+if __name__ == "__main__":
+    main()
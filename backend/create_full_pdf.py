@@ -1,7 +1,41 @@
+import argparse
+import json
+import random
+from pathlib import Path
+
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 
+# Vocabulary for generated corpora
+REGIONS = [
+    "North America", "United States", "Canada", "Mexico", "Central America", "Caribbean", "Brazil",
+    "Argentina", "Chile", "Peru", "United Kingdom", "Ireland", "France", "Spain", "Portugal", "Italy",
+    "Germany", "Netherlands", "Scandinavia", "Poland", "Greece", "Turkey", "Egypt", "Morocco",
+    "South Africa", "Kenya", "India", "Thailand", "Vietnam", "Japan", "South Korea", "China",
+    "Singapore", "Indonesia", "Australia", "New Zealand"
+]
+TOPICS = [
+    "Air Travel", "Rail Access", "Cruise Ports", "Hotel Standards", "Museum Access", "Service Animals",
+    "Public Transit", "Legal Protections", "Complaint Procedures", "Beach Access", "Car Rentals",
+    "Emergency Services", "Medical Equipment", "Tour Operators", "Signage and Braille", "Hearing Access"
+]
+FEATURES = [
+    "step-free entrances", "roll-in showers", "tactile paving", "audio guides", "hearing loops",
+    "accessible restrooms", "boarding ramps", "priority seating", "visual alarms", "wide doorways",
+    "lowered counters", "wheelchair rentals", "braille menus", "captioned tours", "accessible parking"
+]
+VERBS = ["requires", "recommends", "funds", "inspects", "certifies", "publishes guidance on", "subsidizes"]
+AUTHORITIES = ["the national transport ministry", "regional tourism boards", "the disability commission",
+               "municipal councils", "the civil aviation authority", "port operators", "hotel associations"]
+BOILERPLATE = (
+    "Disclaimer: accessibility regulations change frequently and enforcement varies by operator. "
+    "Travelers should confirm assistance, equipment and service animal arrangements directly with "
+    "carriers and venues before booking, and keep written confirmation of every request. This guide "
+    "is informational and does not constitute legal advice."
+)
+
 def create_full_accessibility_pdf():
     doc = SimpleDocTemplate("documents/accessibility_guide.pdf", pagesize=letter)
     styles = getSampleStyleSheet()
@@ -64,5 +98,121 @@ def create_full_accessibility_pdf():
     print("✅ Created full 10-page accessibility_guide.pdf successfully!")
     print("📄 The PDF now contains all 10 pages of content.")
 
+def _sentence(rng: random.Random, region: str, topic: str) -> str:
+    """One generated sentence about a region and topic."""
+    return (f"In {region}, {rng.choice(AUTHORITIES)} {rng.choice(VERBS)} {rng.choice(FEATURES)} "
+            f"for {topic.lower()}, and {rng.choice(FEATURES)} are {rng.choice(['common', 'expanding', 'limited', 'mandatory'])} "
+            f"at {rng.randint(10, 95)}% of major sites.")
+
+
+def _fee_table(rng: random.Random, region: str, topic: str) -> Table:
+    """A small pricing/contact table for a section."""
+    rows = [["Service", "Fee (USD)", "Notice", "Contact"]]
+    for feature in rng.sample(FEATURES, 5):
+        rows.append([feature.capitalize(), f"{rng.randint(0, 120)}.00", f"{rng.choice([24, 48, 72])} hours",
+                     f"{region.split()[0].lower()}-{topic.split()[0].lower()}@example.org"])
+    table = Table(rows)
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("FONTSIZE", (0, 0), (-1, -1), 8)
+    ]))
+    return table
+
+
+def create_corpus_pdf(path, pages: int, sections: int, seed: int, tables: bool = True,
+                      boilerplate_every: int = 3) -> dict:
+    """
+    Write a synthetic guide of exactly `pages` pages split into `sections`
+    "Region - Topic" sections, with an optional fee table opening each section
+    and the disclaimer repeated every `boilerplate_every` pages. The same seed
+    always produces the same text. Returns the document's manifest entry.
+    """
+    rng = random.Random(seed)
+    styles = getSampleStyleSheet()
+    sections = max(1, min(sections, pages))
+    titles = rng.sample([f"{region} - {topic}" for region in REGIONS for topic in TOPICS], sections)
+    story = []
+    manifest_sections = []
+
+    for index, title in enumerate(titles):
+        first_page = index * pages // sections + 1
+        last_page = (index + 1) * pages // sections
+        region, topic = title.split(" - ")
+        manifest_sections.append({"title": title, "region": region, "topic": topic,
+                                  "start_page": first_page, "end_page": last_page})
+
+        for page in range(first_page, last_page + 1):
+            if page == first_page:
+                story.append(Paragraph(f"Section {index + 1}: {title}", styles['Heading2']))
+                if tables:
+                    story.append(_fee_table(rng, region, topic))
+            for _ in range(3 if page == first_page else 5):
+                story.append(Paragraph(" ".join(_sentence(rng, region, topic) for _ in range(3)), styles['Normal']))
+            if boilerplate_every and page % boilerplate_every == 0:
+                story.append(Paragraph(BOILERPLATE, styles['Italic']))
+            if page < pages:
+                story.append(PageBreak())
+
+    # invariant drops the creation date and random document id, so files are byte-identical
+    SimpleDocTemplate(str(path), pagesize=letter, invariant=True).build(story)
+    return {"file": Path(path).name, "pages": pages, "seed": seed, "sections": manifest_sections}
+
+
+def create_corpus(output_dir: str, documents: int = 3, pages: int = 200, sections: int = 20, seed: int = 42,
+                  tables: bool = True, boilerplate_every: int = 3) -> dict:
+    """
+    Write a reproducible benchmark corpus and its manifest.json.
+    The manifest lists every document's sections and page ranges, plus
+    questions naming a section with the pages that answer them.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    manifest = {"seed": seed, "documents": [], "queries": []}
+
+    for number in range(1, documents + 1):
+        path = output / f"guide-{number:03d}.pdf"
+        entry = create_corpus_pdf(path, pages, sections, rng.randrange(2 ** 31), tables, boilerplate_every)
+        manifest["documents"].append(entry)
+        for section in entry["sections"]:
+            feature = rng.choice(FEATURES)
+            manifest["queries"].append({
+                "document": entry["file"],
+                "query": f"What does the guide say about {section['topic'].lower()} in {section['region']}?",
+                "pages": [section["start_page"], section["end_page"]]
+            })
+            manifest["queries"].append({
+                "document": entry["file"],
+                "query": f"{feature} for {section['topic'].lower()} {section['region']}",
+                "pages": [section["start_page"], section["end_page"]]
+            })
+        print(f"📄 Created {path} ({pages} pages, {len(entry['sections'])} sections)")
+
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    print(f"✅ Created corpus of {documents} documents in {output}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the accessibility guide, or a synthetic benchmark corpus")
+    subparsers = parser.add_subparsers(dest="command")
+    corpus = subparsers.add_parser("corpus", help="generate a seeded corpus of large guides")
+    corpus.add_argument("--output", default="documents/corpus")
+    corpus.add_argument("--documents", type=int, default=3)
+    corpus.add_argument("--pages", type=int, default=200, help="pages per document")
+    corpus.add_argument("--sections", type=int, default=20, help="sections per document")
+    corpus.add_argument("--seed", type=int, default=42)
+    corpus.add_argument("--no-tables", action="store_true")
+    corpus.add_argument("--boilerplate-every", type=int, default=3, help="repeat the disclaimer every N pages (0 = never)")
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        create_corpus(args.output, args.documents, args.pages, args.sections, args.seed,
+                      not args.no_tables, args.boilerplate_every)
+    else:
+        create_full_accessibility_pdf()
+
+
 if __name__ == "__main__":
-    create_full_accessibility_pdf()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules import each other relative to the app directory, as under uvicorn
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from core import business_repository  # noqa: E402
+from core.business_repository import BusinessRepository  # noqa: E402
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    """A freshly seeded business repository installed as the global one."""
+    repo = BusinessRepository(str(tmp_path / "business.db"))
+    monkeypatch.setattr(business_repository, "_business_repository", repo)
+    return repo
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core import answer_cache, ai_client, business_repository
+from core.ai_client import BusinessIntelligenceAIClient
+from core.answer_cache import PersistentAnswerCache
+from core.business_repository import BusinessRepository
+
+
+QUESTION = "What is our total revenue pipeline?"
+
+
+class _FakeMessages:
+    """Stands in for the Anthropic messages API and counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=f"answer {self.calls}")], usage=None)
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    """Answer cache location; the semantic cache is disabled so only exact prompts are reused."""
+    monkeypatch.setattr(ai_client, "get_semantic_cache", lambda: None)
+    return str(tmp_path / "answers.db")
+
+
+def _start(monkeypatch, repository, cache_path):
+    """A client as a freshly started worker builds it: new cache and repository handles, same files."""
+    monkeypatch.setattr(business_repository, "_business_repository", repository)
+    monkeypatch.setattr(answer_cache, "_answer_cache", PersistentAnswerCache(cache_path, 1024 * 1024))
+    client = BusinessIntelligenceAIClient()
+    client.client = SimpleNamespace(messages=_FakeMessages())
+    return client
+
+
+def _ask(client):
+    return asyncio.run(client.generate_response(QUESTION))
+
+
+def test_answer_is_reused_after_a_restart(repository, cache_path, monkeypatch):
+    first = _start(monkeypatch, repository, cache_path)
+    answer = _ask(first)
+
+    restarted = _start(monkeypatch, BusinessRepository(str(repository.db_path)), cache_path)
+
+    assert _ask(restarted) == answer
+    assert restarted.client.messages.calls == 0
+
+
+def test_new_bid_invalidates_cached_answers(repository, cache_path):
+    cache = PersistentAnswerCache(cache_path, 1024 * 1024)
+    key = cache.fingerprint("model", "system prompt", [{"role": "user", "content": QUESTION}], 100, 0.0)
+    version = repository.data_version()
+    cache.put(key, version, "cached answer")
+
+    repository.add_bid(repository.list_bids(limit=1)[0].model_copy(update={"hotel_name": "Harbor Hotel"}))
+
+    assert cache.get(key, repository.data_version()) is None
+    assert cache.get(key, version) == "cached answer"
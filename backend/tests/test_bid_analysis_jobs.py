@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from core.config import get_settings
+from models.business_models import BulkBidAnalysisRequest
+from services import chat_service
+from services.bid_analysis_service import BidAnalysisJobService, LeaseLostError, LocalBatchBackend, extract_bid_fields
+
+
+settings = get_settings()
+
+
+class _StubChatService:
+    """Stands in for the chat service; jobs only read its business snapshot."""
+
+    class ai_client:
+        @staticmethod
+        def get_business_snapshot():
+            return None
+
+
+def _bid(index):
+    return {
+        "hotel_name": f"Harbor Hotel {index}",
+        "contact_person": "Dana Lee",
+        "total_cost": 40000 + index,
+        "room_rate": 210,
+        "event_id": "EVT001"
+    }
+
+
+def _insert(service, bids):
+    """Persist a queued job the way submit does, without starting a worker."""
+    job_id = f"job{time.time_ns()}"
+    items = [(job_id, index, "pending", json.dumps(extract_bid_fields(bid))) for index, bid in enumerate(bids)]
+    service._insert_job(job_id, items)
+    return job_id
+
+
+@pytest.fixture
+def services(tmp_path, repository, monkeypatch):
+    """Two job services sharing one job store, as two uvicorn workers would."""
+    monkeypatch.setattr(settings, "bid_job_lease_seconds", 60)
+    monkeypatch.setattr(chat_service, "get_chat_service", lambda: _StubChatService())
+    db_path = str(tmp_path / "jobs.db")
+    return BidAnalysisJobService(db_path, LocalBatchBackend()), BidAnalysisJobService(db_path, LocalBatchBackend())
+
+
+def test_only_one_worker_claims_a_job(services):
+    first, second = services
+    job_id = _insert(first, [_bid(0)])
+
+    assert first._claim(job_id)
+    assert not second._claim(job_id)
+    assert job_id not in second._claimable_jobs()
+
+
+def test_expired_lease_is_claimed_by_another_worker(services):
+    first, second = services
+    job_id = _insert(first, [_bid(0)])
+    assert first._claim(job_id)
+
+    first._connection().execute("UPDATE bid_jobs SET lease_expires = ? WHERE job_id = ?", (time.time() - 1, job_id))
+
+    assert job_id in second._claimable_jobs()
+    assert second._claim(job_id)
+    assert not first._renew_lease(job_id)
+
+    # The previous owner can no longer finish the job
+    first._update_job(job_id, "failed", "stale")
+    assert second.get_job(job_id)["status"] == "running"
+
+
+def test_job_resumed_by_every_worker_runs_once(services, repository):
+    first, second = services
+    job_id = _insert(first, [_bid(index) for index in range(5)])
+    bids_before = repository.get_summary()["total_bids"]
+
+    async def run():
+        await first.start()
+        await second.start()
+        for _ in range(200):
+            if first.get_job(job_id)["status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(run())
+
+    job = first.get_job(job_id, include_results=True)
+    assert job["status"] == "completed"
+    assert job["completed"] == 5 and job["failed"] == 0
+    assert repository.get_summary()["total_bids"] == bids_before + 5
+    assert len({result["bid_id"] for result in job["results"]}) == 5
+
+
+def test_resumed_job_does_not_register_bids_twice(services, repository):
+    first, _ = services
+    job_id = _insert(first, [_bid(index) for index in range(3)])
+    first._claim(job_id)
+
+    first._register_bids(job_id)
+    bids_after_first_run = repository.get_summary()["total_bids"]
+    first._register_bids(job_id)
+
+    assert repository.get_summary()["total_bids"] == bids_after_first_run
+
+
+@pytest.mark.parametrize("field", ["hotel_rating", "success_rate", "total_cost", "room_rate"])
+def test_bulk_request_rejects_non_numeric_fields(field):
+    bid = dict(_bid(0), **{field: "excellent"})
+    with pytest.raises(ValidationError, match=field):
+        BulkBidAnalysisRequest(bids=[bid])
+
+
+def test_worker_that_lost_its_lease_cannot_store_results(services):
+    first, second = services
+    job_id = _insert(first, [_bid(0), _bid(1)])
+    assert first._claim(job_id)
+    items = first._register_bids(job_id)
+    first._connection().execute("UPDATE bid_jobs SET lease_expires = ? WHERE job_id = ?", (time.time() - 1, job_id))
+    assert second._claim(job_id)
+    results = {f"{job_id}-{index}": {"status": "succeeded", "analysis": "stale"} for index, _ in items}
+
+    with pytest.raises(LeaseLostError):
+        first._store_results(job_id, items, results)
+    second._store_results(job_id, items, results)
+
+    job = second.get_job(job_id, include_results=True)
+    assert (job["completed"], job["progress"]) == (2, 1.0)
+
+
+def test_lost_lease_cancels_job_processing(services, monkeypatch):
+    first, _ = services
+    monkeypatch.setattr(settings, "bid_job_lease_seconds", 0)
+    monkeypatch.setattr(first, "_renew_lease", lambda job_id: False)
+
+    async def run():
+        job_task = asyncio.create_task(asyncio.sleep(60))
+        await first._keep_lease("job", job_task)
+        await asyncio.sleep(0)
+        return job_task.cancelled()
+
+    assert asyncio.run(run())
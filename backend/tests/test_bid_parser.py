@@ -0,0 +1,93 @@
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from api.chat import router
+from core.bid_parser import build_hotel_bid, parse_bid_pdf
+from core.config import get_settings
+
+
+settings = get_settings()
+
+KEY_FIELDS = [
+    "Hotel: Hilton Chicago Riverside",
+    "City: Chicago",
+    "Contact Person: Maria Garcia",
+    "Email: maria.garcia@hilton.com",
+    "Phone: +1-312-555-0100",
+    "Event ID: EVT042",
+    "Rating: 4.5",
+    "Deposit: 25%"
+]
+PRICING_TABLE = [
+    ["Description", "Quantity (rooms)", "Rate", "Amount"],
+    ["Guest rooms", "40", "$189.00", "$22,680.00"],
+    ["Meeting space", "", "", "$4,500.00"],
+    ["Catering", "150", "$85.00", "$12,750.00"],
+    ["Taxes", "", "", "$4,795.20"],
+    ["Total", "", "", "$44,725.20"]
+]
+
+
+def _pdf(lines, table=None) -> bytes:
+    """A bid PDF with the given text lines, followed by an optional gridded table."""
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    story = [Paragraph(line, styles["Normal"]) for line in lines]
+    if table:
+        grid = Table(table)
+        grid.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, "black")]))
+        story.append(grid)
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+def test_pricing_table_fills_cost_fields():
+    fields = parse_bid_pdf(_pdf(KEY_FIELDS, PRICING_TABLE))
+
+    assert fields["total_room_cost"] == 22680.0
+    assert fields["room_rate_per_night"] == 189.0
+    assert fields["rooms_available"] == 40
+    assert fields["meeting_space_cost"] == 4500.0
+    assert fields["total_catering_cost"] == 12750.0
+    assert fields["catering_cost_per_person"] == 85.0
+    assert fields["taxes_and_fees"] == 4795.2
+    assert fields["total_cost"] == 44725.2
+    assert fields["deposit_required"] == pytest.approx(44725.2 * 0.25, abs=0.01)
+
+
+def test_labeled_lines_fill_key_fields():
+    fields = parse_bid_pdf(_pdf(KEY_FIELDS + ["Room Rate: $199.00", "Total Cost: $30,000"]))
+
+    bid = build_hotel_bid(fields)
+
+    assert (bid.hotel_name, bid.hotel_chain, bid.hotel_city) == ("Hilton Chicago Riverside", "Hilton", "Chicago")
+    assert (bid.contact_person, bid.contact_email, bid.event_id) == ("Maria Garcia", "maria.garcia@hilton.com", "EVT042")
+    assert (bid.room_rate_per_night, bid.total_cost, bid.hotel_rating) == (199.0, 30000.0, 4.5)
+    assert (bid.deposit_percentage, bid.deposit_required) == (25.0, 7500.0)
+
+
+def test_missing_fields_are_named():
+    fields = parse_bid_pdf(_pdf(["Hotel: Hilton Chicago Riverside", "City: Chicago"]))
+
+    with pytest.raises(ValueError) as error:
+        build_hotel_bid(fields)
+
+    for field in ("event_id", "contact_person", "room_rate_per_night", "total_cost"):
+        assert field in str(error.value)
+
+
+def test_upload_over_the_size_cap_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "max_bid_document_mb", 1)
+    app = FastAPI()
+    app.include_router(router)
+    content = _pdf(KEY_FIELDS, PRICING_TABLE) + b"%" * (1024 * 1024)
+
+    response = TestClient(app).post("/api/process-bid-document", files={"file": ("bid.pdf", content, "application/pdf")})
+
+    assert response.status_code == 413
@@ -0,0 +1,49 @@
+import pytest
+
+from core.ai_client import BusinessIntelligenceAIClient
+from core.config import get_settings
+
+
+settings = get_settings()
+
+
+@pytest.fixture
+def client(repository):
+    return BusinessIntelligenceAIClient()
+
+
+def _listed_hotels(context):
+    return [line[2:].rsplit(" - ", 1)[0] for line in context.splitlines() if line.startswith("• ")]
+
+
+def test_context_lists_a_capped_number_of_records(client, monkeypatch):
+    monkeypatch.setattr(settings, "context_max_bids", 5)
+    monkeypatch.setattr(settings, "context_max_events", 3)
+    snapshot = client.get_business_snapshot()
+
+    bids = client._get_relevant_data_for_query("Which hotel bids look best?", snapshot)
+    events = client._get_relevant_data_for_query("Which events are coming up?", snapshot)
+
+    assert len(_listed_hotels(bids)) == 5
+    assert 0 < len(_listed_hotels(events)) <= 3
+
+
+def test_named_event_is_looked_up_by_id(client, repository):
+    event = repository.list_events(limit=1)[0]
+
+    context = client._get_relevant_data_for_query(f"What is the status of event {event.event_id}?",
+                                                  client.get_business_snapshot())
+
+    assert _listed_hotels(context) == [event.event_name]
+
+
+def test_questions_on_one_snapshot_see_the_same_bids(client, repository):
+    snapshot = client.get_business_snapshot()
+    before = client._get_relevant_data_for_query("Show the latest hotel bids", snapshot)
+
+    new_bid = repository.list_bids(limit=1)[0].model_copy(update={"hotel_name": "Harbor Hotel"})
+    repository.add_bid(new_bid)
+
+    assert client._get_relevant_data_for_query("Show the latest hotel bids", snapshot) == before
+    assert "Harbor Hotel" in client._get_relevant_data_for_query("Show the latest hotel bids",
+                                                                 client.get_business_snapshot())
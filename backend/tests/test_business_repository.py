@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.business_repository import BusinessRepository
+
+
+def _new_bid(repository, hotel_name):
+    """A copy of a seeded bid, as a runtime upload would add it."""
+    return repository.list_bids(limit=1)[0].model_copy(update={"hotel_name": hotel_name})
+
+
+def test_add_bid_numbers_runtime_bids_and_changes_the_version(repository):
+    initial_version = repository.data_version()
+
+    first = repository.add_bid(_new_bid(repository, "Harbor Hotel"))
+    after_first = repository.data_version()
+    second = repository.add_bid(_new_bid(repository, "Lakeside Inn"))
+
+    assert (first, second) == ("BID-NEW-001", "BID-NEW-002")
+    assert len({initial_version, after_first, repository.data_version()}) == 3
+    assert [bid.hotel_name for bid in repository.latest_bids(2)] == ["Harbor Hotel", "Lakeside Inn"]
+
+
+def test_bids_and_version_survive_a_restart(repository):
+    repository.add_bid(_new_bid(repository, "Harbor Hotel"))
+    version = repository.data_version()
+
+    reopened = BusinessRepository(str(repository.db_path))
+
+    assert reopened.data_version() == version
+    assert reopened.get_bid("BID-NEW-001").hotel_name == "Harbor Hotel"
+    assert reopened.add_bid(_new_bid(reopened, "Lakeside Inn")) == "BID-NEW-002"
+
+
+def test_stale_data_is_reseeded_keeping_runtime_bids(repository):
+    repository.add_bid(_new_bid(repository, "Harbor Hotel"))
+    stale = (datetime.now() - timedelta(days=30)).isoformat()
+    repository._connection().execute("UPDATE business_meta SET value = ? WHERE key = 'generated_at'", (stale,))
+    version = repository.data_version()
+
+    snapshot = repository.get_snapshot()
+
+    assert snapshot["data_version"] != version
+    assert datetime.fromisoformat(repository._get_meta("generated_at")) > datetime.now() - timedelta(minutes=1)
+    assert repository.latest_bids(1)[0].bid_id == "BID-NEW-001"
+    assert repository.add_bid(_new_bid(repository, "Lakeside Inn")) == "BID-NEW-002"
+
+
+def test_export_reads_one_consistent_snapshot(repository):
+    repository.add_bid(_new_bid(repository, "Harbor Hotel"))
+
+    data = repository.export_data()
+
+    assert data["dashboard"].total_pipeline_value == pytest.approx(sum(bid.total_cost for bid in data["bids"]))
+    assert data["data_version"] == repository.data_version()
+    assert not repository._connection().in_transaction
@@ -0,0 +1,32 @@
+from core.semantic_cache import SemanticAnswerCache
+
+
+VERSION = "v1"
+
+
+def _cache(*questions):
+    """A cache holding an answer for each question, with the seeded chain and city names."""
+    cache = SemanticAnswerCache(0.75, 16, entity_names=lambda: ["Marriott", "Hilton", "Hyatt", "Chicago", "Boston"])
+    for question in questions:
+        cache.add(question, f"answer to {question}", VERSION)
+    return cache
+
+
+def test_paraphrased_question_reuses_the_answer():
+    cache = _cache("Top hotels by win rate")
+
+    match = cache.lookup("Which hotels win most?", VERSION)
+
+    assert match is not None and match.question == "Top hotels by win rate"
+
+
+def test_question_about_another_entity_misses():
+    cache = _cache(
+        "Compare the average total cost of Marriott versus Hilton bids for conferences",
+        "How many Hilton hotels in Chicago have bids with status pending for the next quarter?"
+    )
+
+    assert cache.lookup("Compare the average total cost of Marriott versus Hyatt bids for conferences", VERSION) is None
+    assert cache.lookup("How many Hilton hotels in Chicago have bids with status accepted for the next quarter?", VERSION) is None
+    assert cache.lookup("How many Hilton hotels in Boston have bids with status pending for the next quarter?", VERSION) is None
+    assert cache.lookup("Compare the average total cost of Marriott vs Hilton bids for conferences", VERSION) is not None
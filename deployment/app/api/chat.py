@@ -2,7 +2,7 @@ import logging
 import time
 from collections import defaultdict
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
@@ -17,6 +17,7 @@ from models.chat_models import (
 )
 from services.chat_service import get_chat_service
 from core.config import get_settings
+from core.corpus import get_corpus_manager
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -65,6 +66,9 @@ async def chat_endpoint(request: ChatRequest, client_request: Request):
                 detail="Rate limit exceeded. Please try again later."
             )
         
+        if request.document_id and not get_corpus_manager().has_document(request.document_id):
+            raise HTTPException(status_code=404, detail=f"Document not found: {request.document_id}")
+        
         # Get or create conversation ID
         conversation_id = request.conversation_id or str(uuid.uuid4())
         
@@ -83,11 +87,16 @@ async def chat_endpoint(request: ChatRequest, client_request: Request):
             try:
                 message_id = str(uuid.uuid4())
                 response_content = ""
+                citations = []
                 
                 # Stream the AI response
                 async for chunk in chat_service.process_message_stream(
                     message=request.message,
-                    conversation_id=conversation_id
+                    conversation_id=conversation_id,
+                    client_ip=client_ip,
+                    document_id=request.document_id,
+                    search_corpus=request.search_corpus,
+                    on_citations=citations.extend
                 ):
                     if chunk:
                         response_content += chunk
@@ -101,6 +110,15 @@ async def chat_endpoint(request: ChatRequest, client_request: Request):
                         )
                         yield f"data: {stream_response.json()}\n\n"
                 
+                # Send the sources the answer was based on
+                citations_response = StreamModel(
+                    type="citations",
+                    citations=citations,
+                    conversation_id=conversation_id,
+                    message_id=message_id
+                )
+                yield f"data: {citations_response.json()}\n\n"
+                
                 # Send completion signal
                 completion_response = StreamModel(
                     type="done",
@@ -271,16 +289,25 @@ async def export_conversation(conversation_id: str, format: str = "markdown"):
 
 # Bonus Feature: Token usage tracking
 @router.get("/usage/tokens")
-async def get_token_usage():
-    """Get token usage statistics (bonus feature)."""
+async def get_token_usage(bucket_seconds: Optional[int] = None, top: int = 10):
+    """
+    Get token usage statistics (bonus feature).
+    Includes per-model, per-conversation and per-client breakdowns plus
+    rollups bucketed by `bucket_seconds` (defaults to the configured bucket width).
+    """
     try:
+        if bucket_seconds is not None and bucket_seconds <= 0:
+            raise HTTPException(status_code=400, detail="bucket_seconds must be positive")
+        
         chat_service = get_chat_service()
         if not chat_service:
             raise HTTPException(status_code=503, detail="Chat service unavailable")
         
-        usage_stats = chat_service.get_token_usage_stats()
+        usage_stats = chat_service.get_token_usage_stats(bucket_seconds=bucket_seconds, top=top)
         return usage_stats
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting token usage: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,52 @@
+import logging
+from fastapi import APIRouter, HTTPException
+
+from core.config import get_settings
+from core.corpus import get_corpus_manager
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Create router for document corpus endpoints
+router = APIRouter(prefix="/api", tags=["documents"])
+
+
+@router.get("/documents")
+async def list_documents():
+    """List registered corpus documents and their memory residency."""
+    try:
+        corpus = get_corpus_manager()
+        return {
+            "documents": corpus.list_documents(),
+            "default_document_id": settings.default_document_id,
+            "stats": corpus.get_stats()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error listing documents: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list documents")
+
+
+@router.get("/documents/{document_id}")
+async def get_document(document_id: str):
+    """Get a corpus document's registration details."""
+    corpus = get_corpus_manager()
+    document = next((doc for doc in corpus.list_documents() if doc["document_id"] == document_id), None)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+
+@router.post("/documents/rescan")
+async def rescan_documents():
+    """Register any new PDFs found in the corpus directory."""
+    if not settings.corpus_dir:
+        raise HTTPException(status_code=400, detail="No corpus directory configured")
+    
+    try:
+        registered = get_corpus_manager().scan_directory(settings.corpus_dir)
+        return {"registered": registered, "total_registered": len(registered)}
+        
+    except Exception as e:
+        logger.error(f"Error rescanning corpus directory: {e}")
+        raise HTTPException(status_code=500, detail=f"Rescan failed: {str(e)}")
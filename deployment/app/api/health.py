@@ -5,7 +5,8 @@ from fastapi import APIRouter, HTTPException
 from models.chat_models import HealthResponse, AppStatus, PDFInfo
 from core.config import get_settings
 from core.pdf_processor import get_pdf_processor
-from core.ai_client import validate_ai_setup
+from core.query_cache import get_query_cache
+from core.ai_client import get_ai_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -17,6 +18,18 @@ router = APIRouter(tags=["health"])
 _app_start_time = time.time()
 
 
+def _ai_configured() -> bool:
+    """
+    Whether the AI client is set up, without a model request.
+    Status checks run often and must stay constant-time; startup validates the connection itself.
+    """
+    try:
+        return get_ai_client().get_model_info()["api_key_configured"]
+    except Exception as e:
+        logger.warning(f"AI client check failed: {e}")
+        return False
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -30,9 +43,8 @@ async def health_check():
         
         if pdf_loaded:
             try:
-                # Verify PDF is actually accessible
-                pdf_text = pdf_processor.get_full_text()
-                pdf_loaded = bool(pdf_text and len(pdf_text) > 0)
+                # Verify PDF text is actually available
+                pdf_loaded = pdf_processor.has_text()
             except Exception as e:
                 logger.warning(f"PDF processor check failed: {e}")
                 pdf_loaded = False
@@ -40,7 +52,7 @@ async def health_check():
         # Check OpenAI API status
         openai_available = False
         try:
-            openai_available = validate_ai_setup()
+            openai_available = _ai_configured()
         except Exception as e:
             logger.warning(f"OpenAI validation failed: {e}")
             openai_available = False
@@ -89,14 +101,14 @@ async def detailed_status():
         
         if pdf_processor:
             try:
-                pdf_text = pdf_processor.get_full_text()
-                pdf_status = bool(pdf_text and len(pdf_text) > 0)
+                pdf_status = pdf_processor.has_text()
                 
-                if pdf_status:
-                    stats = pdf_processor.get_summary_stats()
+                # Probed metadata is available before any text, while a large PDF is loading
+                stats = pdf_processor.get_summary_stats()
+                if stats:
                     pdf_info = PDFInfo(
                         title=stats.get('metadata', {}).get('title', 'Unknown'),
-                        total_pages=stats.get('total_pages', 0),
+                        total_pages=stats.get('document_pages', 0),
                         total_words=stats.get('total_words', 0),
                         total_characters=stats.get('total_characters', 0),
                         author=stats.get('metadata', {}).get('author', None),
@@ -111,7 +123,7 @@ async def detailed_status():
         # AI Component
         ai_status = False
         try:
-            ai_status = validate_ai_setup()
+            ai_status = _ai_configured()
         except Exception as e:
             logger.warning(f"AI status check failed: {e}")
             ai_status = False
@@ -142,12 +154,15 @@ async def detailed_status():
         else:
             overall_status = "unhealthy"
         
+        query_cache = get_query_cache()
+        
         return AppStatus(
             app_name=settings.app_name,
             version=settings.app_version,
             status=overall_status,
             components=components,
-            pdf_info=pdf_info
+            pdf_info=pdf_info,
+            query_cache=query_cache.get_stats() if query_cache else None
         )
         
     except Exception as e:
@@ -192,6 +207,8 @@ async def get_version():
 async def get_pdf_info():
     """
     Get information about the loaded PDF document.
+    Page count, title and author are available as soon as loading starts;
+    word and character counts grow as pages are indexed.
     """
     try:
         pdf_processor = get_pdf_processor()
@@ -201,8 +218,10 @@ async def get_pdf_info():
         stats = pdf_processor.get_summary_stats()
         return {
             "pdf_loaded": True,
+            "load_state": pdf_processor.load_state,
             "title": stats.get('metadata', {}).get('title', 'Unknown'),
-            "total_pages": stats.get('total_pages', 0),
+            "total_pages": stats.get('document_pages', 0),
+            "pages_indexed": stats.get('total_pages', 0),
             "total_words": stats.get('total_words', 0),
             "total_characters": stats.get('total_characters', 0),
             "author": stats.get('metadata', {}).get('author', None),
@@ -215,34 +234,87 @@ async def get_pdf_info():
         raise HTTPException(status_code=500, detail=f"Error retrieving PDF information: {str(e)}")
 
 
+@router.get("/pdf-sections")
+async def get_pdf_sections():
+    """
+    Get the section tree of the loaded PDF.
+    Sections come from the PDF outline when it has one, otherwise from heading lines.
+    """
+    pdf_processor = get_pdf_processor()
+    if not pdf_processor:
+        raise HTTPException(status_code=503, detail="PDF processor not available")
+    
+    try:
+        section_index = pdf_processor.get_section_index()
+        return {
+            "sections": [section.to_dict() for section in section_index.sections],
+            **section_index.get_stats()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error building PDF sections: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving PDF sections: {str(e)}")
+
+
+@router.get("/pdf-search")
+async def search_pdf(q: str, limit: int = 10, case_sensitive: bool = False):
+    """
+    Search the loaded PDF document.
+    Multi-term queries are ranked with BM25; wrap text in quotes for phrase search.
+    """
+    pdf_processor = get_pdf_processor()
+    if not pdf_processor:
+        raise HTTPException(status_code=503, detail="PDF processor not available")
+    
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    try:
+        start_time = time.time()
+        results = pdf_processor.search_text(q, case_sensitive=case_sensitive, limit=max(1, limit))
+        return {
+            "query": q,
+            "results": results,
+            "total_results": len(results),
+            "search_time_ms": (time.time() - start_time) * 1000
+        }
+        
+    except Exception as e:
+        logger.error(f"Error searching PDF: {e}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
 @router.get("/readiness")
 async def readiness_check():
     """
     Kubernetes-style readiness probe.
-    Returns 200 if app is ready to serve traffic.
+    Returns 200 if app is ready to serve traffic. While the PDF loads
+    progressively, it is ready once readiness_min_pages pages are indexed.
     """
     try:
         # Check critical components
         pdf_processor = get_pdf_processor()
         pdf_ready = pdf_processor is not None
+        load_progress = None
         
         if pdf_ready:
             try:
-                pdf_text = pdf_processor.get_full_text()
-                pdf_ready = bool(pdf_text and len(pdf_text) > 0)
+                load_progress = pdf_processor.get_load_progress()
+                pdf_ready = pdf_processor.is_ready(settings.readiness_min_pages)
             except Exception:
                 pdf_ready = False
         
-        ai_ready = validate_ai_setup()
+        ai_ready = _ai_configured()
         
         if pdf_ready and ai_ready:
-            return {"status": "ready", "timestamp": datetime.now().isoformat()}
+            return {"status": "ready", "pdf_load": load_progress, "timestamp": datetime.now().isoformat()}
         else:
             raise HTTPException(
                 status_code=503,
                 detail={
                     "status": "not_ready",
                     "pdf_ready": pdf_ready,
+                    "pdf_load": load_progress,
                     "ai_ready": ai_ready,
                     "timestamp": datetime.now().isoformat()
                 }
@@ -255,4 +327,4 @@ async def readiness_check():
         raise HTTPException(
             status_code=503,
             detail={"status": "error", "error": str(e), "timestamp": datetime.now().isoformat()}
-        )
\ No newline at end of file
+        )
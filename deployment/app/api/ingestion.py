@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from sse_starlette.sse import EventSourceResponse
+
+from core.config import get_settings
+from core.corpus import get_corpus_manager, make_document_id, normalize_document_id
+from core.extractors import AUTO_EXTRACTOR, available_extractors
+from services.ingestion_service import get_ingestion_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bytes read from the upload per write
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# How often progress streams check their job for changes
+PROGRESS_POLL_SECONDS = 0.5
+
+# Create router for document ingestion endpoints
+router = APIRouter(prefix="/api/ingestion", tags=["ingestion"])
+
+
+def _job_links(job_id: str) -> dict:
+    return {
+        "status_url": f"/api/ingestion/jobs/{job_id}",
+        "events_url": f"/api/ingestion/jobs/{job_id}/events"
+    }
+
+
+async def _save_upload(file: UploadFile, filename: str, target_path: Path) -> int:
+    """Stream an upload to a temporary file and move it into place; returns its size in bytes."""
+    upload_dir = target_path.parent
+    max_bytes = settings.max_upload_mb * 1024 * 1024
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = upload_dir / f".tmp-{uuid.uuid4().hex}.pdf"
+    size_bytes = 0
+
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if size_bytes == 0 and not chunk.startswith(b"%PDF-"):
+                    raise HTTPException(status_code=400, detail="File is not a valid PDF")
+                size_bytes += len(chunk)
+                if size_bytes > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File exceeds {settings.max_upload_mb} MB limit")
+                await out.write(chunk)
+
+        if size_bytes == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        os.replace(tmp_path, target_path)
+
+    except HTTPException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.error(f"Error saving upload {filename}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save upload")
+
+    finally:
+        await file.close()
+
+    return size_bytes
+
+
+@router.post("/upload", status_code=202)
+async def upload_document(file: UploadFile = File(...), document_id: Optional[str] = Form(None),
+                          extractor: Optional[str] = Form(None)):
+    """
+    Upload a PDF and queue it for ingestion.
+    The file is streamed to disk and extraction, chunking and indexing run in
+    the background; poll the job or subscribe to its events for progress.
+    extractor optionally picks the text extraction backend (or "auto").
+    """
+    filename = file.filename or ""
+    if not filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files can be uploaded")
+
+    extractors = available_extractors() + [AUTO_EXTRACTOR]
+    if extractor and extractor not in extractors:
+        raise HTTPException(status_code=400, detail=f"Unknown extractor {extractor}; choose one of: {', '.join(extractors)}")
+
+    document_id = normalize_document_id(document_id) if document_id else make_document_id(Path(filename))
+    if document_id == settings.default_document_id:
+        raise HTTPException(status_code=409, detail=f"Document id is reserved: {document_id}")
+
+    # The document is claimed before the upload is saved, so concurrent uploads cannot both replace its file
+    ingestion_service = get_ingestion_service()
+    if not ingestion_service.reserve(document_id):
+        raise HTTPException(status_code=409, detail=f"Document is already being ingested: {document_id}")
+
+    try:
+        upload_dir = Path(settings.upload_dir)
+        target_path = (upload_dir / f"{document_id}.pdf").resolve()
+        existing = next((doc for doc in get_corpus_manager().list_documents() if doc["document_id"] == document_id), None)
+        if existing and Path(existing["path"]) != target_path:
+            raise HTTPException(status_code=409, detail=f"Document id already registered for another file: {document_id}")
+        size_bytes = await _save_upload(file, filename, target_path)
+    except BaseException:
+        ingestion_service.release(document_id)
+        raise
+
+    job = ingestion_service.submit(document_id, str(target_path), filename, size_bytes, extractor or None)
+    return {"job": job.to_dict(), **_job_links(job.job_id)}
+
+
+@router.get("/jobs")
+async def list_jobs():
+    """List recent ingestion jobs, newest first."""
+    return {"jobs": get_ingestion_service().list_jobs()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get an ingestion job's progress."""
+    job = get_ingestion_service().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job.to_dict(), **_job_links(job_id)}
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Stream an ingestion job's progress as Server-Sent Events.
+    Emits a "progress" event on every change and ends with a "completed" or
+    "failed" event.
+    """
+    job = get_ingestion_service().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def generate_events():
+        revision = -1
+        while not await request.is_disconnected():
+            if job.revision != revision:
+                revision = job.revision
+                event = job.status if job.finished else "progress"
+                yield {"event": event, "data": json.dumps(job.to_dict())}
+                if job.finished:
+                    break
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
+
+    return EventSourceResponse(generate_events(), headers={"Cache-Control": "no-cache"})
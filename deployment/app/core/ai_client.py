@@ -1,14 +1,34 @@
+import asyncio
 import logging
-from typing import List, Dict, Optional, AsyncGenerator
+from dataclasses import dataclass
+from typing import List, Dict, Optional, AsyncGenerator, Callable
 from anthropic import AsyncAnthropic
 from core.config import get_settings
 from core.pdf_processor import get_pdf_processor
+from core.retriever import RetrievedChunk, get_current_retriever
+from core.corpus import get_corpus_manager
+from core.minhash import MinHasher, dedupe_chunks
+from core.token_usage import TokenUsageTracker, get_usage_tracker, SYSTEM_CONVERSATION_ID
+from models.chat_models import TokenUsage
 
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+@dataclass
+class PromptContext:
+    """The prompt built for one question and the document excerpts it contains."""
+    messages: List[Dict]
+    system_prompt: str
+    chunks: List[RetrievedChunk]
+    tokens_saved: int = 0  # Excerpt tokens left out as near-duplicates
+
+    def citations(self) -> List[Dict]:
+        """Sources of the excerpts, in prompt order."""
+        return [chunk.to_citation() for chunk in self.chunks]
+
+
 class AIClient:
     """Professional Anthropic client with streaming support."""
     
@@ -20,18 +40,63 @@ class AIClient:
         self.model = settings.anthropic_model
         self.max_tokens = settings.max_tokens
         self.temperature = settings.temperature
+        self.hasher = MinHasher(settings.minhash_permutations)
         
-    def _build_context_prompt(self, user_message: str, conversation_history: List[Dict] = None) -> List[Dict]:
+    def _build_context_prompt(self, user_message: str, conversation_history: List[Dict] = None,
+                              document_id: Optional[str] = None,
+                              search_corpus: bool = False) -> PromptContext:
         """Build the complete prompt with PDF context and conversation history."""
-        pdf_processor = get_pdf_processor()
+        query = self._build_retrieval_query(user_message, conversation_history)
+        
+        if search_corpus or (document_id and document_id != settings.default_document_id):
+            # Retrieve from another corpus document, or across the whole corpus
+            corpus = get_corpus_manager()
+            chunks = corpus.retrieve(query, document_id=None if search_corpus else document_id)
+            if search_corpus:
+                pdf_processor = None
+                corpus_stats = corpus.get_stats()
+            else:
+                pdf_processor = corpus.get_document(document_id).processor
+        else:
+            pdf_processor = get_pdf_processor()
+            
+            if not pdf_processor:
+                logger.error("PDF processor not initialized")
+                raise ValueError("PDF context not available")
+            
+            # Retrieve only the excerpts relevant to this question
+            retriever = get_current_retriever()
+            if retriever is None:
+                raise ValueError("Document index not available")
+            
+            chunks = retriever.retrieve(query)
         
-        if not pdf_processor:
-            logger.error("PDF processor not initialized")
-            raise ValueError("PDF context not available")
+        tokens_saved = 0
+        if settings.dedup_enabled and len(chunks) > 1:
+            retrieved = len(chunks)
+            chunks, tokens_saved = dedupe_chunks(chunks, self.hasher, settings.dedup_similarity_threshold)
+            if tokens_saved:
+                logger.info(f"Dropped {retrieved - len(chunks)} near-duplicate chunks (~{tokens_saved} tokens saved)")
+        
+        pdf_text = "\n\n".join(
+            f"[{chunk.document_title + ', ' if chunk.document_title else ''}{chunk.page_label}]\n{chunk.text}"
+            for chunk in chunks
+        )
+        logger.info(f"Retrieved {len(chunks)} chunks (~{sum(chunk.tokens for chunk in chunks)} tokens) for prompt")
         
-        # Get PDF content
-        pdf_text = pdf_processor.get_full_text()
-        pdf_stats = pdf_processor.get_summary_stats()
+        loading_note = ""
+        if pdf_processor:
+            pdf_stats = pdf_processor.get_summary_stats()
+            load_progress = pdf_processor.get_load_progress()
+            if load_progress["state"] == "loading":
+                loading_note = (f"\n        Note: the document is still being processed ({load_progress['pages_processed']} of "
+                                f"{load_progress['total_pages']} pages so far); answers may be incomplete.")
+        else:
+            pdf_stats = {
+                "metadata": {"title": f"Document corpus ({corpus_stats['documents']} documents)"},
+                "total_pages": "Multiple documents",
+                "total_words": "Multiple documents"
+            }
         
         # Build system message with PDF context
         system_prompt = f"""You are MCW Digital's AI assistant that answers questions based on a PDF document about accessible travel laws and regulations.
@@ -45,13 +110,13 @@ class AIClient:
         DOCUMENT CONTEXT:
         Title: {pdf_stats.get('metadata', {}).get('title', 'Accessible Travel Guide')}
         Pages: {pdf_stats.get('total_pages', 'Unknown')}
-        Word Count: {pdf_stats.get('total_words', 'Unknown')}
+        Word Count: {pdf_stats.get('total_words', 'Unknown')}{loading_note}
 
-        FULL DOCUMENT CONTENT:
+        RELEVANT DOCUMENT EXCERPTS (each labeled with its source and page numbers):
         {pdf_text}
 
         INSTRUCTIONS:
-        1. Answer questions based ONLY on the information provided in the document above
+        1. Answer questions based ONLY on the information provided in the document excerpts above
         2. If the document doesn't contain information to answer a question, clearly state that
         3. Provide specific references to relevant sections when possible
         4. Be conversational and helpful while staying accurate to the document content
@@ -76,12 +141,37 @@ class AIClient:
         # Add current user message
         messages.append({"role": "user", "content": user_message})
         
-        return messages, system_prompt
+        return PromptContext(messages, system_prompt, chunks, tokens_saved)
     
-    async def generate_response(self, user_message: str, conversation_history: List[Dict] = None) -> str:
+    @staticmethod
+    def _build_retrieval_query(user_message: str, conversation_history: List[Dict] = None) -> str:
+        """Combine the question with the previous user turn so follow-ups keep their topic."""
+        if conversation_history:
+            for msg in reversed(conversation_history):
+                if msg.get("role") == "user" and msg.get("content") != user_message:
+                    return f"{user_message}\n{msg['content']}"
+        return user_message
+    
+    def _report_usage(self, message, on_usage: Optional[Callable[[TokenUsage], None]] = None,
+                      context_tokens_saved: int = 0):
+        """Hand the usage block of an Anthropic message to the caller's usage callback."""
+        try:
+            usage = TokenUsageTracker.usage_from_message(message, self.model)
+            if usage and on_usage:
+                usage.context_tokens_saved = context_tokens_saved
+                on_usage(usage)
+        except Exception as e:
+            logger.warning(f"Failed to record token usage: {e}")
+    
+    async def generate_response(self, user_message: str, conversation_history: List[Dict] = None,
+                                on_usage: Optional[Callable[[TokenUsage], None]] = None,
+                                document_id: Optional[str] = None, search_corpus: bool = False) -> str:
         """Generate a non-streaming response."""
         try:
-            messages, system_prompt = self._build_context_prompt(user_message, conversation_history)
+            # Retrieval may load a document from disk, so keep it off the event loop
+            context = await asyncio.to_thread(
+                self._build_context_prompt, user_message, conversation_history, document_id, search_corpus
+            )
             
             logger.info(f"Generating response for message: {user_message[:100]}...")
             
@@ -89,9 +179,10 @@ class AIClient:
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                system=system_prompt,
-                messages=messages
+                system=context.system_prompt,
+                messages=context.messages
             )
+            self._report_usage(response, on_usage, context.tokens_saved)
             
             if response.content and len(response.content) > 0:
                 content = response.content[0].text
@@ -105,10 +196,23 @@ class AIClient:
             logger.error(f"Anthropic API error: {e}")
             return "I'm experiencing technical difficulties. Please try again."
     
-    async def generate_streaming_response(self, user_message: str, conversation_history: List[Dict] = None) -> AsyncGenerator[str, None]:
-        """Generate a streaming response for real-time display."""
+    async def generate_streaming_response(self, user_message: str, conversation_history: List[Dict] = None,
+                                          on_usage: Optional[Callable[[TokenUsage], None]] = None,
+                                          document_id: Optional[str] = None,
+                                          search_corpus: bool = False,
+                                          on_citations: Optional[Callable[[List[Dict]], None]] = None
+                                          ) -> AsyncGenerator[str, None]:
+        """
+        Generate a streaming response for real-time display.
+        on_citations receives the sources of the excerpts the answer is based on.
+        """
         try:
-            messages, system_prompt = self._build_context_prompt(user_message, conversation_history)
+            # Retrieval may load a document from disk, so keep it off the event loop
+            context = await asyncio.to_thread(
+                self._build_context_prompt, user_message, conversation_history, document_id, search_corpus
+            )
+            if on_citations:
+                on_citations(context.citations())
             
             logger.info(f"Generating streaming response for: {user_message[:100]}...")
             
@@ -116,13 +220,16 @@ class AIClient:
                 model=self.model,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                system=system_prompt,
-                messages=messages
+                system=context.system_prompt,
+                messages=context.messages
             ) as stream:
                 full_response = ""
                 async for text in stream.text_stream:
                     full_response += text
                     yield text
+                
+                # Final message carries the complete usage, including cache tokens
+                self._report_usage(await stream.get_final_message(), on_usage, context.tokens_saved)
             
             logger.info(f"Completed streaming response: {len(full_response)} characters")
                     
@@ -139,6 +246,10 @@ class AIClient:
                 max_tokens=5,
                 messages=[{"role": "user", "content": "Hello"}]
             )
+            self._report_usage(
+                response,
+                lambda usage: get_usage_tracker().record(usage, conversation_id=SYSTEM_CONVERSATION_ID)
+            )
             return bool(response.content)
         except Exception as e:
             logger.error(f"Anthropic connection validation failed: {e}")
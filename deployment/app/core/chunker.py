@@ -0,0 +1,172 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from core.text_utils import CHARS_PER_TOKEN, estimate_tokens
+
+
+# Identifies the chunk boundary rules; bump when chunk spans change so data saved per chunk is rebuilt
+CHUNKER_VERSION = 2
+
+# Sentence ends (followed by whitespace) and line breaks are candidate split points
+_SPLIT_PATTERN = re.compile(r"[.!?](?=\s)|\n")
+# Numbering followed by a capitalized title; "24 hours" in a table is not a heading
+_NUMBERED_HEADING = re.compile(r"^(\d+(\.\d+)*[.)]?|[IVXLC]+\.)\s+[A-Z]")
+_KEYWORD_HEADING = re.compile(r"^(page|chapter|section|part|appendix)\s+[\w.-]+\s*[:.-]", re.IGNORECASE)
+
+MAX_HEADING_CHARS = 80
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A contiguous span of the document's full text used as a retrieval unit."""
+    chunk_id: int
+    start: int  # Character offset in the full text
+    end: int
+    start_page: int
+    end_page: int
+    tokens: int
+    heading: Optional[str] = None
+
+
+@dataclass
+class _Segment:
+    """A sentence or line within a page, in full-text offsets."""
+    start: int
+    end: int
+    page_number: int
+    tokens: int
+    heading: Optional[str]
+
+
+def is_structural_heading(line: str) -> bool:
+    """Detect a heading marked by numbering or a page/chapter/section keyword."""
+    line = line.strip()
+    if not line or len(line) > MAX_HEADING_CHARS or line[-1] in ".,;":
+        return False
+    return bool(_KEYWORD_HEADING.match(line) or _NUMBERED_HEADING.match(line))
+
+
+def is_heading(line: str) -> bool:
+    """Heuristically detect a heading line, structural or inferred from capitalization."""
+    line = line.strip()
+    if not line or len(line) > MAX_HEADING_CHARS or line[-1] in ".,;":
+        return False
+    if is_structural_heading(line):
+        return True
+    words = [word for word in line.split() if word[0].isalpha()]
+    if not words or len(words) > 12:
+        return False
+    if line.isupper():
+        return True
+    capitalized = sum(1 for word in words if word[0].isupper())
+    return capitalized / len(words) >= 0.6 and len(words) >= 2
+
+
+def _split_long(start: int, text: str, max_chars: int) -> Iterable[Tuple[int, int]]:
+    """Split an over-long span at whitespace near max_chars."""
+    position = 0
+    while position < len(text):
+        end = min(len(text), position + max_chars)
+        if end < len(text):
+            space = text.rfind(" ", position + max_chars // 2, end)
+            if space > position:
+                end = space
+        yield start + position, start + end
+        position = end
+
+
+def _segments(page_number: int, page_offset: int, text: str, max_tokens: int) -> List[_Segment]:
+    """Split a page into sentence/line segments, marking the ones that start with a heading."""
+    segments = []
+    position = 0
+    boundaries = [match.end() for match in _SPLIT_PATTERN.finditer(text)] + [len(text)]
+
+    for boundary in boundaries:
+        if boundary <= position:
+            continue
+        piece = text[position:boundary]
+        stripped = piece.strip()
+        if stripped:
+            lead = len(piece) - len(piece.lstrip())
+            start = position + lead
+            end = start + len(stripped)
+            heading = stripped if piece.endswith("\n") or boundary == len(text) else None
+            heading = heading if heading and is_heading(heading) else None
+
+            if estimate_tokens(stripped) > max_tokens:
+                for span_start, span_end in _split_long(start, text[start:end], max_tokens * CHARS_PER_TOKEN):
+                    segments.append(_Segment(page_offset + span_start, page_offset + span_end, page_number,
+                                             estimate_tokens(text[span_start:span_end]), None))
+            else:
+                segments.append(_Segment(page_offset + start, page_offset + end, page_number,
+                                         estimate_tokens(stripped), heading))
+        position = boundary
+
+    return segments
+
+
+def chunk_pages(pages: Iterable[Tuple[int, int, str]], max_tokens: int, overlap_tokens: int = 0) -> List[Chunk]:
+    """
+    Pack pages into chunks of at most max_tokens estimated tokens.
+
+    pages yields (page_number, full-text offset, text) in order. Whole pages
+    are packed together while they fit; a page is only split when it is larger
+    than the budget, and then at sentence or line ends, with headings always
+    starting a new chunk. Splits inside a page repeat up to overlap_tokens of
+    trailing sentences at the start of the next chunk.
+    """
+    max_tokens = max(1, max_tokens)
+    chunks: List[Chunk] = []
+    current: List[_Segment] = []
+    current_tokens = 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            heading = next((segment.heading for segment in current if segment.heading), None)
+            chunks.append(Chunk(
+                chunk_id=len(chunks),
+                start=current[0].start,
+                end=current[-1].end,
+                start_page=current[0].page_number,
+                end_page=current[-1].page_number,
+                tokens=sum(segment.tokens for segment in current),
+                heading=heading
+            ))
+        current = []
+        current_tokens = 0
+
+    for page_number, page_offset, text in pages:
+        segments = _segments(page_number, page_offset, text, max_tokens)
+        if not segments:
+            continue
+        page_tokens = sum(segment.tokens for segment in segments)
+
+        # Start a new chunk at the page boundary unless the whole page fits
+        if current and current_tokens + page_tokens > max_tokens:
+            flush()
+
+        for segment in segments:
+            # A heading stays with the text that follows it, even if that overruns the budget slightly
+            only_headings = all(previous.heading for previous in current)
+            if current and (segment.heading or (current_tokens + segment.tokens > max_tokens and not only_headings)):
+                overlap = []
+                if not segment.heading and overlap_tokens > 0:
+                    # Carry trailing sentences from this page into the next chunk
+                    carried = 0
+                    for previous in reversed(current):
+                        if previous.page_number != page_number or carried + previous.tokens > overlap_tokens:
+                            break
+                        overlap.insert(0, previous)
+                        carried += previous.tokens
+                    if len(overlap) == len(current) or carried + segment.tokens > max_tokens:
+                        overlap = []
+                flush()
+                current = overlap
+                current_tokens = sum(previous.tokens for previous in overlap)
+            current.append(segment)
+            current_tokens += segment.tokens
+
+    flush()
+    return chunks
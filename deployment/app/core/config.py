@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -22,8 +22,58 @@ class Settings(BaseSettings):
     max_tokens: int = 1500
     temperature: float = 0.7
 
+    # Token Accounting Configuration
+    # Prices in USD per million tokens, matched by longest model name prefix
+    token_prices: Dict[str, Dict[str, float]] = {
+        "claude-opus-4": {"input": 15.0, "output": 75.0, "cache_write": 18.75, "cache_read": 1.50},
+        "claude-sonnet-4": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30},
+        "claude-4-sonnet": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30},
+        "claude-3-5-haiku": {"input": 0.80, "output": 4.0, "cache_write": 1.0, "cache_read": 0.08},
+        "default": {"input": 3.0, "output": 15.0, "cache_write": 3.75, "cache_read": 0.30}
+    }
+    usage_history_size: int = 10000  # Recent responses kept for time-bucketed rollups
+    usage_bucket_seconds: int = 3600
+
     # PDF Configuration
     pdf_path: str = "documents/accessibility_guide.pdf"
+    extraction_cache_enabled: bool = True
+    extraction_cache_dir: str = "cache/extraction"
+    pdf_extraction_workers: int = 0  # Processes for page extraction; 0 uses every CPU core
+    pdf_parallel_min_pages: int = 50  # Smaller documents are extracted in-process
+    pdf_extractor: str = "pdfplumber"  # Text extraction backend: pdfplumber, pdfminer, pypdf or auto
+    pdf_extractor_large: str = "pypdf"  # Backend "auto" uses for large documents
+    pdf_extractor_auto_pages: int = 200  # Page count from which "auto" switches to pdf_extractor_large
+    pdf_progressive_loading: bool = False  # Extract in the background and serve pages as they are indexed
+    readiness_min_pages: int = 0  # While loading progressively, report ready after this many pages (0 = wait for all)
+
+    # Corpus Configuration
+    corpus_dir: str = ""  # Directory of additional PDFs to register at startup
+    corpus_registry_path: str = "cache/corpus/registry.json"
+    corpus_memory_limit_mb: int = 512  # Estimated memory for resident documents before LRU eviction
+    default_document_id: str = "default"  # Document id of pdf_path within the corpus
+
+    # Ingestion Configuration
+    upload_dir: str = "uploads"  # Where uploaded PDFs are stored
+    max_upload_mb: int = 100
+    ingestion_workers: int = 2  # Documents extracted and indexed concurrently
+    ingestion_job_history: int = 100  # Finished jobs kept for status queries
+
+    # Retrieval Configuration
+    retrieval_top_k: int = 5
+    retrieval_chunk_tokens: int = 500  # Estimated tokens per chunk; chunks break at page and heading boundaries
+    retrieval_chunk_overlap_tokens: int = 50  # Trailing sentences repeated when a page is split
+    retrieval_token_budget: int = 4000  # Max estimated tokens of document excerpts per prompt
+    retriever_rebuild_pages: int = 25  # While a PDF loads, rebuild the retriever after this many new pages...
+    retriever_rebuild_seconds: float = 10.0  # ...or this long since the last build, whichever comes first
+    vector_search_enabled: bool = True  # Fuse keyword ranking with local hashed-feature vector similarity
+    vector_dimensions: int = 1024
+    vector_min_similarity: float = 0.05  # Cosine similarity below which vector matches are ignored
+    section_routing_enabled: bool = True  # Answer questions that name a section from that section only
+    dedup_enabled: bool = True  # Drop retrieved chunks that nearly duplicate a better-ranked one
+    dedup_similarity_threshold: float = 0.8  # Estimated Jaccard similarity of word shingles
+    minhash_permutations: int = 64  # MinHash signature length (16 LSH bands)
+    query_cache_enabled: bool = True  # Reuse ranked results of repeated queries until the document changes
+    query_cache_max_entries: int = 2048
 
     # Chat Configuration
     max_conversation_history: int = 10
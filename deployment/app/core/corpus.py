@@ -0,0 +1,486 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.config import get_settings
+from core.extraction_cache import get_extraction_cache
+from core.pdf_processor import PDFProcessor, get_pdf_processor, probe_pdf
+from core.retriever import DocumentRetriever, RetrievedChunk, select_within_budget
+from core.text_utils import tokenize
+from core.vector_index import reciprocal_rank_fusion
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_DOCUMENT_ID_PATTERN = re.compile(r"[^a-z0-9_-]+")
+
+
+def normalize_document_id(value: str) -> str:
+    """Reduce a string to a safe document id (lowercase letters, digits, dashes and underscores)."""
+    return _DOCUMENT_ID_PATTERN.sub("-", value.lower()).strip("-") or "document"
+
+
+def make_document_id(path: Path) -> str:
+    """Derive a stable document id from a file name."""
+    return normalize_document_id(path.stem)
+
+
+class CorpusDocument:
+    """A registered PDF and, while resident, its loaded processor and retriever."""
+
+    def __init__(self, document_id: str, path: Path, pinned: bool = False, extractor: Optional[str] = None):
+        """Initialize a registered, not yet loaded document."""
+        self.document_id = document_id
+        self.path = path
+        self.pinned = pinned
+        # Text extraction backend for this document (None uses settings.pdf_extractor)
+        self.extractor = extractor
+        self.title: Optional[str] = None
+        self.total_pages: Optional[int] = None
+        self.registered_at = datetime.now().isoformat()
+        self.processor: Optional[PDFProcessor] = None
+        self.retriever: Optional[DocumentRetriever] = None
+        # Indexed terms, kept after eviction to route corpus-wide queries
+        self.vocabulary: Optional[frozenset] = None
+        # Extraction cache key of the last load, under which the vocabulary is saved across restarts
+        self.content_hash: Optional[str] = None
+        self.extractor_version: Optional[str] = None
+        self.memory_bytes = 0
+        self.loads = 0
+        # Held while the document is loaded or indexed, outside the corpus lock
+        self.load_lock = threading.RLock()
+
+    @property
+    def resident(self) -> bool:
+        return self.processor is not None
+
+    def to_dict(self) -> Dict:
+        """Serialize for listings."""
+        return {
+            "document_id": self.document_id,
+            "path": str(self.path),
+            "title": self.title,
+            "total_pages": self.total_pages,
+            "registered_at": self.registered_at,
+            "resident": self.resident,
+            "pinned": self.pinned,
+            "extractor": self.extractor or settings.pdf_extractor,
+            "memory_bytes": self.memory_bytes if self.resident else 0,
+            "loads": self.loads
+        }
+
+
+class CorpusManager:
+    """
+    Registry of many PDFs with memory-bounded residency.
+    Extracted text and indexes live in the on-disk extraction cache; only
+    recently used documents are held in memory, evicted least-recently-used
+    once their estimated size exceeds the memory limit.
+    """
+
+    def __init__(self, memory_limit_bytes: int, registry_path: str):
+        """Initialize an empty corpus and load the persisted registry."""
+        self.memory_limit_bytes = memory_limit_bytes
+        self.registry_path = Path(registry_path)
+        self._lock = threading.RLock()
+        self._documents: Dict[str, CorpusDocument] = {}
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        self._evictions = 0
+        self._load_registry()
+
+    def _load_registry(self):
+        """Re-register documents from a previous run whose files still exist."""
+        if not self.registry_path.exists():
+            return
+        try:
+            entries = json.loads(self.registry_path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable corpus registry {self.registry_path}: {e}")
+            return
+
+        for document_id, entry in entries.items():
+            path = Path(entry["path"])
+            if path.exists():
+                document = CorpusDocument(document_id, path, extractor=entry.get("extractor"))
+                document.title = entry.get("title")
+                document.total_pages = entry.get("total_pages")
+                document.registered_at = entry.get("registered_at", document.registered_at)
+                # The saved vocabulary only describes the file as it was when last loaded
+                if entry.get("source") == self._source_stamp(path):
+                    document.content_hash = entry.get("content_hash")
+                    document.extractor_version = entry.get("extractor_version")
+                self._documents[document_id] = document
+        logger.info(f"Loaded corpus registry: {len(self._documents)} documents")
+
+    @staticmethod
+    def _source_stamp(path: Path) -> Optional[List[int]]:
+        """Size and modification time of a file, to tell whether it changed since it was loaded."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _save_registry(self):
+        """Persist the registry atomically."""
+        entries = {
+            document.document_id: {
+                "path": str(document.path),
+                "title": document.title,
+                "total_pages": document.total_pages,
+                "registered_at": document.registered_at,
+                "extractor": document.extractor,
+                "content_hash": document.content_hash,
+                "extractor_version": document.extractor_version,
+                "source": self._source_stamp(document.path) if document.content_hash else None
+            }
+            for document in self._documents.values()
+            if not document.pinned
+        }
+        try:
+            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.registry_path.parent, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.registry_path)
+        except Exception as e:
+            logger.warning(f"Failed to save corpus registry: {e}")
+
+    def register(self, path: str, document_id: Optional[str] = None, load: bool = False,
+                 extractor: Optional[str] = None) -> CorpusDocument:
+        """
+        Register a PDF; with load=True it is extracted (and cached on disk) immediately.
+        extractor selects the document's text extraction backend.
+        """
+        path = Path(path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"PDF file not found: {path}")
+
+        document_id = document_id or make_document_id(path)
+        with self._lock:
+            existing = self._documents.get(document_id)
+            if existing and existing.path != path:
+                raise ValueError(f"Document id already registered for {existing.path}: {document_id}")
+            document = existing or CorpusDocument(document_id, path)
+            if extractor:
+                document.extractor = extractor
+            if document.total_pages is None and not load:
+                self._apply_probe(document)
+            self._documents[document_id] = document
+            self._save_registry()
+
+        if load:
+            self.get_document(document_id)
+        logger.info(f"Registered document {document_id}: {path}")
+        return document
+
+    @staticmethod
+    def _apply_probe(document: CorpusDocument):
+        """List a registered document's title and page count without loading it."""
+        try:
+            metadata = probe_pdf(document.path)
+        except Exception as e:
+            logger.warning(f"Could not probe {document.path}: {e}")
+            return
+        title = metadata["title"]
+        document.title = title if title != "Unknown" else document.path.stem
+        document.total_pages = metadata["total_pages"]
+
+    def register_loaded(self, document_id: str, processor: PDFProcessor) -> CorpusDocument:
+        """Register an already loaded processor (the primary document); it is never evicted."""
+        with self._lock:
+            document = CorpusDocument(document_id, processor.pdf_path.resolve(), pinned=True)
+            document.processor = processor
+            self._documents[document_id] = document
+            self._touch(document)
+        return document
+
+    def scan_directory(self, directory: str) -> List[str]:
+        """
+        Register every PDF in a directory without keeping them loaded.
+        Each new document's vocabulary is indexed as it is registered, so
+        corpus-wide queries can route to it without loading it.
+        """
+        registered = []
+        for path in sorted(Path(directory).glob("*.pdf")):
+            if any(document.path == path.resolve() for document in self._documents.values()):
+                continue
+            document = self.register(str(path))
+            self._index_vocabulary(document)
+            registered.append(document.document_id)
+        if registered:
+            logger.info(f"Registered {len(registered)} documents from {directory}")
+        return registered
+
+    def ingest(self, path: str, document_id: Optional[str] = None,
+               on_progress: Optional[Callable[[str, Dict], None]] = None,
+               extractor: Optional[str] = None) -> CorpusDocument:
+        """
+        Register, extract and index a PDF, making it queryable once indexed.
+        Loading and indexing run outside the corpus lock so queries against
+        other documents are not held up; on_progress receives the stage
+        ("extracting" or "indexing") and the extraction progress.
+        """
+        document = self.register(path, document_id, extractor=extractor)
+        processor = self._create_processor(document)
+        processor.start_background_load()
+        while not processor.wait_until_loaded(timeout=0.5):
+            if processor.load_state == "failed":
+                raise RuntimeError(f"Failed to load document {document.document_id}: {processor.load_error}")
+            if on_progress:
+                on_progress("extracting", processor.get_load_progress())
+
+        if on_progress:
+            on_progress("indexing", processor.get_load_progress())
+        retriever = self._create_retriever(processor)
+        vocabulary = self._save_vocabulary(processor)
+
+        with document.load_lock, self._lock:
+            self._attach(document, processor, vocabulary)
+            document.retriever = retriever
+            self._touch(document)
+            self._evict(keep=document.document_id)
+        logger.info(f"Ingested document {document.document_id}: {document.total_pages} pages")
+        return document
+
+    def has_document(self, document_id: str) -> bool:
+        return document_id in self._documents
+
+    def _touch(self, document: CorpusDocument):
+        """Mark a document most recently used and refresh its size estimate."""
+        self._resident[document.document_id] = None
+        self._resident.move_to_end(document.document_id)
+        document.memory_bytes = document.processor.estimate_memory_bytes()
+        if document.retriever:
+            document.memory_bytes += document.retriever.estimate_memory_bytes()
+
+    def _create_processor(self, document: CorpusDocument) -> PDFProcessor:
+        """Create a processor that reads and writes the shared extraction cache."""
+        return PDFProcessor(
+            str(document.path),
+            get_extraction_cache(),
+            workers=settings.pdf_extraction_workers or os.cpu_count() or 1,
+            parallel_min_pages=settings.pdf_parallel_min_pages,
+            extractor=document.extractor
+        )
+
+    def _create_retriever(self, processor: PDFProcessor) -> DocumentRetriever:
+        """Chunk and index a loaded processor's document."""
+        return DocumentRetriever(
+            processor,
+            settings.retrieval_chunk_tokens,
+            settings.retrieval_chunk_overlap_tokens,
+            settings.vector_dimensions if settings.vector_search_enabled else 0
+        )
+
+    @staticmethod
+    def _save_vocabulary(processor: PDFProcessor) -> frozenset:
+        """A loaded processor's vocabulary, saved next to its extraction cache entry."""
+        vocabulary = processor.get_vocabulary()
+        if processor.extraction_cache and processor.content_hash:
+            processor.extraction_cache.store_vocabulary(processor.content_hash, processor.extractor_version, vocabulary)
+        return vocabulary
+
+    def _attach(self, document: CorpusDocument, processor: PDFProcessor, vocabulary: frozenset):
+        """Make a loaded processor the document's resident copy (corpus lock held)."""
+        document.processor = processor
+        document.retriever = None
+        document.loads += 1
+        metadata = processor.get_metadata()
+        title = metadata.get("title")
+        document.title = title if title and title != "Unknown" else document.path.stem
+        document.total_pages = metadata.get("total_pages")
+        document.vocabulary = vocabulary
+        cache_key = (processor.content_hash, processor.extractor_version)
+        if document.loads == 1 or cache_key != (document.content_hash, document.extractor_version):
+            document.content_hash, document.extractor_version = cache_key
+            self._save_registry()
+
+    def _load(self, document: CorpusDocument) -> Tuple[PDFProcessor, frozenset]:
+        """Load a document's extraction (from the disk cache when possible) and its vocabulary."""
+        processor = self._create_processor(document)
+        if not processor.load_pdf():
+            raise RuntimeError(f"Failed to load document {document.document_id}")
+        return processor, self._save_vocabulary(processor)
+
+    def _known_vocabulary(self, document: CorpusDocument) -> Optional[frozenset]:
+        """A document's indexed terms, read from the extraction cache when it has not been loaded this run."""
+        if document.vocabulary is None and document.content_hash:
+            cache = get_extraction_cache()
+            if cache:
+                document.vocabulary = cache.load_vocabulary(document.content_hash, document.extractor_version)
+        return document.vocabulary
+
+    def _index_vocabulary(self, document: CorpusDocument):
+        """Extract a registered document to save its vocabulary, without making it resident."""
+        with document.load_lock:
+            if document.resident or self._known_vocabulary(document) is not None:
+                return
+            try:
+                processor, vocabulary = self._load(document)
+            except Exception as e:
+                logger.warning(f"Could not index vocabulary of {document.document_id}: {e}")
+                return
+            with self._lock:
+                document.vocabulary = vocabulary
+                document.content_hash, document.extractor_version = processor.content_hash, processor.extractor_version
+                self._save_registry()
+
+    def _evict(self, keep: str):
+        """Evict least-recently-used documents until resident memory fits the limit."""
+        total = sum(self._documents[document_id].memory_bytes for document_id in self._resident)
+        for document_id in list(self._resident):
+            if total <= self.memory_limit_bytes:
+                break
+            document = self._documents[document_id]
+            if document_id == keep or document.pinned:
+                continue
+            total -= document.memory_bytes
+            document.processor = None
+            document.retriever = None
+            document.memory_bytes = 0
+            del self._resident[document_id]
+            self._evictions += 1
+            logger.info(f"Evicted document {document_id} from memory")
+
+    def get_document(self, document_id: str) -> CorpusDocument:
+        """
+        Get a resident document, loading it and evicting others as needed.
+        Loading runs under the document's own lock rather than the corpus
+        lock, so queries against other documents are not held up; the loaded
+        processor is swapped in under the corpus lock, as ingest does.
+        """
+        with self._lock:
+            document = self._documents.get(document_id)
+            if document is None:
+                raise KeyError(document_id)
+
+        with document.load_lock:
+            with self._lock:
+                if document.resident:
+                    self._touch(document)
+                    self._evict(keep=document_id)
+                    return document
+
+            processor, vocabulary = self._load(document)
+            with self._lock:
+                self._attach(document, processor, vocabulary)
+                self._touch(document)
+                self._evict(keep=document_id)
+            return document
+
+    def _get_retriever(self, document: CorpusDocument) -> DocumentRetriever:
+        """Get a document's retriever, building it outside the corpus lock when missing or stale."""
+        with document.load_lock:
+            with self._lock:
+                processor, retriever = document.processor, document.retriever
+            if processor is None:
+                # Evicted since it was loaded for this query
+                self.get_document(document.document_id)
+                with self._lock:
+                    processor, retriever = document.processor, document.retriever
+
+            if retriever is None or retriever.source_version != processor.version:
+                retriever = self._create_retriever(processor)
+                with self._lock:
+                    if document.processor is processor:
+                        document.retriever = retriever
+                        self._touch(document)
+                        self._evict(keep=document.document_id)
+            return retriever
+
+    def retrieve(self, query: str, document_id: Optional[str] = None, top_k: Optional[int] = None,
+                 token_budget: Optional[int] = None) -> List[RetrievedChunk]:
+        """
+        Retrieve relevant chunks from one document, or from the whole corpus.
+        Corpus-wide queries skip documents whose vocabulary shares no query
+        term, or whose vocabulary is unknown because the document was never
+        indexed; vocabularies are saved in the extraction cache, so they
+        survive restarts. Scores from different documents are not on one
+        scale, so the per-document rankings are merged by reciprocal rank
+        fusion rather than by raw score.
+        """
+        top_k = top_k or settings.retrieval_top_k
+        token_budget = token_budget or settings.retrieval_token_budget
+
+        if document_id:
+            document_ids = [document_id]
+        else:
+            query_terms = set(tokenize(query))
+            document_ids = []
+            for document in list(self._documents.values()):
+                vocabulary = self._known_vocabulary(document)
+                if vocabulary is not None and query_terms & vocabulary:
+                    document_ids.append(document.document_id)
+
+        rankings = []
+        chunks_by_key = {}
+        for candidate_id in document_ids:
+            document = self.get_document(candidate_id)
+            chunks = self._get_retriever(document).retrieve(
+                query, top_k, token_budget, fallback=bool(document_id), sections=bool(document_id)
+            )
+            ranking = []
+            for position, chunk in enumerate(chunks):
+                chunk.document_id = document.document_id
+                chunk.document_title = document.title
+                chunks_by_key[(candidate_id, position)] = chunk
+                ranking.append((candidate_id, position))
+            rankings.append(ranking)
+
+        ranked = [chunks_by_key[key] for key, _ in reciprocal_rank_fusion(rankings)]
+        return select_within_budget(ranked, top_k, token_budget)
+
+    def list_documents(self) -> List[Dict]:
+        """List registered documents."""
+        with self._lock:
+            return [document.to_dict() for document in self._documents.values()]
+
+    def get_stats(self) -> Dict:
+        """Get corpus residency statistics."""
+        with self._lock:
+            resident_bytes = sum(self._documents[document_id].memory_bytes for document_id in self._resident)
+            return {
+                "documents": len(self._documents),
+                "resident_documents": len(self._resident),
+                "resident_bytes": resident_bytes,
+                "memory_limit_bytes": self.memory_limit_bytes,
+                "evictions": self._evictions
+            }
+
+
+# Global corpus manager instance
+_corpus_manager: Optional[CorpusManager] = None
+
+
+def get_corpus_manager() -> CorpusManager:
+    """Get the global corpus manager, registering the primary document on first use."""
+    global _corpus_manager
+
+    if _corpus_manager is None:
+        _corpus_manager = CorpusManager(
+            settings.corpus_memory_limit_mb * 1024 * 1024,
+            settings.corpus_registry_path
+        )
+        pdf_processor = get_pdf_processor()
+        if pdf_processor:
+            _corpus_manager.register_loaded(settings.default_document_id, pdf_processor)
+        logger.info("Corpus manager initialized")
+
+    return _corpus_manager
+
+
+def initialize_corpus_manager() -> CorpusManager:
+    """Initialize the corpus and register every PDF in the corpus directory."""
+    corpus = get_corpus_manager()
+    if settings.corpus_dir:
+        corpus.scan_directory(settings.corpus_dir)
+    return corpus
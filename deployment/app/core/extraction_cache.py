@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from core.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Bump when the cached payload layout changes
+CACHE_FORMAT_VERSION = 4
+
+
+def file_digest(path: Path, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted PDF pages, metadata and derived indexes.
+    Entries are keyed by the PDF content hash and extractor version, so a
+    restart reuses them and any change to the file or extractor misses.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache directory."""
+        self.cache_dir = Path(cache_dir)
+
+    def _entry_path(self, content_hash: str, extractor_version: str) -> Path:
+        """Path of the cache entry for a document and extractor."""
+        key = hashlib.sha256(f"{content_hash}:{extractor_version}:{CACHE_FORMAT_VERSION}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key[:32]}.pkl"
+
+    def page_store_path(self, content_hash: str, extractor_version: str) -> Path:
+        """Path of the memory-mapped page text store that accompanies a cache entry."""
+        return self._entry_path(content_hash, extractor_version).with_suffix(".text")
+
+    def _sources_path(self) -> Path:
+        """Path of the index mapping source files to their latest content hash."""
+        return self.cache_dir / "sources.json"
+
+    def _load_sources(self) -> Dict[str, str]:
+        try:
+            return json.loads(self._sources_path().read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def latest_hash(self, source_path: Path) -> Optional[str]:
+        """Content hash of the last extraction cached for a file path, if any."""
+        return self._load_sources().get(str(Path(source_path).resolve()))
+
+    def record_source(self, source_path: Path, content_hash: str):
+        """Remember the latest cached content hash of a file, so a revised file can reuse its pages."""
+        try:
+            sources = self._load_sources()
+            sources[str(Path(source_path).resolve())] = content_hash
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w") as f:
+                json.dump(sources, f, indent=2)
+            os.replace(tmp_path, self._sources_path())
+        except Exception as e:
+            logger.warning(f"Failed to record extraction source {source_path}: {e}")
+
+    def vector_index_path(self, content_hash: str, extractor_version: str, name: str) -> Path:
+        """Path of a saved vector matrix (.npy) derived from a cache entry."""
+        entry_path = self._entry_path(content_hash, extractor_version)
+        return entry_path.with_name(f"{entry_path.stem}.{name}.npy")
+
+    def vocabulary_path(self, content_hash: str, extractor_version: str) -> Path:
+        """Path of the indexed term list that accompanies a cache entry."""
+        return self._entry_path(content_hash, extractor_version).with_suffix(".vocab")
+
+    def load_vocabulary(self, content_hash: str, extractor_version: str) -> Optional[FrozenSet[str]]:
+        """A document's indexed terms, or None when they were never saved."""
+        try:
+            text = self.vocabulary_path(content_hash, extractor_version).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable vocabulary for {content_hash[:12]}: {e}")
+            return None
+        return frozenset(text.split("\n")) if text else frozenset()
+
+    def store_vocabulary(self, content_hash: str, extractor_version: str, terms: Iterable[str]):
+        """Save a document's indexed terms (one per line) atomically, unless already saved."""
+        path = self.vocabulary_path(content_hash, extractor_version)
+        if path.exists():
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".vocab")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write("\n".join(sorted(terms)))
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to store vocabulary for {content_hash[:12]}: {e}")
+
+    def load(self, content_hash: str, extractor_version: str) -> Optional[Dict[str, Any]]:
+        """Load a cached extraction, or None on a miss or unreadable entry."""
+        path = self._entry_path(content_hash, extractor_version)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+            if payload.get("content_hash") != content_hash or payload.get("extractor_version") != extractor_version:
+                return None
+            return payload
+
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+
+    def store(self, content_hash: str, extractor_version: str, payload: Dict[str, Any]):
+        """Write an extraction atomically so readers never see a partial file."""
+        path = self._entry_path(content_hash, extractor_version)
+        payload = {**payload, "content_hash": content_hash, "extractor_version": extractor_version}
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".pkl")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+            logger.info(f"Stored extraction cache entry {path.name}")
+
+        except Exception as e:
+            logger.warning(f"Failed to store extraction cache entry: {e}")
+
+
+# Global extraction cache instance
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the global extraction cache, or None when it is disabled."""
+    global _extraction_cache
+
+    if not settings.extraction_cache_enabled:
+        return None
+
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache(settings.extraction_cache_dir)
+
+    return _extraction_cache
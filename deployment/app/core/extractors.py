@@ -0,0 +1,285 @@
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pdfminer
+import pdfplumber
+from pdfminer.converter import PDFLayoutAnalyzer
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFStream, resolve1
+
+try:
+    import pypdf
+except ImportError:  # Optional backend
+    pypdf = None
+
+from core.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _pdfminer_page_hash(page: PDFPage) -> str:
+    """Hash a pdfminer page's content streams, fonts and size."""
+    digest = hashlib.sha256()
+    digest.update(repr(page.mediabox).encode("utf-8"))
+    fonts = resolve1(page.resources.get("Font")) if page.resources else None
+    if isinstance(fonts, dict):
+        for name in sorted(fonts):
+            font = resolve1(fonts[name])
+            base_font = font.get("BaseFont") if isinstance(font, dict) else None
+            digest.update(f"{name}:{base_font}".encode("utf-8"))
+    for stream in page.contents:
+        stream = resolve1(stream)
+        if isinstance(stream, PDFStream):
+            digest.update(stream.get_data())
+    return digest.hexdigest()
+
+
+class TextExtractor:
+    """
+    A PDF text extraction backend.
+    Subclasses open a document once and return the raw text of one page at a
+    time; extract() isolates failures to the page they occur on. Cleaning is
+    left to PDFProcessor so every backend's output is normalized the same way.
+    Page hashes come from the same open document, so unchanged pages of a
+    revised PDF are found without parsing it with a second library.
+    """
+
+    name = "base"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @property
+    def library_version(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def version(self) -> str:
+        """Identifies the backend and library release, for cache keys."""
+        return f"{self.name}-{self.library_version}"
+
+    def _open(self, pdf_path: str) -> Any:
+        """Open a document and return a handle for _page_text."""
+        raise NotImplementedError
+
+    def _page_text(self, handle: Any, page_index: int) -> Optional[str]:
+        """Raw text of a 0-based page."""
+        raise NotImplementedError
+
+    def _page_count(self, handle: Any) -> int:
+        """Number of pages in an open document."""
+        raise NotImplementedError
+
+    def _page_hash(self, handle: Any, page_index: int) -> str:
+        """
+        Hash a 0-based page's content streams, fonts and size without extracting its text.
+        Identical hashes mean the page would extract to the same text.
+        """
+        raise NotImplementedError
+
+    def _close(self, handle: Any):
+        """Release a document handle."""
+
+    def page_hashes(self, pdf_path: str) -> List[str]:
+        """Content hash of every page, in page order."""
+        handle = self._open(pdf_path)
+        try:
+            return [self._page_hash(handle, page_index) for page_index in range(self._page_count(handle))]
+        finally:
+            self._close(handle)
+
+    def extract(self, pdf_path: str, page_numbers: Optional[Iterable[int]] = None,
+                page_hashes: Optional[Dict[int, str]] = None) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Yield (page number, raw text or None) for the requested 1-based pages
+        (every page when None), in the order given. With page_hashes, each
+        page's content hash is recorded there as well.
+        """
+        handle = self._open(pdf_path)
+        try:
+            if page_numbers is None:
+                page_numbers = range(1, self._page_count(handle) + 1)
+            for page_num in page_numbers:
+                if page_hashes is not None:
+                    page_hashes[page_num] = self._page_hash(handle, page_num - 1)
+                try:
+                    yield page_num, self._page_text(handle, page_num - 1)
+                except Exception as e:
+                    logger.error(f"Error extracting text from page {page_num} with {self.name}: {e}")
+                    yield page_num, None
+        finally:
+            self._close(handle)
+
+
+class PdfplumberExtractor(TextExtractor):
+    """pdfplumber's layout-aware extraction: most faithful line and word order, slowest."""
+
+    name = "pdfplumber"
+
+    @property
+    def library_version(self) -> str:
+        return pdfplumber.__version__
+
+    def _open(self, pdf_path: str) -> Any:
+        return pdfplumber.open(pdf_path)
+
+    def _page_text(self, handle: Any, page_index: int) -> Optional[str]:
+        return handle.pages[page_index].extract_text()
+
+    def _page_count(self, handle: Any) -> int:
+        return len(handle.pages)
+
+    def _page_hash(self, handle: Any, page_index: int) -> str:
+        return _pdfminer_page_hash(handle.pages[page_index].page_obj)
+
+    def _close(self, handle: Any):
+        handle.close()
+
+
+class _CharCollector(PDFLayoutAnalyzer):
+    """Collects a page's characters in content-stream order, without layout analysis."""
+
+    def __init__(self, resource_manager: PDFResourceManager):
+        super().__init__(resource_manager, laparams=None)
+        self.text = ""
+
+    def receive_layout(self, ltpage):
+        parts: List[str] = []
+        previous: Optional[LTChar] = None
+        stack = [iter(ltpage)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, LTChar):
+                # A vertical jump of more than half a glyph starts a new line
+                if previous is not None and abs(item.y0 - previous.y0) > item.height * 0.5:
+                    parts.append("\n")
+                parts.append(item.get_text())
+                previous = item
+            elif isinstance(item, LTContainer):
+                stack.append(iter(item))
+        self.text = "".join(parts)
+
+
+class PdfminerExtractor(TextExtractor):
+    """pdfminer.six with layout analysis off: characters in stream order, split into lines by position."""
+
+    name = "pdfminer"
+
+    @property
+    def library_version(self) -> str:
+        return pdfminer.__version__
+
+    def _open(self, pdf_path: str) -> Any:
+        file = open(pdf_path, "rb")
+        try:
+            document = PDFDocument(PDFParser(file))
+            resource_manager = PDFResourceManager(caching=True)
+            collector = _CharCollector(resource_manager)
+            return {
+                "file": file,
+                "pages": list(PDFPage.create_pages(document)),
+                "collector": collector,
+                "interpreter": PDFPageInterpreter(resource_manager, collector)
+            }
+        except Exception:
+            file.close()
+            raise
+
+    def _page_text(self, handle: Any, page_index: int) -> Optional[str]:
+        handle["interpreter"].process_page(handle["pages"][page_index])
+        return handle["collector"].text
+
+    def _page_count(self, handle: Any) -> int:
+        return len(handle["pages"])
+
+    def _page_hash(self, handle: Any, page_index: int) -> str:
+        return _pdfminer_page_hash(handle["pages"][page_index])
+
+    def _close(self, handle: Any):
+        handle["file"].close()
+
+
+class PypdfExtractor(TextExtractor):
+    """pypdf's content-stream extraction: fastest, with looser spacing on complex layouts."""
+
+    name = "pypdf"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return pypdf is not None
+
+    @property
+    def library_version(self) -> str:
+        return pypdf.__version__
+
+    def _open(self, pdf_path: str) -> Any:
+        return pypdf.PdfReader(pdf_path)
+
+    def _page_text(self, handle: Any, page_index: int) -> Optional[str]:
+        return handle.pages[page_index].extract_text()
+
+    def _page_count(self, handle: Any) -> int:
+        return len(handle.pages)
+
+    def _page_hash(self, handle: Any, page_index: int) -> str:
+        page = handle.pages[page_index]
+        digest = hashlib.sha256()
+        digest.update(repr([float(value) for value in page.mediabox]).encode("utf-8"))
+        resources = page.get("/Resources")
+        fonts = resources.get_object().get("/Font") if resources is not None else None
+        if fonts is not None:
+            fonts = fonts.get_object()
+            for name in sorted(fonts):
+                base_font = fonts[name].get_object().get("/BaseFont")
+                digest.update(f"{name}:{base_font}".encode("utf-8"))
+        contents = page.get_contents()
+        if contents is not None:
+            digest.update(contents.get_data())
+        return digest.hexdigest()
+
+
+EXTRACTORS: Dict[str, type] = {
+    extractor.name: extractor for extractor in (PdfplumberExtractor, PdfminerExtractor, PypdfExtractor)
+}
+
+# Pseudo-backend that picks one by page count
+AUTO_EXTRACTOR = "auto"
+
+
+def available_extractors() -> List[str]:
+    """Names of the backends whose libraries are installed."""
+    return [name for name, extractor in EXTRACTORS.items() if extractor.is_available()]
+
+
+def get_extractor(name: str) -> TextExtractor:
+    """Get a backend by name."""
+    extractor = EXTRACTORS.get(name)
+    if extractor is None:
+        raise ValueError(f"Unknown PDF extractor: {name} (available: {', '.join(available_extractors())})")
+    if not extractor.is_available():
+        raise ValueError(f"PDF extractor {name} is not installed")
+    return extractor()
+
+
+def resolve_extractor(name: Optional[str], page_count: int) -> TextExtractor:
+    """
+    Get the backend for a document.
+    "auto" uses the configured fast backend for documents of at least
+    pdf_extractor_auto_pages pages and pdfplumber for smaller ones.
+    """
+    name = name or settings.pdf_extractor
+    if name == AUTO_EXTRACTOR:
+        name = settings.pdf_extractor_large if page_count >= settings.pdf_extractor_auto_pages else "pdfplumber"
+        if not EXTRACTORS.get(name, TextExtractor).is_available():
+            name = "pdfminer"
+    return get_extractor(name)
@@ -0,0 +1,113 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from core.text_utils import tokenize
+
+
+# Universal hashing modulus; (a * x + b) stays below 2**64 for 32-bit a, b and x
+_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles.
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the texts' shingle sets. Shingles are hashed with CRC32 and
+    permutations come from a fixed seed, so signatures from different
+    documents and processes are comparable.
+    """
+
+    def __init__(self, permutations: int = 64, shingle_words: int = 3, seed: int = 1):
+        """Initialize the hash permutations."""
+        self.permutations = permutations
+        self.shingle_words = shingle_words
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=permutations, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """CRC32 hashes of the text's word k-grams (stopwords kept, so boilerplate matches exactly)."""
+        words = tokenize(text, keep_stopwords=True)
+        size = min(self.shingle_words, len(words))
+        keys = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)} if size else set()
+        return np.fromiter((zlib.crc32(key.encode("utf-8")) for key in keys), dtype=np.uint64, count=len(keys))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text; texts without words get an all-max signature."""
+        shingles = self._shingles(text)
+        if not len(shingles):
+            return np.full(self.permutations, 0xFFFFFFFF, dtype=np.uint32)
+        hashes = (np.outer(shingles, self._a) + self._b) % np.uint64(_PRIME) & _MAX_HASH
+        return hashes.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class MinHashLSH:
+    """
+    Locality-sensitive lookup of similar signatures.
+    Signatures are cut into bands; items sharing any whole band are
+    candidates, which are then checked against the similarity threshold.
+    """
+
+    def __init__(self, permutations: int = 64, bands: int = 16):
+        """Initialize empty band tables."""
+        self.bands = bands
+        self.rows = max(1, permutations // bands)
+        self._tables: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        """Add an item's signature."""
+        self._signatures[key] = signature
+        for table, band_key in zip(self._tables, self._band_keys(signature)):
+            table[band_key].append(key)
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Hashable]:
+        """Keys of inserted items at least threshold similar to a signature."""
+        candidates: Set[Hashable] = set()
+        for table, band_key in zip(self._tables, self._band_keys(signature)):
+            candidates.update(table.get(band_key, ()))
+        return [
+            key for key in candidates
+            if MinHasher.similarity(self._signatures[key], signature) >= threshold
+        ]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def dedupe_chunks(chunks: Sequence, hasher: MinHasher, threshold: float,
+                  bands: int = 16) -> Tuple[List, int]:
+    """
+    Drop retrieved chunks that nearly duplicate a higher-scored one.
+    Chunks need text, score and tokens, and may carry a precomputed
+    signature. Returns the kept chunks in their original order and the
+    estimated tokens removed.
+    """
+    lsh = MinHashLSH(hasher.permutations, bands)
+    dropped: Set[int] = set()
+    tokens_saved = 0
+    by_score = sorted(range(len(chunks)), key=lambda index: -chunks[index].score)
+    for index in by_score:
+        chunk = chunks[index]
+        signature: Optional[np.ndarray] = getattr(chunk, "signature", None)
+        if signature is None:
+            signature = hasher.signature(chunk.text)
+        if lsh.query(signature, threshold):
+            dropped.add(index)
+            tokens_saved += chunk.tokens
+        else:
+            lsh.insert(index, signature)
+
+    return [chunk for index, chunk in enumerate(chunks) if index not in dropped], tokens_saved
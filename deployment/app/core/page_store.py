@@ -0,0 +1,126 @@
+import logging
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Separator between pages in the text file, matching PDFProcessor's full text
+PAGE_SEPARATOR = "\n\n"
+
+
+class PageTextStore:
+    """
+    Compact, memory-mapped store of a document's page text.
+    The UTF-8 text of every page is written once to a single file (pages
+    joined by a blank line, so the file is also the full text) alongside an
+    array of per-page byte and character offsets. Pages are read as slices of
+    the mapping; resident memory is whatever the OS keeps in its page cache.
+    """
+
+    def __init__(self, text_path: Path):
+        """Open an existing store."""
+        self.text_path = Path(text_path)
+        self.offsets_path = self.text_path.with_suffix(".offsets")
+
+        offsets = array("Q")
+        with open(self.offsets_path, "rb") as f:
+            offsets.frombytes(f.read())
+        page_count = len(offsets) // 2 - 1
+        # Byte and character start of each page, plus the end of the text
+        self._byte_offsets = offsets[:page_count + 1]
+        self._char_offsets = offsets[page_count + 1:]
+
+        self._file = open(self.text_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mmap) if self._mmap else memoryview(b"")
+
+    @classmethod
+    def exists(cls, text_path: Path) -> bool:
+        """Whether a complete store exists (offsets are written last)."""
+        text_path = Path(text_path)
+        return text_path.exists() and text_path.with_suffix(".offsets").exists()
+
+    @classmethod
+    def write(cls, text_path: Path, texts: List[str]) -> "PageTextStore":
+        """Write page texts to a new store atomically and open it."""
+        text_path = Path(text_path)
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        separator = PAGE_SEPARATOR.encode("utf-8")
+
+        byte_offsets = array("Q")
+        char_offsets = array("Q")
+        byte_position = char_position = 0
+
+        tmp_text = text_path.with_name(f".tmp-{os.getpid()}-{text_path.name}")
+        with open(tmp_text, "wb") as f:
+            for index, text in enumerate(texts):
+                if index:
+                    f.write(separator)
+                    byte_position += len(separator)
+                    char_position += len(PAGE_SEPARATOR)
+                encoded = text.encode("utf-8")
+                byte_offsets.append(byte_position)
+                char_offsets.append(char_position)
+                f.write(encoded)
+                byte_position += len(encoded)
+                char_position += len(text)
+            f.flush()
+            os.fsync(f.fileno())
+        byte_offsets.append(byte_position)
+        char_offsets.append(char_position)
+
+        offsets_path = text_path.with_suffix(".offsets")
+        tmp_offsets = offsets_path.with_name(f".tmp-{os.getpid()}-{offsets_path.name}")
+        with open(tmp_offsets, "wb") as f:
+            f.write(byte_offsets.tobytes())
+            f.write(char_offsets.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Offsets are moved into place last; their presence marks a complete store
+        os.replace(tmp_text, text_path)
+        os.replace(tmp_offsets, offsets_path)
+        return cls(text_path)
+
+    def __len__(self) -> int:
+        return len(self._byte_offsets) - 1
+
+    @property
+    def char_offsets(self) -> array:
+        """Character start offset of each page within the full text."""
+        return self._char_offsets[:-1]
+
+    @property
+    def text_length(self) -> int:
+        """Length of the full text in characters."""
+        return self._char_offsets[-1] if self._char_offsets else 0
+
+    def page_bytes(self, index: int) -> memoryview:
+        """Zero-copy view of a page's UTF-8 bytes."""
+        return self._view[self._byte_offsets[index]:self._byte_offsets[index + 1] - (
+            len(PAGE_SEPARATOR) if index + 1 < len(self) else 0
+        )]
+
+    def page_text(self, index: int) -> str:
+        """Decode one page's text."""
+        return str(self.page_bytes(index), "utf-8")
+
+    def full_bytes(self) -> memoryview:
+        """Zero-copy view of the full text's UTF-8 bytes."""
+        return self._view
+
+    def full_text(self) -> str:
+        """Decode the full text."""
+        return str(self._view, "utf-8")
+
+    def close(self):
+        """Release the mapping and file handle."""
+        self._view.release()
+        if self._mmap:
+            self._mmap.close()
+        self._file.close()
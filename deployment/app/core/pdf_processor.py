@@ -1,71 +1,557 @@
 import os
+import bisect
 import logging
-from typing import Optional, List, Dict
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, List, Dict, Tuple
 import pdfplumber
 from pathlib import Path
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFObjRef, resolve1
+from pdfminer.psparser import PSLiteral
+from pdfminer.utils import decode_text
+
+from core.chunker import Chunk, chunk_pages
+from core.config import get_settings
+from core.extraction_cache import ExtractionCache, file_digest, get_extraction_cache
+from core.extractors import AUTO_EXTRACTOR, TextExtractor, get_extractor, resolve_extractor
+from core.page_store import PageTextStore
+from core.query_cache import document_key, get_query_cache
+from core.search_index import InvertedIndex
+from core.section_index import Heading, SectionIndex, build_sections, clean_title, headings_from_pages
+from core.text_utils import CHARS_PER_TOKEN
 
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Identifies the page cleaning logic; bump to invalidate cached extractions of every backend
+CLEANING_VERSION = 1
+
+# Above this share of changed pages a revised PDF is simply extracted again
+INCREMENTAL_MAX_CHANGED_FRACTION = 0.5
+
+
+# Info dictionary values that generators write when nothing was set
+_PLACEHOLDER_INFO = {"", "untitled", "unknown", "anonymous", "unspecified", "none"}
+
+
+def _info_text(value) -> Optional[str]:
+    """Decode an Info dictionary string (PDFDocEncoding or UTF-16), or None for placeholders."""
+    value = resolve1(value)
+    if isinstance(value, bytes):
+        value = decode_text(value)
+    elif isinstance(value, PSLiteral):
+        value = value.name
+    if not isinstance(value, str):
+        return None
+    value = value.strip().strip("\x00")
+    # ReportLab writes "(anonymous)" and "(unspecified)" when no title or author is set
+    return value if value.lower().strip("()").strip() not in _PLACEHOLDER_INFO else None
+
+
+def read_document_metadata(document: PDFDocument) -> Dict:
+    """
+    Page count, title, author and creator of a parsed PDF document.
+    The page count is the page tree's /Count; the title comes from the
+    trailer's Info dictionary, or the first top-level outline entry when the
+    Info title is missing or a placeholder such as "untitled".
+    """
+    info = {}
+    for entry in document.info:
+        info.update(entry)
+    
+    pages = resolve1(document.catalog.get("Pages"))
+    total_pages = resolve1(pages.get("Count", 0)) if isinstance(pages, dict) else 0
+    
+    title = _info_text(info.get("Title"))
+    if title is None:
+        try:
+            title = next((entry[1].strip() for entry in document.get_outlines()
+                          if entry[0] == 1 and entry[1] and entry[1].strip()), None)
+        except Exception:
+            title = None  # No outline, or one pdfminer cannot parse
+    
+    return {
+        "total_pages": int(total_pages) if isinstance(total_pages, (int, float)) else 0,
+        "title": title or "Unknown",
+        "author": _info_text(info.get("Author")) or "Unknown",
+        "creator": _info_text(info.get("Creator")) or "Unknown"
+    }
+
+
+def probe_pdf(pdf_path) -> Dict:
+    """
+    Read a PDF's metadata without extracting any text.
+    Only the cross-reference table, trailer, page tree root and outline are
+    parsed, so this takes about as long for a 10,000-page document as for a
+    10-page one.
+    """
+    with open(pdf_path, "rb") as f:
+        return read_document_metadata(PDFDocument(PDFParser(f)))
+
+
+def _extract_page_range(extractor_name: str, pdf_path: str, start: int, end: int) -> Tuple[List[Dict], List[str]]:
+    """
+    Extract pages [start, end) and their content hashes in a worker process.
+    Each worker opens the PDF itself; failed pages are logged and skipped.
+    """
+    pages_text = []
+    page_hashes: Dict[int, str] = {}
+    for page_num, raw_text in get_extractor(extractor_name).extract(pdf_path, range(start + 1, end + 1), page_hashes):
+        page_text = PDFProcessor._build_page(raw_text, page_num)
+        if page_text:
+            pages_text.append(page_text)
+    return pages_text, [page_hashes[page_num] for page_num in range(start + 1, end + 1)]
+
+
+@dataclass
+class _PreviousExtraction:
+    """An earlier extraction of the same file whose unchanged pages can be reused."""
+    page_hashes: List[str]
+    page_numbers: List[int]  # Pages that had text
+    get_text: Callable[[int], str]
+    search_index: InvertedIndex
+    page_store: Optional[PageTextStore] = None
 
 
 class PDFProcessor:
     """Professional PDF text extraction and processing."""
     
-    def __init__(self, pdf_path: str):
-        """Initialize with PDF file path."""
+    def __init__(self, pdf_path: str, extraction_cache: Optional[ExtractionCache] = None,
+                 workers: int = 1, parallel_min_pages: int = 0, extractor: Optional[str] = None):
+        """
+        Initialize with PDF file path, an optional extraction cache and parallelism.
+        With workers > 1, documents of at least parallel_min_pages pages are
+        extracted across a process pool. extractor names the text extraction
+        backend, or "auto" to choose by page count (default: settings.pdf_extractor).
+        """
         self.pdf_path = Path(pdf_path)
+        self.extraction_cache = extraction_cache
+        self.extractor_name = extractor or settings.pdf_extractor
+        self.extractor: Optional[TextExtractor] = None
+        # Backend, library and cleaning versions; part of every extraction cache key
+        self.extractor_version: Optional[str] = None
+        self.workers = max(1, workers)
+        self.parallel_min_pages = parallel_min_pages
+        self.content_hash = None
+        # Incremented whenever pages are added, so derived indexes know when they are stale
+        self.version = 0
+        # Incremented whenever the pages are replaced rather than appended to; earlier text offsets no longer apply
+        self.page_set_version = 0
+        self.load_state = "pending"  # pending, loading, ready or failed
+        self.load_error = None
+        self._lock = threading.RLock()
+        self._load_thread: Optional[threading.Thread] = None
+        self._pages_processed = 0
         self._full_text = None
+        self._full_text_version = -1
         self._pages = []
+        self._page_offsets = []  # Start offset of each page within the full text
+        self._text_length = 0
+        self._total_words = 0  # Kept up to date as pages are added, so summary stats are O(1)
+        self._search_index = InvertedIndex()
         self._metadata = {}
+        # Once extraction completes, page text lives in a memory-mapped store instead of _pages
+        self._page_store: Optional[PageTextStore] = None
+        self._page_index: Dict[int, int] = {}
+        # Content hash of every page (including blank ones), in page order
+        self._page_hashes: List[str] = []
+        self._pages_reused = 0
+        # Chunkings by (max_tokens, overlap_tokens), each with the version it was built from
+        self._chunk_cache: Dict[Tuple[int, int], Tuple[int, List[Chunk]]] = {}
+        # PDF outline entries as (level, title, page number); empty when the PDF has none
+        self._outline: List[Tuple[int, str, int]] = []
+        self._section_cache: Optional[Tuple[int, SectionIndex]] = None
         
     def load_pdf(self) -> bool:
-        """Load and extract text from PDF file."""
+        """Load the PDF from the extraction cache, extracting and caching it on a miss."""
+        self.load_state = "loading"
         try:
             if not self.pdf_path.exists():
                 logger.error(f"PDF file not found: {self.pdf_path}")
+                self._fail("PDF file not found")
                 return False
                 
             logger.info(f"Loading PDF: {self.pdf_path}")
+            self._probe()
+            self._resolve_extractor()
             
-            with pdfplumber.open(self.pdf_path) as pdf:
-                # Extract metadata
-                self._metadata = {
-                    "total_pages": len(pdf.pages),
-                    "title": getattr(pdf.metadata, 'title', 'Unknown'),
-                    "author": getattr(pdf.metadata, 'author', 'Unknown'),
-                    "creator": getattr(pdf.metadata, 'creator', 'Unknown')
-                }
-                
-                # Extract text from all pages
-                pages_text = []
-                for page_num, page in enumerate(pdf.pages, 1):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text and page_text.strip():
-                            cleaned_text = self._clean_text(page_text)
-                            pages_text.append({
-                                "page_number": page_num,
-                                "text": cleaned_text,
-                                "word_count": len(cleaned_text.split())
-                            })
-                            logger.debug(f"Extracted {len(cleaned_text)} chars from page {page_num}")
-                        else:
-                            logger.warning(f"No text found on page {page_num}")
-                    except Exception as e:
-                        logger.error(f"Error extracting text from page {page_num}: {e}")
-                        continue
-                
-                self._pages = pages_text
-                self._full_text = "\n\n".join([page["text"] for page in pages_text])
-                
-                logger.info(f"Successfully loaded PDF: {len(pages_text)} pages, {len(self._full_text)} total characters")
-                return True
+            if self.extraction_cache:
+                self.content_hash = file_digest(self.pdf_path)
+                store_path = self.extraction_cache.page_store_path(self.content_hash, self.extractor_version)
+                cached = self.extraction_cache.load(self.content_hash, self.extractor_version)
+                if cached and PageTextStore.exists(store_path):
+                    with self._lock:
+                        self._metadata = {**cached["metadata"], **self._metadata}
+                        self._pages = cached["pages"]
+                        self._total_words = sum(page["word_count"] for page in self._pages)
+                        self._page_hashes = cached["page_hashes"]
+                        self._outline = cached["outline"]
+                        self._search_index = cached["search_index"]
+                        self._pages_processed = self._metadata.get("total_pages", len(self._pages))
+                        self._attach_page_store(PageTextStore(store_path))
+                        self.version += 1
+                        self.page_set_version += 1
+                    self.load_state = "ready"
+                    logger.info(f"Loaded PDF from extraction cache: {len(self._pages)} pages, {self._text_length} total characters")
+                    return True
+            
+            previous = self._previous_extraction()
+            try:
+                reloaded = previous is not None and self._extract_incremental(previous)
+            finally:
+                if previous and previous.page_store:
+                    previous.page_store.close()
+            
+            if not reloaded:
+                self._reset_pages()
+                self._extract(self._add_pages)
+            
+            if self.extraction_cache:
+                with self._lock:
+                    store = PageTextStore.write(store_path, [page["text"] for page in self._pages])
+                    self._attach_page_store(store)
+                self.extraction_cache.store(self.content_hash, self.extractor_version, {
+                    "metadata": self._metadata,
+                    "pages": self._pages,
+                    "page_hashes": self._page_hashes,
+                    "outline": self._outline,
+                    "search_index": self._search_index
+                })
+                self.extraction_cache.record_source(self.pdf_path, self.content_hash)
+            self.load_state = "ready"
+            
+            logger.info(f"Successfully loaded PDF: {len(self._pages)} pages, {self._text_length} total characters")
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to load PDF {self.pdf_path}: {e}")
+            self._fail(str(e))
+            return False
+    
+    def _probe(self):
+        """Read page count, title and author up front, so status reports them while text is extracted."""
+        try:
+            metadata = probe_pdf(self.pdf_path)
+        except Exception as e:
+            logger.warning(f"Could not probe PDF metadata of {self.pdf_path}: {e}")
+            return
+        with self._lock:
+            self._metadata = {**self._metadata, **metadata}
+    
+    def _resolve_extractor(self):
+        """Pick the extraction backend; "auto" needs the page count, which the probe has read."""
+        page_count = self._metadata.get("total_pages", 0)
+        if self.extractor_name == AUTO_EXTRACTOR and not page_count:
+            with pdfplumber.open(self.pdf_path) as pdf:
+                page_count = len(pdf.pages)
+        self.extractor = resolve_extractor(self.extractor_name, page_count)
+        self.extractor_version = f"{self.extractor.version}-{CLEANING_VERSION}"
+        logger.info(f"Using {self.extractor.name} text extraction for {self.pdf_path.name}")
+    
+    def _attach_page_store(self, store: PageTextStore):
+        """
+        Serve page text from a memory-mapped store and drop the in-memory copies;
+        the store it replaces is closed (caller holds the lock).
+        """
+        replaced_store, self._page_store = self._page_store, store
+        self._pages = [
+            {"page_number": page["page_number"], "word_count": page["word_count"]}
+            for page in self._pages
+        ]
+        self._page_index = {page["page_number"]: index for index, page in enumerate(self._pages)}
+        self._page_offsets = store.char_offsets
+        self._text_length = store.text_length
+        self._full_text = None
+        self._full_text_version = -1
+        self._search_index.use_text_source(self.get_page_text)
+        if replaced_store is not None and replaced_store is not store:
+            self._close_page_store(replaced_store)
+    
+    def _reset_pages(self):
+        """Forget extracted pages before extracting the document from scratch."""
+        with self._lock:
+            if not self._pages and not self._page_hashes:
+                return
+            self._pages = []
+            self._page_offsets = []
+            self._text_length = 0
+            self._total_words = 0
+            self._page_hashes = []
+            replaced_store, self._page_store = self._page_store, None
+            self._page_index = {}
+            self._search_index = InvertedIndex()
+            self._pages_processed = 0
+            self._pages_reused = 0
+            self.version += 1
+            self.page_set_version += 1
+        if replaced_store is not None:
+            self._close_page_store(replaced_store)
+    
+    @staticmethod
+    def _close_page_store(store: PageTextStore):
+        """Close a page store that was swapped out; one whose text view is still held elsewhere is left to the GC."""
+        try:
+            store.close()
+        except BufferError:
+            logger.debug(f"Page store {store.text_path.name} still in use; leaving it open")
+    
+    def _previous_extraction(self) -> Optional[_PreviousExtraction]:
+        """
+        The last extraction of this file: this processor's own when it has
+        already loaded one, otherwise the latest cached extraction of the path.
+        """
+        with self._lock:
+            if self._pages and self._page_hashes:
+                return _PreviousExtraction(
+                    page_hashes=list(self._page_hashes),
+                    page_numbers=[page["page_number"] for page in self._pages],
+                    get_text=self.get_page_text,
+                    search_index=self._search_index
+                )
+        
+        if not self.extraction_cache:
+            return None
+        previous_hash = self.extraction_cache.latest_hash(self.pdf_path)
+        if not previous_hash or previous_hash == self.content_hash:
+            return None
+        payload = self.extraction_cache.load(previous_hash, self.extractor_version)
+        store_path = self.extraction_cache.page_store_path(previous_hash, self.extractor_version)
+        if not payload or not PageTextStore.exists(store_path):
+            return None
+        
+        store = PageTextStore(store_path)
+        page_numbers = [page["page_number"] for page in payload["pages"]]
+        store_index = {page_number: index for index, page_number in enumerate(page_numbers)}
+        return _PreviousExtraction(
+            page_hashes=payload["page_hashes"],
+            page_numbers=page_numbers,
+            get_text=lambda page_number: store.page_text(store_index[page_number]),
+            search_index=payload["search_index"],
+            page_store=store
+        )
+    
+    def _extract_incremental(self, previous: _PreviousExtraction) -> bool:
+        """
+        Re-extract only the pages whose content hash changed since a previous
+        extraction, reusing the text of the rest, and update the page index
+        postings of just the pages that changed or moved. Returns False, leaving
+        state untouched, when too much changed for this to pay off.
+        """
+        metadata, outline = self._read_structure()
+        page_hashes = self.extractor.page_hashes(str(self.pdf_path))
+        metadata["total_pages"] = len(page_hashes)
+        
+        previous_pages = {page_hash: page_num for page_num, page_hash in enumerate(previous.page_hashes, 1)}
+        changed = [page_num for page_num, page_hash in enumerate(page_hashes, 1) if page_hash not in previous_pages]
+        if len(changed) > len(page_hashes) * INCREMENTAL_MAX_CHANGED_FRACTION:
+            logger.info(f"{len(changed)} of {len(page_hashes)} pages changed; extracting the whole document")
             return False
+        
+        extracted = {
+            page_num: self._build_page(raw_text, page_num)
+            for page_num, raw_text in self.extractor.extract(str(self.pdf_path), changed)
+        }
+        previous_with_text = set(previous.page_numbers)
+        pages = []
+        reused = 0
+        unchanged = set()  # Pages whose text and page number are both the same as before
+        for page_num, page_hash in enumerate(page_hashes, 1):
+            source = previous_pages.get(page_hash)
+            if source is None:
+                page = extracted.get(page_num)
+            elif source in previous_with_text:
+                text = previous.get_text(source)
+                page = {"page_number": page_num, "text": text, "word_count": len(text.split())}
+                reused += 1
+                if source == page_num:
+                    unchanged.add(page_num)
+            else:
+                page = None  # Blank before and still blank
+            if page:
+                pages.append(page)
+        
+        # The live index keeps serving searches until the updated copy is swapped in with the pages
+        search_index = previous.search_index
+        if search_index is self._search_index:
+            search_index = search_index.copy()
+        for page_num in previous_with_text - unchanged:
+            search_index.remove_document(page_num)
+        for page in pages:
+            if page["page_number"] not in unchanged:
+                search_index.add_document(page["page_number"], page["text"])
+        
+        with self._lock:
+            self._metadata = metadata
+            self._page_hashes = page_hashes
+            self._outline = outline
+            self._pages = pages
+            replaced_store, self._page_store = self._page_store, None
+            self._page_index = {}
+            self._page_offsets = []
+            self._text_length = 0
+            self._total_words = 0
+            for page in pages:
+                self._page_offsets.append(self._text_length + 2 if self._page_offsets else 0)
+                self._text_length = self._page_offsets[-1] + len(page["text"])
+                self._total_words += page["word_count"]
+            self._search_index = search_index
+            search_index.use_text_source(self.get_page_text)
+            self._pages_processed = len(page_hashes)
+            self._pages_reused = reused
+            self.version += 1
+            self.page_set_version += 1
+        if replaced_store is not None:
+            self._close_page_store(replaced_store)
+        
+        logger.info(f"Incremental reload: {len(changed)} pages re-extracted, {reused} reused, "
+                    f"{len(pages) - len(unchanged)} re-indexed")
+        return True
     
-    def _clean_text(self, text: str) -> str:
+    def _fail(self, error: str):
+        """Mark loading as failed."""
+        self.load_state = "failed"
+        self.load_error = error
+    
+    def start_background_load(self):
+        """
+        Load the PDF in a background thread.
+        Pages become searchable as they are extracted; see get_load_progress.
+        """
+        if self._load_thread and self._load_thread.is_alive():
+            return
+        self.load_state = "loading"
+        self._probe()
+        self._load_thread = threading.Thread(target=self.load_pdf, name="pdf-loader", daemon=True)
+        self._load_thread.start()
+    
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until background loading finishes; returns whether the PDF is fully loaded."""
+        if self._load_thread:
+            self._load_thread.join(timeout)
+        return self.load_state == "ready"
+    
+    def _extract(self, on_pages: Callable[[List[Dict], int], None]):
+        """
+        Extract metadata and the outline, then page text and page hashes with
+        the chosen backend, which reads each page once for both.
+        on_pages receives each batch of extracted pages, in page order, with
+        the number of pages processed so far.
+        """
+        self._metadata, self._outline = self._read_structure()
+        total_pages = self._metadata["total_pages"]
+        
+        if self.workers > 1 and total_pages >= max(2, self.parallel_min_pages):
+            self._page_hashes = self._extract_parallel(total_pages, on_pages)
+            return
+        
+        # Extract text from all pages
+        page_hashes: Dict[int, str] = {}
+        for page_num, raw_text in self.extractor.extract(str(self.pdf_path), page_hashes=page_hashes):
+            page_text = self._build_page(raw_text, page_num)
+            on_pages([page_text] if page_text else [], page_num)
+        self._page_hashes = [page_hashes[page_num] for page_num in sorted(page_hashes)]
+        self._metadata["total_pages"] = len(self._page_hashes)
+    
+    def _read_structure(self) -> Tuple[Dict, List[Tuple[int, str, int]]]:
+        """The PDF's metadata and outline, read from its page tree without touching page content."""
+        with open(self.pdf_path, "rb") as f:
+            document = PDFDocument(PDFParser(f))
+            metadata = {**read_document_metadata(document), "extractor": self.extractor.name}
+            outline = self._read_outline(document)
+        return metadata, outline
+    
+    @staticmethod
+    def _read_outline(document: PDFDocument) -> List[Tuple[int, str, int]]:
+        """The PDF's outline (bookmarks) as (level, title, page number), skipping entries without a page."""
+        page_numbers = {page.pageid: page_number for page_number, page in enumerate(PDFPage.create_pages(document), 1)}
+        outline = []
+        try:
+            entries = list(document.get_outlines())
+        except Exception:
+            return outline  # No outline, or one pdfminer cannot parse
+        
+        for level, title, dest, action, _ in entries:
+            try:
+                if dest is None and action is not None:
+                    action = resolve1(action)
+                    dest = action.get("D") if isinstance(action, dict) else None
+                dest = resolve1(dest)
+                if isinstance(dest, (bytes, str, PSLiteral)):
+                    dest = resolve1(document.get_dest(dest.name if isinstance(dest, PSLiteral) else dest))
+                if isinstance(dest, dict):
+                    dest = resolve1(dest.get("D"))
+                target = dest[0] if isinstance(dest, list) and dest else None
+                page_number = page_numbers.get(target.objid) if isinstance(target, PDFObjRef) else None
+            except Exception:
+                page_number = None
+            if page_number and title and title.strip():
+                outline.append((level, title.strip(), page_number))
+        return outline
+    
+    def _page_ranges(self, total_pages: int) -> List[Tuple[int, int]]:
+        """Split pages into ranges, several per worker so slow pages balance out."""
+        range_size = max(1, -(-total_pages // (self.workers * 4)))
+        return [(start, min(start + range_size, total_pages)) for start in range(0, total_pages, range_size)]
+    
+    def _extract_parallel(self, total_pages: int, on_pages: Callable[[List[Dict], int], None]) -> List[str]:
+        """
+        Extract page ranges across a process pool and merge them in page order.
+        Returns the page hashes; pages of a failed range get an empty hash, which never matches.
+        """
+        page_hashes: List[str] = []
+        ranges = self._page_ranges(total_pages)
+        logger.info(f"Extracting {total_pages} pages in {len(ranges)} ranges across {self.workers} processes")
+        
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(_extract_page_range, self.extractor.name, str(self.pdf_path), start, end)
+                for start, end in ranges
+            ]
+            # Futures are consumed in submission order, which is page order
+            for (start, end), future in zip(ranges, futures):
+                try:
+                    pages, range_hashes = future.result()
+                except Exception as e:
+                    logger.error(f"Error extracting pages {start + 1}-{end}: {e}")
+                    pages, range_hashes = [], [""] * (end - start)
+                on_pages(pages, end)
+                page_hashes.extend(range_hashes)
+        return page_hashes
+    
+    @staticmethod
+    def _build_page(raw_text: Optional[str], page_num: int) -> Optional[Dict]:
+        """Clean a page's extracted text into a page record, or None when it has no text."""
+        if raw_text and raw_text.strip():
+            cleaned_text = PDFProcessor._clean_text(raw_text)
+            logger.debug(f"Extracted {len(cleaned_text)} chars from page {page_num}")
+            return {
+                "page_number": page_num,
+                "text": cleaned_text,
+                "word_count": len(cleaned_text.split())
+            }
+        logger.warning(f"No text found on page {page_num}")
+        return None
+    
+    def _add_pages(self, pages: List[Dict], pages_processed: int):
+        """Append extracted pages and index them, making them searchable immediately."""
+        with self._lock:
+            for page in pages:
+                self._page_offsets.append(self._text_length + 2 if self._pages else 0)
+                self._text_length = self._page_offsets[-1] + len(page["text"])
+                self._total_words += page["word_count"]
+                self._pages.append(page)
+                self._search_index.add_document(page["page_number"], page["text"])
+            self._pages_processed = pages_processed
+            if pages:
+                self.version += 1
+    
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """Clean and normalize extracted text."""
         if not text:
             return ""
@@ -84,87 +570,268 @@ class PDFProcessor:
         return '\n'.join(cleaned_lines)
     
     def get_full_text(self) -> str:
-        """Get the complete text content of the PDF."""
-        if self._full_text is None:
-            logger.warning("PDF not loaded. Call load_pdf() first.")
-            return ""
-        return self._full_text
+        """
+        Get the text content of the PDF (the pages extracted so far while loading).
+        With a page store this decodes a fresh copy; prefer get_text_view or get_page_text.
+        """
+        with self._lock:
+            if self._page_store is not None:
+                return self._page_store.full_text()
+            if self._full_text_version != self.version:
+                self._full_text = "\n\n".join([page["text"] for page in self._pages])
+                self._full_text_version = self.version
+            if not self._full_text and self.load_state == "pending":
+                logger.warning("PDF not loaded. Call load_pdf() first.")
+            return self._full_text or ""
     
     def get_pages(self) -> List[Dict]:
         """Get list of pages with their text content."""
-        return self._pages.copy()
+        with self._lock:
+            if self._page_store is not None:
+                return [
+                    {**page, "text": self._page_store.page_text(index)}
+                    for index, page in enumerate(self._pages)
+                ]
+            return self._pages.copy()
+    
+    def get_page_text(self, page_number: int) -> str:
+        """Get one page's text."""
+        with self._lock:
+            index = self._page_index.get(page_number)
+            if self._page_store is not None and index is not None:
+                return self._page_store.page_text(index)
+            for page in self._pages:
+                if page["page_number"] == page_number:
+                    return page["text"]
+        raise KeyError(page_number)
+    
+    def get_text_view(self) -> memoryview:
+        """Zero-copy view of the full text as UTF-8 bytes when backed by the page store."""
+        with self._lock:
+            if self._page_store is not None:
+                return self._page_store.full_bytes()
+        return memoryview(self.get_full_text().encode("utf-8"))
+    
+    def get_load_progress(self) -> Dict:
+        """Get extraction progress."""
+        total_pages = self._metadata.get("total_pages", 0)
+        return {
+            "state": self.load_state,
+            "pages_processed": self._pages_processed,
+            "pages_indexed": len(self._pages),
+            "total_pages": total_pages,
+            "progress": self._pages_processed / total_pages if total_pages else (1.0 if self.load_state == "ready" else 0.0),
+            "pages_reused": self._pages_reused,
+            "version": self.version,
+            "error": self.load_error
+        }
+    
+    def is_ready(self, min_pages: int = 0) -> bool:
+        """Whether the document is fully loaded, or at least min_pages pages have been processed."""
+        if self.load_state == "ready":
+            return True
+        return self.load_state == "loading" and min_pages > 0 and self._pages_processed >= min_pages and bool(self._pages)
+    
+    def get_vocabulary(self):
+        """Get the set of terms indexed for this document."""
+        with self._lock:
+            return self._search_index.terms()
+    
+    def estimate_memory_bytes(self) -> int:
+        """Rough resident size of the extracted text and search index."""
+        with self._lock:
+            in_memory_text = 0 if self._page_store is not None else self._text_length
+            return in_memory_text + self._search_index.estimate_memory_bytes()
+    
+    def get_page_number(self, offset: int) -> Optional[int]:
+        """Get the page number containing a character offset of the full text."""
+        with self._lock:
+            if not self._page_offsets:
+                return None
+            index = max(0, bisect.bisect_right(self._page_offsets, offset) - 1)
+            return self._pages[index]["page_number"]
+    
+    def get_page_spans(self, start: int, end: int) -> List[Dict]:
+        """
+        Split a full-text range into the pages it covers.
+        Each span has the page number, its offsets in the full text and its
+        offsets within the page's own text.
+        """
+        with self._lock:
+            if not self._page_offsets or end <= start:
+                return []
+            first = max(0, bisect.bisect_right(self._page_offsets, start) - 1)
+            last = max(0, bisect.bisect_right(self._page_offsets, end - 1) - 1)
+            spans = []
+            for index in range(first, last + 1):
+                page_start = self._page_offsets[index]
+                # Pages are joined by a two-character separator
+                page_end = self._page_offsets[index + 1] - 2 if index + 1 < len(self._page_offsets) else self._text_length
+                span_start = max(start, page_start)
+                span_end = min(end, page_end)
+                if span_end > span_start:
+                    spans.append({
+                        "page_number": self._pages[index]["page_number"],
+                        "start_offset": span_start,
+                        "end_offset": span_end,
+                        "page_start": span_start - page_start,
+                        "page_end": span_end - page_start
+                    })
+            return spans
     
     def get_metadata(self) -> Dict:
         """Get PDF metadata."""
         return self._metadata.copy()
     
-    def get_text_chunks(self, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
-        """Split text into chunks for better context management."""
-        if not self._full_text:
-            return []
+    def _page_text_at(self, index: int) -> str:
+        """Get the text of the page at a position in page order."""
+        if self._page_store is not None:
+            return self._page_store.page_text(index)
+        return self._pages[index]["text"]
+    
+    def get_text_range(self, start: int, end: int) -> str:
+        """Get the full text between two character offsets without building the full text."""
+        with self._lock:
+            if not self._page_offsets or end <= start:
+                return ""
+            first = max(0, bisect.bisect_right(self._page_offsets, start) - 1)
+            last = max(0, bisect.bisect_right(self._page_offsets, end - 1) - 1)
+            base = self._page_offsets[first]
+            text = "\n\n".join(self._page_text_at(index) for index in range(first, last + 1))
+            return text[start - base:end - base]
+    
+    def get_chunks(self, max_tokens: int = 500, overlap_tokens: int = 50) -> List[Chunk]:
+        """
+        Get token-budgeted chunks that follow page and heading boundaries.
+        Each chunk records its page range and character offsets in the full
+        text; chunkings are cached per (max_tokens, overlap_tokens) until pages change.
+        """
+        key = (max_tokens, overlap_tokens)
+        with self._lock:
+            cached = self._chunk_cache.get(key)
+            if cached and cached[0] == self.version:
+                return cached[1]
             
-        text = self._full_text
-        chunks = []
-        start = 0
+            pages = (
+                (page["page_number"], self._page_offsets[index], self._page_text_at(index))
+                for index, page in enumerate(self._pages)
+            )
+            chunks = chunk_pages(pages, max_tokens, overlap_tokens)
+            self._chunk_cache[key] = (self.version, chunks)
         
-        while start < len(text):
-            end = start + chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings near the chunk boundary
-                sentence_ends = ['.', '!', '?', '\n']
-                for i in range(min(100, len(text) - end)):
-                    if text[end + i] in sentence_ends:
-                        end = end + i + 1
-                        break
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            start = end - overlap if overlap > 0 else end
-            
-        logger.info(f"Created {len(chunks)} text chunks")
+        logger.info(f"Created {len(chunks)} chunks of up to {max_tokens} tokens")
         return chunks
     
-    def search_text(self, query: str, case_sensitive: bool = False) -> List[Dict]:
-        """Search for text within the PDF."""
+    def _outline_headings(self) -> List[Heading]:
+        """Place outline entries in the full text, at the title on the target page or else at the page start."""
+        page_numbers = [page["page_number"] for page in self._pages]
+        headings = []
+        for level, title, page_number in self._outline:
+            index = bisect.bisect_left(page_numbers, page_number)
+            if index >= len(self._pages):
+                continue  # Target page and everything after it has no text
+            offset = self._page_offsets[index]
+            if self._pages[index]["page_number"] == page_number:
+                position = self._page_text_at(index).lower().find(title.lower())
+                offset += max(0, position)
+            headings.append(Heading(level, clean_title(title), offset))
+        return headings
+    
+    def get_section_index(self) -> SectionIndex:
+        """
+        Get the document's section tree, from the PDF outline when it has one
+        and from heading lines otherwise. Cached until pages change.
+        """
+        with self._lock:
+            if self._section_cache and self._section_cache[0] == self.version:
+                return self._section_cache[1]
+            
+            headings = self._outline_headings() if self._outline else []
+            source = "outline" if headings else "headings"
+            if not headings:
+                headings = headings_from_pages(
+                    (self._page_offsets[index], self._page_text_at(index)) for index in range(len(self._pages))
+                )
+            section_index = SectionIndex(build_sections(headings, self._text_length, self.get_page_number), source)
+            self._section_cache = (self.version, section_index)
+        
+        logger.info(f"Built section index: {len(section_index)} sections from {source}")
+        return section_index
+    
+    def get_text_chunks(self, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
+        """Split text into chunks of about chunk_size characters (see get_chunks)."""
+        chunks = self.get_chunks(max(1, chunk_size // CHARS_PER_TOKEN), overlap // CHARS_PER_TOKEN)
+        return [self.get_text_range(chunk.start, chunk.end) for chunk in chunks]
+    
+    def search_text(self, query: str, case_sensitive: bool = False, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Search the PDF with the page index, ranked by BM25.
+        Supports multi-term queries and quoted phrases; every match on a page is returned.
+        """
         results = []
-        search_query = query if case_sensitive else query.lower()
         
-        for page in self._pages:
-            page_text = page["text"] if case_sensitive else page["text"].lower()
+        query_cache = get_query_cache()
+        hits = None
+        if query_cache is not None:
+            hits = query_cache.get(document_key(self), self.version, query, ("search", limit))
+        if hits is None:
+            with self._lock:
+                version = self.version
+                hits = self._search_index.search(query, limit=limit)
+            if query_cache is not None:
+                query_cache.put(document_key(self), version, query, hits, ("search", limit))
+        
+        for hit in hits:
+            page_text = self._search_index.get_text(hit.doc_id)
+            matches = hit.matches
+            if case_sensitive:
+                matches = [match for match in matches if page_text[match.start:match.end] in query]
+                if not matches:
+                    continue
             
-            if search_query in page_text:
-                # Find the context around the match
-                start_idx = page_text.find(search_query)
-                context_start = max(0, start_idx - 100)
-                context_end = min(len(page_text), start_idx + len(search_query) + 100)
-                context = page["text"][context_start:context_end]
-                
-                results.append({
-                    "page_number": page["page_number"],
-                    "context": context,
-                    "match_position": start_idx
-                })
+            results.append({
+                "page_number": hit.doc_id,
+                "score": hit.score,
+                "context": matches[0].snippet,
+                "match_position": matches[0].start,
+                "matches": [
+                    {"position": match.start, "end": match.end, "context": match.snippet}
+                    for match in matches
+                ]
+            })
         
         return results
     
+    def has_text(self) -> bool:
+        """Whether any page text has been extracted."""
+        return self._text_length > 0
+    
     def get_summary_stats(self) -> Dict:
-        """Get summary statistics about the PDF."""
-        if not self._pages:
+        """
+        Get summary statistics about the PDF in constant time.
+        Counts are kept up to date as pages are indexed, and the metadata
+        comes from the probe, so this is cheap while a large PDF is still
+        loading. total_pages counts pages with text; document_pages is the
+        PDF's page count.
+        """
+        with self._lock:
+            pages = len(self._pages)
+            total_words = self._total_words
+            total_chars = self._text_length
+            metadata = dict(self._metadata)
+        
+        if not pages and not metadata:
             return {}
-            
-        total_words = sum(page["word_count"] for page in self._pages)
-        total_chars = len(self._full_text) if self._full_text else 0
         
         return {
-            "total_pages": len(self._pages),
+            "total_pages": pages,
+            "document_pages": metadata.get("total_pages", pages),
+            "pages_processed": self._pages_processed,
             "total_words": total_words,
             "total_characters": total_chars,
-            "avg_words_per_page": total_words / len(self._pages) if self._pages else 0,
-            "metadata": self._metadata
+            "avg_words_per_page": total_words / pages if pages else 0,
+            "metadata": metadata,
+            "load_state": self.load_state
         }
 
 
@@ -177,12 +844,31 @@ def get_pdf_processor() -> Optional[PDFProcessor]:
     return _pdf_processor
 
 
-def initialize_pdf_processor(pdf_path: str) -> bool:
-    """Initialize the global PDF processor."""
+def initialize_pdf_processor(pdf_path: str, background: bool = False) -> bool:
+    """
+    Initialize the global PDF processor.
+    In background mode extraction continues after this returns and pages
+    become available progressively.
+    """
     global _pdf_processor
     
     try:
-        _pdf_processor = PDFProcessor(pdf_path)
+        _pdf_processor = PDFProcessor(
+            pdf_path,
+            get_extraction_cache(),
+            workers=settings.pdf_extraction_workers or os.cpu_count() or 1,
+            parallel_min_pages=settings.pdf_parallel_min_pages
+        )
+        
+        if background:
+            if not _pdf_processor.pdf_path.exists():
+                logger.error(f"PDF file not found: {pdf_path}")
+                _pdf_processor = None
+                return False
+            _pdf_processor.start_background_load()
+            logger.info("PDF processor loading in background")
+            return True
+        
         success = _pdf_processor.load_pdf()
         
         if success:
@@ -197,4 +883,4 @@ def initialize_pdf_processor(pdf_path: str) -> bool:
     except Exception as e:
         logger.error(f"Error initializing PDF processor: {e}")
         _pdf_processor = None
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,138 @@
+import itertools
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from core.config import get_settings
+from core.search_index import parse_query
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Tokens for processors without a content hash, so a new processor never matches an old one's entries
+_processor_tokens: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_next_token = itertools.count(1)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for cache lookups.
+    Ranking only sees a query's normalized terms and quoted phrases, and not
+    their order, so "Rail access in Canada?" and "canada rail access" share
+    one entry while "rail access" and '"rail access"' do not.
+    """
+    phrases, terms = parse_query(query)
+    quoted = sorted(f'"{" ".join(phrase)}"' for phrase in phrases)
+    return " ".join(quoted + sorted(terms))
+
+
+def document_key(pdf_processor) -> Tuple:
+    """
+    Cache identity of a processor's document: its path, content hash and
+    extractor version (backend and cleaning), since the same file extracted
+    by another backend yields different pages and rankings.
+    """
+    content = pdf_processor.content_hash
+    if content is None:
+        content = _processor_tokens.get(pdf_processor)
+        if content is None:
+            content = _processor_tokens.setdefault(pdf_processor, f"unhashed-{next(_next_token)}")
+    return (str(pdf_processor.pdf_path), content, pdf_processor.extractor_version)
+
+
+class QueryResultCache:
+    """
+    LRU cache of ranked results (chunk or page ids with scores) per query.
+    Entries belong to a document and the document version they were ranked
+    against; the first lookup or store for another version drops the
+    document's entries for the old one, so results never outlive the pages they cite.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._versions: Dict[Hashable, Hashable] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _check_version(self, document: Hashable, version: Hashable):
+        """Drop a document's entries when its version changed (lock held)."""
+        current = self._versions.get(document)
+        if current == version:
+            return
+        self._versions[document] = version
+        if current is None:
+            return
+        stale = [key for key in self._entries if key[0] == document]
+        for key in stale:
+            del self._entries[key]
+        self._invalidations += len(stale)
+        if stale:
+            logger.info(f"Query cache dropped {len(stale)} results for an older document version")
+
+    def get(self, document: Hashable, version: Hashable, query: str, params: Tuple = ()) -> Optional[Any]:
+        """Cached result for a query against a document version, or None."""
+        key = (document, params, normalize_query(query))
+        with self._lock:
+            self._check_version(document, version)
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, document: Hashable, version: Hashable, query: str, result: Any, params: Tuple = ()):
+        """Store a query's result, evicting the least recently used entries over capacity."""
+        key = (document, params, normalize_query(query))
+        with self._lock:
+            self._check_version(document, version)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "documents": len(self._versions),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+
+# Global query result cache instance
+_query_cache: Optional[QueryResultCache] = None
+
+
+def get_query_cache() -> Optional[QueryResultCache]:
+    """Get the global query result cache, or None when disabled."""
+    global _query_cache
+
+    if _query_cache is None and settings.query_cache_enabled:
+        _query_cache = QueryResultCache(settings.query_cache_max_entries)
+        logger.info(f"Query result cache initialized ({settings.query_cache_max_entries} entries)")
+
+    return _query_cache
@@ -0,0 +1,410 @@
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.chunker import CHUNKER_VERSION, Chunk
+from core.config import get_settings
+from core.minhash import MinHasher, MinHashLSH
+from core.pdf_processor import PDFProcessor, get_pdf_processor
+from core.query_cache import document_key, get_query_cache
+from core.search_index import InvertedIndex
+from core.section_index import Section, SectionIndex
+from core.vector_index import VECTORIZER_VERSION, VectorIndex, reciprocal_rank_fusion
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class RetrievedChunk:
+    """A document chunk selected as context for a question."""
+    chunk_id: int
+    text: str
+    start_page: Optional[int]
+    end_page: Optional[int]
+    score: float
+    tokens: int
+    document_id: Optional[str] = None
+    document_title: Optional[str] = None
+    start_offset: Optional[int] = None  # Character offsets in the document's full text
+    end_offset: Optional[int] = None
+    heading: Optional[str] = None
+    signature: Optional[np.ndarray] = field(default=None, repr=False)  # MinHash of the text, for deduplication
+    page_spans: List[Dict] = field(default_factory=list)  # Per-page offsets of the text (see PDFProcessor.get_page_spans)
+    section_id: Optional[int] = None  # Set when the result is a whole section
+
+    @property
+    def page_label(self) -> str:
+        """Human-readable page reference for citations."""
+        if self.start_page is None:
+            return "Page unknown"
+        if self.end_page is None or self.end_page == self.start_page:
+            return f"Page {self.start_page}"
+        return f"Pages {self.start_page}-{self.end_page}"
+
+    def to_citation(self) -> Dict:
+        """Source attribution for the excerpt: document, pages and exact character spans."""
+        return {
+            "document_id": self.document_id,
+            "document_title": self.document_title,
+            "page_label": self.page_label,
+            "start_page": self.start_page,
+            "end_page": self.end_page,
+            "heading": self.heading,
+            "start_offset": self.start_offset,
+            "end_offset": self.end_offset,
+            "spans": self.page_spans
+        }
+
+
+def select_within_budget(ranked: List[RetrievedChunk], top_k: int, token_budget: int) -> List[RetrievedChunk]:
+    """Take ranked chunks until top_k or the token budget is reached (always at least one)."""
+    selected = []
+    used = 0
+    for chunk in ranked:
+        if len(selected) >= top_k:
+            break
+        if selected and used + chunk.tokens > token_budget:
+            continue
+        selected.append(chunk)
+        used += chunk.tokens
+    return selected
+
+
+class DocumentRetriever:
+    """
+    Selects the document chunks most relevant to a question.
+    Chunks come from PDFProcessor.get_chunks, which already carry page ranges
+    and offsets, and are indexed once in a positional inverted index; queries
+    are ranked with BM25. With vector_dimensions set, chunks are also embedded
+    in a local vector index and both rankings are fused, so paraphrased
+    questions still find their passages. Each chunk also gets a MinHash
+    signature so near-duplicate results can be dropped before prompting.
+    Questions that name a section of the document ("North America laws")
+    are answered from that section alone.
+    Ranked chunk ids are cached per query and document version, and chunk
+    text is read back from the processor on demand.
+    """
+
+    def __init__(self, pdf_processor: PDFProcessor, chunk_tokens: int, overlap_tokens: int,
+                 vector_dimensions: int = 0):
+        """Chunk and index the processor's document."""
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        # Processor version the index was built from; pages added later make it stale
+        self.source_version = pdf_processor.version
+        self.source_page_set = pdf_processor.page_set_version
+        self.source_pages = pdf_processor.get_load_progress()["pages_indexed"]
+        self.built_at = time.monotonic()
+        self._pdf_processor = pdf_processor
+        self._chunks: List[Chunk] = []
+        self._index = InvertedIndex()
+        self._vectors: Optional[VectorIndex] = None
+        self._chunk_starts: List[int] = []
+        self._hasher = MinHasher(settings.minhash_permutations)
+        self._signatures = np.empty((0, settings.minhash_permutations), dtype=np.uint32)
+        self._duplicate_chunks = 0
+        self._sections: Optional[SectionIndex] = None
+        self._build()
+        if vector_dimensions:
+            self._build_vectors(vector_dimensions)
+
+    def _build(self):
+        """Index the terms of each chunk."""
+        self._chunks = self._pdf_processor.get_chunks(self.chunk_tokens, self.overlap_tokens)
+        for chunk in self._chunks:
+            self._index.add_document(chunk.chunk_id, self._chunk_text(chunk.chunk_id))
+        # Chunk text is not kept in the index; it is sliced from the processor's page text
+        self._index.use_text_source(self._chunk_text)
+        self._chunk_starts = [chunk.start for chunk in self._chunks]
+        self._sections = self._pdf_processor.get_section_index()
+        self._build_signatures()
+
+        logger.info(f"Retriever indexed {len(self._chunks)} chunks ({self._index.get_stats()['terms']} terms, "
+                    f"{self._duplicate_chunks} near-duplicates)")
+
+    def _build_signatures(self):
+        """MinHash every chunk and count the chunks that nearly duplicate an earlier one."""
+        signatures = np.empty((len(self._chunks), self._hasher.permutations), dtype=np.uint32)
+        lsh = MinHashLSH(self._hasher.permutations)
+        duplicates = 0
+        for chunk in self._chunks:
+            signature = signatures[chunk.chunk_id] = self._hasher.signature(self._chunk_text(chunk.chunk_id))
+            if lsh.query(signature, settings.dedup_similarity_threshold):
+                duplicates += 1
+            lsh.insert(chunk.chunk_id, signature)
+        self._signatures = signatures
+        self._duplicate_chunks = duplicates
+
+    def _vector_path(self, dimensions: int) -> Optional[Path]:
+        """Where to save the vector matrix, or None when the document is not cached or still loading."""
+        processor = self._pdf_processor
+        if not processor.extraction_cache or not processor.content_hash or processor.load_state != "ready":
+            return None
+        name = f"vectors-v{VECTORIZER_VERSION}-c{CHUNKER_VERSION}-{self.chunk_tokens}-{self.overlap_tokens}-d{dimensions}"
+        return processor.extraction_cache.vector_index_path(processor.content_hash, processor.extractor_version, name)
+
+    def _build_vectors(self, dimensions: int):
+        """Memory-map the saved vector index for these chunks, or embed the chunks and save it."""
+        path = self._vector_path(dimensions)
+        if path and VectorIndex.exists(path):
+            try:
+                vectors = VectorIndex.load(path, dimensions)
+                if len(vectors) == len(self._chunks):
+                    self._vectors = vectors
+                    logger.info(f"Loaded vector index: {len(vectors)} vectors")
+                    return
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable vector index {path}: {e}")
+
+        try:
+            vectors = VectorIndex(dimensions)
+            vectors.build(len(self._chunks), self._chunk_text, path)
+            self._vectors = vectors
+            logger.info(f"Built vector index: {len(vectors)} vectors of {dimensions} dimensions")
+        except Exception as e:
+            logger.error(f"Failed to build vector index, using keyword ranking only: {e}")
+
+    def _chunk_text(self, chunk_id: int) -> str:
+        """Get a chunk's text from the processor."""
+        chunk = self._chunks[chunk_id]
+        return self._pdf_processor.get_text_range(chunk.start, chunk.end)
+
+    def _to_result(self, index: int, score: float) -> RetrievedChunk:
+        """Build a result record for a chunk."""
+        chunk = self._chunks[index]
+        return RetrievedChunk(
+            chunk_id=chunk.chunk_id,
+            text=self._chunk_text(index),
+            start_page=chunk.start_page,
+            end_page=chunk.end_page,
+            score=score,
+            tokens=chunk.tokens,
+            start_offset=chunk.start,
+            end_offset=chunk.end,
+            heading=chunk.heading,
+            signature=self._signatures[index],
+            page_spans=self._pdf_processor.get_page_spans(chunk.start, chunk.end)
+        )
+
+    def _chunk_range(self, section: Section) -> range:
+        """Ids of the chunks overlapping a section."""
+        first = max(0, bisect.bisect_right(self._chunk_starts, section.start) - 1)
+        last = bisect.bisect_left(self._chunk_starts, section.end)
+        return range(first, last)
+
+    def _section_result(self, section: Section) -> RetrievedChunk:
+        """Build a result record holding a whole section."""
+        return RetrievedChunk(
+            chunk_id=self._chunk_range(section).start,
+            text=self._pdf_processor.get_text_range(section.start, section.end),
+            start_page=section.start_page,
+            end_page=section.end_page,
+            score=0.0,
+            tokens=section.tokens,
+            start_offset=section.start,
+            end_offset=section.end,
+            heading=section.title,
+            page_spans=self._pdf_processor.get_page_spans(section.start, section.end),
+            section_id=section.section_id
+        )
+
+    def retrieve_sections(self, query: str, top_k: int, token_budget: int) -> List[RetrievedChunk]:
+        """
+        Answer a query that names sections from those sections only.
+        Sections that fit the token budget are returned whole; otherwise the
+        best-ranked chunks inside them are. Empty when the query names no section.
+        """
+        sections = self._sections.find(query) if self._sections is not None else []
+        if not sections:
+            return []
+
+        if sum(section.tokens for section in sections) <= token_budget:
+            logger.info(f"Query routed to sections: {', '.join(section.title for section in sections)}")
+            return [self._section_result(section) for section in sections]
+
+        in_sections = set()
+        for section in sections:
+            in_sections.update(self._chunk_range(section))
+        hits = self._index.search(query, limit=None, include_matches=False)
+        ranked = [self._to_result(hit.doc_id, hit.score) for hit in hits if hit.doc_id in in_sections]
+        if not ranked:
+            ranked = [self._to_result(chunk_id, 0.0) for chunk_id in sorted(in_sections)]
+        selected = select_within_budget(ranked, top_k, token_budget)
+        selected.sort(key=lambda chunk: chunk.chunk_id)
+        logger.info(f"Query routed to {len(selected)} chunks within sections: "
+                    f"{', '.join(section.title for section in sections)}")
+        return selected
+
+    def retrieve(self, query: str, top_k: Optional[int] = None, token_budget: Optional[int] = None,
+                 fallback: bool = True, sections: bool = True) -> List[RetrievedChunk]:
+        """
+        Get the most relevant chunks for a query within the token budget.
+        A query naming a section is answered from that section when sections
+        is set and section routing is enabled. Falls back to the leading
+        chunks of the document when nothing matches, unless fallback is disabled.
+        """
+        top_k = top_k or settings.retrieval_top_k
+        token_budget = token_budget or settings.retrieval_token_budget
+        sections = sections and settings.section_routing_enabled
+
+        # Repeated questions reuse the ranked chunk ids and skip ranking entirely
+        query_cache = get_query_cache()
+        cache_key = (document_key(self._pdf_processor), self.chunk_tokens, self.overlap_tokens, self._vectors is not None)
+        params = ("retrieve", top_k, token_budget, fallback, sections)
+        if query_cache is not None:
+            cached = query_cache.get(cache_key, self.source_version, query, params)
+            if cached is not None:
+                return [
+                    self._section_result(self._sections.sections[index]) if is_section else self._to_result(index, score)
+                    for is_section, index, score in cached
+                ]
+
+        selected = self._rank(query, top_k, token_budget, fallback, sections)
+        if query_cache is not None:
+            query_cache.put(cache_key, self.source_version, query, tuple(
+                (True, chunk.section_id, chunk.score) if chunk.section_id is not None else (False, chunk.chunk_id, chunk.score)
+                for chunk in selected
+            ), params)
+        return selected
+
+    def _rank(self, query: str, top_k: int, token_budget: int, fallback: bool, sections: bool) -> List[RetrievedChunk]:
+        """Rank and select chunks for a query (see retrieve)."""
+        if sections:
+            routed = self.retrieve_sections(query, top_k, token_budget)
+            if routed:
+                return routed
+
+        # Rank a few extra candidates so the token budget can skip oversized chunks
+        hits = self._index.search(query, limit=top_k * 4, include_matches=False)
+
+        vector_hits = []
+        if self._vectors is not None:
+            vector_hits = self._vectors.search(query, top_k * 4, settings.vector_min_similarity)
+
+        if vector_hits:
+            fused = reciprocal_rank_fusion([[hit.doc_id for hit in hits], [row for row, _ in vector_hits]])
+            ranked = [self._to_result(chunk_id, score) for chunk_id, score in fused]
+        elif hits:
+            ranked = [self._to_result(hit.doc_id, hit.score) for hit in hits]
+        elif fallback:
+            ranked = [self._to_result(index, 0.0) for index in range(min(len(self._chunks), top_k * 4))]
+        else:
+            return []
+
+        selected = select_within_budget(ranked, top_k, token_budget)
+        # Present excerpts in document order so the model reads them coherently
+        selected.sort(key=lambda chunk: chunk.chunk_id)
+        return selected
+
+    def estimate_memory_bytes(self) -> int:
+        """Rough resident size of the chunk, signature and vector indexes; chunk texts are not held."""
+        vector_bytes = self._vectors.estimate_memory_bytes() if self._vectors is not None else 0
+        return self._index.estimate_memory_bytes() + self._signatures.nbytes + vector_bytes
+
+    def get_stats(self) -> Dict:
+        """Get retriever index statistics."""
+        return {
+            "chunks": len(self._chunks),
+            "terms": self._index.get_stats()["terms"],
+            "chunk_tokens": self.chunk_tokens,
+            "overlap_tokens": self.overlap_tokens,
+            "source_version": self.source_version,
+            "total_tokens": sum(chunk.tokens for chunk in self._chunks),
+            "duplicate_chunks": self._duplicate_chunks,
+            "sections": self._sections.get_stats() if self._sections is not None else None,
+            "vectors": self._vectors.get_stats() if self._vectors is not None else None
+        }
+
+
+# Global retriever instance
+_retriever: Optional[DocumentRetriever] = None
+# Held while the global retriever is built, so concurrent questions never build it twice
+_build_lock = threading.Lock()
+
+
+def get_retriever() -> Optional[DocumentRetriever]:
+    """Get the global retriever instance."""
+    return _retriever
+
+
+def _pages_replaced(retriever: DocumentRetriever, pdf_processor: PDFProcessor) -> bool:
+    """Whether the processor's pages were replaced since the retriever was built, invalidating its chunk offsets."""
+    return retriever.source_page_set != pdf_processor.page_set_version
+
+
+def _rebuild_due(retriever: DocumentRetriever, pdf_processor: PDFProcessor) -> bool:
+    """
+    Whether a stale retriever should be rebuilt now. While a PDF is still
+    loading, every new page bumps its version; rebuilding all indexes for
+    each one would repeat the whole build per question, so rebuilds wait for
+    enough new pages or time. Other changes (finished loads, and reloads that
+    replace pages, even while still loading) rebuild at once.
+    """
+    if retriever.source_version == pdf_processor.version:
+        return False
+    if pdf_processor.load_state != "loading" or _pages_replaced(retriever, pdf_processor):
+        return True
+    new_pages = pdf_processor.get_load_progress()["pages_indexed"] - retriever.source_pages
+    return (new_pages >= settings.retriever_rebuild_pages
+            or time.monotonic() - retriever.built_at >= settings.retriever_rebuild_seconds)
+
+
+def get_current_retriever() -> Optional[DocumentRetriever]:
+    """
+    Get a retriever for the pages loaded so far, rebuilding it when it is due.
+    One thread builds at a time; while it does, others keep answering from
+    the previous retriever, and only wait when there is none yet or its
+    pages were replaced, since its chunk offsets would read the wrong text.
+    """
+    pdf_processor = get_pdf_processor()
+    retriever = _retriever
+    if retriever is not None and not (pdf_processor and _rebuild_due(retriever, pdf_processor)):
+        return retriever
+
+    if not _build_lock.acquire(blocking=retriever is None or _pages_replaced(retriever, pdf_processor)):
+        return retriever
+    try:
+        # Another thread may have rebuilt while this one waited
+        if _retriever is None or (pdf_processor and _rebuild_due(_retriever, pdf_processor)):
+            _initialize_retriever()
+        return _retriever
+    finally:
+        _build_lock.release()
+
+
+def initialize_retriever() -> bool:
+    """Build the global retriever from the loaded PDF."""
+    with _build_lock:
+        return _initialize_retriever()
+
+
+def _initialize_retriever() -> bool:
+    """Build the global retriever (build lock held)."""
+    global _retriever
+
+    pdf_processor = get_pdf_processor()
+    if not pdf_processor:
+        logger.error("Cannot build retriever: PDF processor not initialized")
+        return False
+
+    try:
+        _retriever = DocumentRetriever(
+            pdf_processor,
+            settings.retrieval_chunk_tokens,
+            settings.retrieval_chunk_overlap_tokens,
+            settings.vector_dimensions if settings.vector_search_enabled else 0
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error initializing retriever: {e}")
+        _retriever = None
+        return False
@@ -0,0 +1,289 @@
+import heapq
+from array import array
+import logging
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from core.text_utils import is_stopword, tokenize, tokenize_with_offsets
+
+
+logger = logging.getLogger(__name__)
+
+_PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# Approximate resident bytes per indexed token (position and span array entries)
+_BYTES_PER_TOKEN = 12
+# Approximate resident bytes per (term, document) posting (position array object and dict slot)
+_BYTES_PER_POSTING = 130
+
+
+@dataclass
+class SearchMatch:
+    """A single term or phrase occurrence inside a document."""
+    start: int
+    end: int
+    snippet: str
+
+
+@dataclass
+class SearchHit:
+    """A ranked document with every match it contains."""
+    doc_id: int
+    score: float
+    matches: List[SearchMatch] = field(default_factory=list)
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """
+    Split a query into quoted phrases and loose terms.
+    Stopwords are dropped from loose terms unless nothing else remains.
+    """
+    phrases = [tokenize(phrase, keep_stopwords=True) for phrase in _PHRASE_PATTERN.findall(query)]
+    phrases = [phrase for phrase in phrases if phrase]
+
+    remainder = _PHRASE_PATTERN.sub(" ", query)
+    terms = tokenize(remainder)
+    if not terms and not phrases:
+        terms = tokenize(remainder, keep_stopwords=True)
+    return phrases, terms
+
+
+class InvertedIndex:
+    """
+    Positional inverted index with BM25 ranking.
+    Postings map each normalized term to the token positions it occupies in
+    every document; token character spans are kept for match snippets.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index with BM25 parameters."""
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, array]] = defaultdict(dict)
+        # Distinct terms of each document, so removing one only touches its own postings
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._spans: Dict[int, array] = {}
+        self._texts: Dict[int, str] = {}
+        # Optional external text lookup used instead of _texts (e.g. a memory-mapped page store)
+        self._text_source: Optional[Callable[[int], str]] = None
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._posting_count = 0
+
+    def add_document(self, doc_id: int, text: str):
+        """Index a document's terms and positions, replacing any earlier version of it."""
+        self.remove_document(doc_id)
+        tokens = tokenize_with_offsets(text)
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for position, (term, _, _) in enumerate(tokens):
+            positions[term].append(position)
+
+        for term, term_positions in positions.items():
+            self._postings[term][doc_id] = array("I", term_positions)
+        self._doc_terms[doc_id] = tuple(positions)
+        self._posting_count += len(positions)
+
+        # Flattened (start, end) character span of every token position
+        spans = array("I")
+        for _, start, end in tokens:
+            spans.append(start)
+            spans.append(end)
+        self._spans[doc_id] = spans
+        if self._text_source is None:
+            self._texts[doc_id] = text
+        self._doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove_document(self, doc_id: int):
+        """Drop a document and its postings so it can be re-indexed or deleted."""
+        if doc_id not in self._doc_lengths:
+            return
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            if postings.pop(doc_id, None) is not None:
+                self._posting_count -= 1
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._spans.pop(doc_id, None)
+        self._texts.pop(doc_id, None)
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def get_text(self, doc_id: int) -> str:
+        """Get the indexed text of a document."""
+        if self._text_source is not None:
+            return self._text_source(doc_id)
+        return self._texts[doc_id]
+
+    def use_text_source(self, text_source: Callable[[int], str]):
+        """Read document texts from an external source and drop the in-memory copies."""
+        self._text_source = text_source
+        self._texts = {}
+
+    def copy(self) -> "InvertedIndex":
+        """
+        Independent copy that can be updated while this index keeps serving
+        searches. Position and span arrays are shared, since documents are
+        only ever replaced, never edited in place.
+        """
+        clone = InvertedIndex(self.k1, self.b)
+        for term, postings in self._postings.items():
+            clone._postings[term] = dict(postings)
+        clone._doc_terms = dict(self._doc_terms)
+        clone._spans = dict(self._spans)
+        clone._texts = dict(self._texts)
+        clone._text_source = self._text_source
+        clone._doc_lengths = dict(self._doc_lengths)
+        clone._total_length = self._total_length
+        clone._posting_count = self._posting_count
+        return clone
+
+    def __getstate__(self):
+        # The external text source is reattached after unpickling
+        state = self.__dict__.copy()
+        state["_text_source"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "_doc_terms" not in state:
+            # Indexes pickled before per-document term lists were kept
+            doc_terms = defaultdict(list)
+            for term, postings in self._postings.items():
+                for doc_id in postings:
+                    doc_terms[doc_id].append(term)
+            self._doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+
+    def _idf(self, term: str) -> float:
+        """BM25 inverse document frequency."""
+        frequency = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._doc_lengths) - frequency + 0.5) / (frequency + 0.5))
+
+    def _bm25(self, doc_id: int, terms: List[str], idfs: Dict[str, float], avg_length: float) -> float:
+        """BM25 score of one document for the given terms."""
+        length_norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+        score = 0.0
+        for term in terms:
+            positions = self._postings[term].get(doc_id)
+            if positions:
+                tf = len(positions)
+                score += idfs[term] * tf * (self.k1 + 1) / (tf + length_norm)
+        return score
+
+    def _phrase_positions(self, doc_id: int, phrase: List[str]) -> List[int]:
+        """Start positions of every occurrence of a phrase in a document."""
+        first = self._postings.get(phrase[0], {}).get(doc_id)
+        if not first:
+            return []
+        following = []
+        for term in phrase[1:]:
+            positions = self._postings.get(term, {}).get(doc_id)
+            if not positions:
+                return []
+            following.append(set(positions))
+        return [
+            start for start in first
+            if all(start + offset in positions for offset, positions in enumerate(following, 1))
+        ]
+
+    @staticmethod
+    def _snippet(text: str, start: int, end: int, context_chars: int) -> str:
+        """Text surrounding a match."""
+        return text[max(0, start - context_chars):min(len(text), end + context_chars)]
+
+    def search(self, query: str, limit: Optional[int] = 10, context_chars: int = 100,
+               include_matches: bool = True) -> List[SearchHit]:
+        """
+        Rank documents for a query with BM25.
+        Quoted phrases must all occur in a document; loose terms are optional
+        and only affect ranking. Every occurrence is returned with a snippet.
+        """
+        if not self._doc_lengths:
+            return []
+
+        phrases, terms = parse_query(query)
+        if not phrases and not terms:
+            return []
+
+        # Candidate documents: those containing every phrase, otherwise any term
+        phrase_hits: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        if phrases:
+            candidates = None
+            for phrase in phrases:
+                docs = set(self._postings.get(phrase[0], ()))
+                for term in phrase[1:]:
+                    docs &= self._postings.get(term, {}).keys()
+                if candidates is not None:
+                    docs &= candidates
+                matched = set()
+                for doc_id in docs:
+                    starts = self._phrase_positions(doc_id, phrase)
+                    if starts:
+                        matched.add(doc_id)
+                        phrase_hits[doc_id].extend((start, start + len(phrase) - 1) for start in starts)
+                candidates = matched
+        else:
+            candidates = set()
+            for term in terms:
+                candidates.update(self._postings.get(term, ()))
+
+        if not candidates:
+            return []
+
+        scoring_terms = list(dict.fromkeys(
+            terms + [term for phrase in phrases for term in phrase if not is_stopword(term)]
+        ))
+        scoring_terms = [term for term in scoring_terms if term in self._postings]
+        idfs = {term: self._idf(term) for term in scoring_terms}
+        avg_length = self._total_length / len(self._doc_lengths) or 1.0
+
+        scored = [(self._bm25(doc_id, scoring_terms, idfs, avg_length), doc_id) for doc_id in candidates]
+        if limit:
+            ranked = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+        else:
+            ranked = sorted(scored, key=lambda item: (-item[0], item[1]))
+
+        if not include_matches:
+            return [SearchHit(doc_id, score) for score, doc_id in ranked]
+
+        hits = []
+        for score, doc_id in ranked:
+            token_ranges = list(phrase_hits.get(doc_id, ()))
+            for term in terms:
+                token_ranges.extend((position, position) for position in self._postings.get(term, {}).get(doc_id, ()))
+
+            spans = self._spans[doc_id]
+            text = self.get_text(doc_id)
+            matches = []
+            for first, last in sorted(set(token_ranges)):
+                start, end = spans[2 * first], spans[2 * last + 1]
+                matches.append(SearchMatch(start, end, self._snippet(text, start, end, context_chars)))
+            hits.append(SearchHit(doc_id, score, matches))
+
+        return hits
+
+    def terms(self) -> FrozenSet[str]:
+        """Get the indexed vocabulary."""
+        return frozenset(self._postings)
+
+    def estimate_memory_bytes(self) -> int:
+        """Rough resident size of the index, including the document texts it references."""
+        return (
+            self._total_length * _BYTES_PER_TOKEN
+            + self._posting_count * _BYTES_PER_POSTING
+            + sum(len(text) for text in self._texts.values())
+        )
+
+    def get_stats(self) -> Dict:
+        """Get index size statistics."""
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._postings),
+            "postings": self._posting_count,
+            "tokens": self._total_length
+        }
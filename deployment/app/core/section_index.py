@@ -0,0 +1,208 @@
+import bisect
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core.chunker import is_heading, is_structural_heading
+from core.text_utils import CHARS_PER_TOKEN, tokenize
+
+
+# "Page 4: ", "Chapter 2 - " and similar prefixes carry no topic
+_HEADING_PREFIX = re.compile(r"^(page|chapter|section|part|appendix)\s+[\w.-]+\s*[:.-]\s*", re.IGNORECASE)
+_NUMBERED_PREFIX = re.compile(r"^(\d+(?:\.\d+)*)[.)]?\s+")
+# "North America - Overview": a topic and a subtopic
+_TOPIC_SEPARATOR = re.compile(r"\s+[-–—:]\s+")
+
+# Title words that describe a section's role rather than its topic
+GENERIC_TITLE_TERMS = frozenset({
+    "overview", "summary", "general", "regional", "section", "chapter", "part", "page", "appendix"
+})
+
+
+@dataclass(frozen=True)
+class Heading:
+    """A section start: from the PDF outline, or a heading line found in the text."""
+    level: int  # 1 for top-level sections
+    title: str
+    offset: int  # Character offset in the full text
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading and the full-text span it covers, up to the next heading of the same or a higher level."""
+    section_id: int
+    title: str
+    level: int
+    start: int
+    end: int
+    start_page: Optional[int]
+    end_page: Optional[int]
+    parent_id: Optional[int] = None
+
+    @property
+    def tokens(self) -> int:
+        return max(1, (self.end - self.start) // CHARS_PER_TOKEN) if self.end > self.start else 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "section_id": self.section_id,
+            "title": self.title,
+            "level": self.level,
+            "start_offset": self.start,
+            "end_offset": self.end,
+            "start_page": self.start_page,
+            "end_page": self.end_page,
+            "parent_id": self.parent_id,
+            "tokens": self.tokens
+        }
+
+
+def clean_title(title: str) -> str:
+    """Strip page/chapter prefixes and numbering from a heading."""
+    title = _HEADING_PREFIX.sub("", title.strip())
+    return _NUMBERED_PREFIX.sub("", title).strip() or title.strip()
+
+
+def title_terms(title: str) -> FrozenSet[str]:
+    """Search terms naming a section's topic; generic words are ignored unless nothing else remains."""
+    terms = set(tokenize(title))
+    return frozenset(terms - GENERIC_TITLE_TERMS or terms)
+
+
+def headings_from_pages(pages: Iterable[Tuple[int, str]]) -> List[Heading]:
+    """
+    Find heading lines in page texts, given as (full-text offset, text).
+    When the document has numbered or "Page N:"-style headings only those
+    are used, since capitalized lines such as table headers would otherwise
+    split its sections. Numbered headings ("2.1 Rail") nest by their
+    numbering depth; consecutive headings sharing a topic ("United States -
+    ADA", "United States - Rail") are grouped under a heading for the topic.
+    """
+    found: List[Heading] = []
+    structural: List[bool] = []
+    for page_offset, text in pages:
+        position = 0
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if stripped and is_heading(stripped):
+                numbered = _NUMBERED_PREFIX.match(stripped)
+                level = numbered.group(1).count(".") + 1 if numbered else 1
+                found.append(Heading(level, clean_title(stripped), page_offset + position + line.index(stripped)))
+                structural.append(is_structural_heading(stripped))
+            position += len(line) + 1
+    if any(structural):
+        found = [heading for heading, is_structural in zip(found, structural) if is_structural]
+
+    headings: List[Heading] = []
+    topic = None
+    for heading in found:
+        parts = _TOPIC_SEPARATOR.split(heading.title, maxsplit=1) if heading.level == 1 else []
+        if len(parts) == 2:
+            if parts[0] != topic:
+                topic = parts[0]
+                headings.append(Heading(1, topic, heading.offset))
+            headings.append(Heading(2, heading.title, heading.offset))
+        else:
+            topic = None
+            headings.append(heading)
+    return headings
+
+
+def build_sections(headings: List[Heading], text_length: int,
+                   page_number_at: Callable[[int], Optional[int]]) -> List[Section]:
+    """Turn headings in document order into nested sections spanning the full text."""
+    headings = sorted(headings, key=lambda heading: heading.offset)
+    ends = [text_length] * len(headings)
+    parents: List[Optional[int]] = [None] * len(headings)
+    open_sections: List[int] = []
+    for index, heading in enumerate(headings):
+        # A heading closes every open section at its level or deeper
+        while open_sections and headings[open_sections[-1]].level >= heading.level:
+            ends[open_sections.pop()] = heading.offset
+        parents[index] = open_sections[-1] if open_sections else None
+        open_sections.append(index)
+
+    return [
+        Section(
+            section_id=index,
+            title=heading.title,
+            level=heading.level,
+            start=heading.offset,
+            end=ends[index],
+            start_page=page_number_at(heading.offset),
+            end_page=page_number_at(max(heading.offset, ends[index] - 1)),
+            parent_id=parents[index]
+        )
+        for index, heading in enumerate(headings)
+    ]
+
+
+class SectionIndex:
+    """
+    A document's section tree with navigational lookups.
+    Sections are ordered by start offset, so the section containing an offset
+    is a binary search away; title terms map to the sections they name, so a
+    question is resolved by one dictionary lookup per query term.
+    """
+
+    def __init__(self, sections: List[Section], source: str = "headings"):
+        """Index sections for offset and title lookups."""
+        self.sections = sections
+        self.source = source  # "outline" or "headings"
+        self._starts = [section.start for section in sections]
+        self._terms = [title_terms(section.title) for section in sections]
+        self._by_term: Dict[str, List[int]] = defaultdict(list)
+        for section_id, terms in enumerate(self._terms):
+            for term in terms:
+                self._by_term[term].append(section_id)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def section_at(self, offset: int) -> Optional[Section]:
+        """The innermost section containing a full-text offset."""
+        index = bisect.bisect_right(self._starts, offset) - 1
+        while index >= 0:
+            section = self.sections[index]
+            if section.start <= offset < section.end:
+                return section
+            index = section.parent_id if section.parent_id is not None else -1
+        return None
+
+    def _is_ancestor(self, ancestor_id: int, section_id: int) -> bool:
+        parent_id = self.sections[section_id].parent_id
+        while parent_id is not None:
+            if parent_id == ancestor_id:
+                return True
+            parent_id = self.sections[parent_id].parent_id
+        return False
+
+    def find(self, query: str) -> List[Section]:
+        """
+        Sections whose title the query names: every topic term of the title
+        occurs in the query. When a section and one of its subsections both
+        match, only the more specific subsection is returned.
+        """
+        matched_terms: Dict[int, int] = defaultdict(int)
+        for term in set(tokenize(query)):
+            for section_id in self._by_term.get(term, ()):
+                matched_terms[section_id] += 1
+
+        matched = [
+            section_id for section_id, count in matched_terms.items()
+            if count == len(self._terms[section_id])
+        ]
+        specific = [
+            section_id for section_id in matched
+            if not any(other != section_id and self._is_ancestor(section_id, other) for other in matched)
+        ]
+        return [self.sections[section_id] for section_id in sorted(specific)]
+
+    def get_stats(self) -> Dict:
+        """Get section tree statistics."""
+        return {
+            "sections": len(self.sections),
+            "source": self.source,
+            "max_depth": max((section.level for section in self.sections), default=0)
+        }
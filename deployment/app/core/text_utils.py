@@ -0,0 +1,56 @@
+import re
+from typing import List, Tuple
+
+
+# Rough characters-per-token ratio for English prose with Claude tokenizers
+CHARS_PER_TOKEN = 4
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Matches the same tokens in the original text so offsets stay valid
+_CASELESS_TOKEN_PATTERN = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+
+_STOPWORDS = {
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from",
+    "had", "has", "have", "how", "i", "if", "in", "into", "is", "it", "its", "me", "my", "of", "on",
+    "or", "our", "should", "so", "tell", "than", "that", "the", "their", "them", "then", "there",
+    "these", "they", "this", "to", "us", "was", "we", "were", "what", "when", "where", "which",
+    "who", "why", "will", "with", "would", "you", "your"
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def normalize_token(token: str) -> str:
+    """Apply light suffix stripping so simple inflections match."""
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def is_stopword(token: str) -> bool:
+    """Check whether a lowercase token carries no search meaning on its own."""
+    return token in _STOPWORDS
+
+
+def tokenize_with_offsets(text: str) -> List[Tuple[str, int, int]]:
+    """Split text into (normalized term, start, end) triples, keeping stopwords for positions."""
+    return [
+        (normalize_token(match.group().lower()), match.start(), match.end())
+        for match in _CASELESS_TOKEN_PATTERN.finditer(text)
+    ]
+
+
+def tokenize(text: str, keep_stopwords: bool = False) -> List[str]:
+    """Split text into lowercase, normalized search terms."""
+    return [
+        normalize_token(token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if keep_stopwords or token not in _STOPWORDS
+    ]
@@ -0,0 +1,207 @@
+import logging
+import os
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.text_utils import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+# Identifies the feature hashing scheme; bump to invalidate saved vector files
+VECTORIZER_VERSION = 1
+
+# Rows vectorized per batch while building
+_BUILD_BATCH = 1024
+
+
+class HashingVectorizer:
+    """
+    Offline text vectorizer using the hashing trick.
+    Each normalized term contributes its own feature plus the character
+    trigrams of the word, so related word forms ("accessible",
+    "accessibility") and paraphrases sharing stems land on common features.
+    Hashes are CRC32, stable across processes, so saved vectors stay valid.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        """Initialize with the number of hashed feature dimensions."""
+        self.dimensions = dimensions
+        self._features: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _term_features(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature indices and signed weights for one term, memoized."""
+        features = self._features.get(term)
+        if features is None:
+            padded = f"<{term}>"
+            keys = [f"w:{term}"] + [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+            hashes = np.array([zlib.crc32(key.encode("utf-8")) for key in keys], dtype=np.uint32)
+            indices = (hashes % self.dimensions).astype(np.int64)
+            weights = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            # The whole-word feature outweighs any single trigram
+            weights[0] *= 2.0
+            features = self._features[term] = (indices, weights)
+        return features
+
+    def transform_into(self, texts: List[str], out: np.ndarray):
+        """Write sublinear term-frequency vectors for texts into the rows of out."""
+        out[:] = 0.0
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            if not counts:
+                continue
+            features = [self._term_features(term) for term in counts]
+            indices = np.concatenate([feature[0] for feature in features])
+            feature_weights = np.concatenate([feature[1] for feature in features])
+            term_weights = np.repeat(
+                1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts))),
+                [len(feature[0]) for feature in features]
+            )
+            out[row] = np.bincount(indices, weights=feature_weights * term_weights, minlength=self.dimensions)
+
+    def transform(self, text: str) -> np.ndarray:
+        """Vectorize a single text."""
+        vector = np.zeros((1, self.dimensions), dtype=np.float32)
+        self.transform_into([text], vector)
+        return vector[0]
+
+
+class VectorIndex:
+    """
+    Dense vector index over document chunks with cosine similarity search.
+    Vectors are IDF-weighted, L2-normalized float32 rows of one matrix, so a
+    query is a single matrix-vector product. The matrix can be saved as a
+    .npy file and memory-mapped back, keeping it out of the Python heap.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        """Initialize an empty index."""
+        self.vectorizer = HashingVectorizer(dimensions)
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self._idf = np.ones(dimensions, dtype=np.float32)
+        self._memory_mapped = False
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectorizer.dimensions
+
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
+
+    def build(self, count: int, get_text: Callable[[int], str], path: Optional[Path] = None):
+        """
+        Vectorize documents 0..count-1.
+        With a path, the matrix is written straight into a .npy file and
+        memory-mapped, so building never holds it all in memory.
+        """
+        if path:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".tmp-{os.getpid()}-{path.name}")
+            matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(count, self.dimensions))
+        else:
+            matrix = np.zeros((count, self.dimensions), dtype=np.float32)
+
+        # Pass 1: term-frequency vectors and document frequency per feature
+        document_frequency = np.zeros(self.dimensions, dtype=np.int64)
+        batch = np.zeros((_BUILD_BATCH, self.dimensions), dtype=np.float32)
+        for start in range(0, count, _BUILD_BATCH):
+            end = min(count, start + _BUILD_BATCH)
+            rows = batch[:end - start]
+            self.vectorizer.transform_into([get_text(index) for index in range(start, end)], rows)
+            document_frequency += np.count_nonzero(rows, axis=0)
+            matrix[start:end] = rows
+
+        # Pass 2: IDF weighting and L2 normalization
+        idf = (np.log((1 + count) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        for start in range(0, count, _BUILD_BATCH):
+            rows = matrix[start:start + _BUILD_BATCH] * idf
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            matrix[start:start + _BUILD_BATCH] = rows / np.maximum(norms, 1e-12)
+
+        self._idf = idf
+        if path:
+            matrix.flush()
+            del matrix
+            # The IDF file is moved into place last; its presence marks a complete index
+            os.replace(tmp_path, path)
+            idf_path = self.idf_path(path)
+            tmp_idf = idf_path.with_name(f".tmp-{os.getpid()}-{idf_path.name}")
+            np.save(tmp_idf, idf)
+            os.replace(tmp_idf, idf_path)
+            self._load_matrix(path)
+        else:
+            self._matrix = matrix
+            self._memory_mapped = False
+
+    @staticmethod
+    def idf_path(path: Path) -> Path:
+        """Path of the IDF weights saved alongside a matrix file."""
+        path = Path(path)
+        return path.with_name(f"{path.stem}.idf.npy")
+
+    @classmethod
+    def exists(cls, path: Path) -> bool:
+        """Whether a complete saved index exists."""
+        return Path(path).exists() and cls.idf_path(path).exists()
+
+    @classmethod
+    def load(cls, path: Path, dimensions: int) -> "VectorIndex":
+        """Memory-map a saved index."""
+        index = cls(dimensions)
+        index._idf = np.load(cls.idf_path(path))
+        index._load_matrix(path)
+        if index._matrix.shape[1] != dimensions:
+            raise ValueError(f"Vector index {path} has {index._matrix.shape[1]} dimensions, expected {dimensions}")
+        return index
+
+    def _load_matrix(self, path: Path):
+        """Memory-map the matrix read-only."""
+        self._matrix = np.load(path, mmap_mode="r")
+        self._memory_mapped = True
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """IDF-weighted, normalized query vector."""
+        vector = self.vectorizer.transform(query) * self._idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, query: str, top_k: int = 5, min_similarity: float = 0.0) -> List[Tuple[int, float]]:
+        """Get (row, cosine similarity) pairs for the rows most similar to a query."""
+        if not len(self) or top_k <= 0:
+            return []
+        query_vector = self.embed_query(query)
+        if not query_vector.any():
+            return []
+
+        scores = self._matrix @ query_vector
+        top_k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [(int(row), float(scores[row])) for row in candidates if scores[row] > min_similarity]
+
+    def estimate_memory_bytes(self) -> int:
+        """Resident size of the matrix; a memory-mapped matrix lives in the OS page cache instead."""
+        return 0 if self._memory_mapped else int(self._matrix.nbytes)
+
+    def get_stats(self) -> Dict:
+        """Get vector index statistics."""
+        return {
+            "vectors": len(self),
+            "dimensions": self.dimensions,
+            "memory_mapped": self._memory_mapped,
+            "matrix_bytes": int(self._matrix.nbytes)
+        }
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Merge ranked id lists into one ranking by summed 1 / (k + rank)."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
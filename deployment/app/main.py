@@ -16,10 +16,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import our modules
 from core.config import get_settings
 from core.pdf_processor import initialize_pdf_processor
+from core.retriever import initialize_retriever
+from core.corpus import initialize_corpus_manager
 from core.ai_client import validate_ai_setup
 from services.chat_service import initialize_chat_service
+from services.ingestion_service import initialize_ingestion_service, shutdown_ingestion_service
 from api.chat import router as chat_router
 from api.health import router as health_router
+from api.documents import router as documents_router
+from api.ingestion import router as ingestion_router
 
 # Configure logging
 logging.basicConfig(
@@ -53,12 +58,23 @@ async def lifespan(app: FastAPI):
             logger.error(f"PDF file not found: {pdf_path}")
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
-        pdf_success = initialize_pdf_processor(str(pdf_path))
+        pdf_success = initialize_pdf_processor(str(pdf_path), background=settings.pdf_progressive_loading)
         if not pdf_success:
             logger.error("Failed to initialize PDF processor")
             raise RuntimeError("PDF processor initialization failed")
         
-        logger.info("✅ PDF processor initialized successfully")
+        if settings.pdf_progressive_loading:
+            # The retrieval index is rebuilt on demand as pages arrive
+            logger.info("✅ PDF processor loading in background")
+        else:
+            logger.info("✅ PDF processor initialized successfully")
+            
+            # Index document chunks for retrieval
+            logger.info("Building document retrieval index...")
+            if not initialize_retriever():
+                raise RuntimeError("Document retrieval index build failed")
+            
+            logger.info("✅ Document retrieval index built successfully")
         
         # Validate AI setup
         logger.info("Validating AI setup...")
@@ -69,11 +85,19 @@ async def lifespan(app: FastAPI):
         
         logger.info("✅ AI setup validated successfully")
         
+        # Register corpus documents (loaded on first use)
+        corpus = initialize_corpus_manager()
+        logger.info(f"✅ Document corpus ready: {corpus.get_stats()['documents']} documents")
+        
         # Initialize chat service
         logger.info("Initializing chat service...")
         chat_service = initialize_chat_service()
         logger.info("✅ Chat service initialized successfully")
         
+        # Start the document ingestion worker pool
+        initialize_ingestion_service()
+        logger.info("✅ Ingestion service started")
+        
         logger.info(f"🚀 {settings.app_name} startup complete!")
         
         yield
@@ -84,6 +108,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    shutdown_ingestion_service()
     logger.info("👋 Application shutdown complete")
 
 
@@ -109,6 +134,8 @@ app.add_middleware(
 # Add routers
 app.include_router(chat_router)
 app.include_router(health_router)
+app.include_router(documents_router)
+app.include_router(ingestion_router)
 
 
 @app.exception_handler(404)
@@ -161,7 +188,10 @@ async def api_info():
             "conversations": "/api/conversations",
             "health": "/health",
             "status": "/status",
-            "pdf_info": "/pdf-info"
+            "pdf_info": "/pdf-info",
+            "pdf_sections": "/pdf-sections",
+            "documents": "/api/documents",
+            "upload": "/api/ingestion/upload"
         },
         "features": [
             "Real-time streaming responses",
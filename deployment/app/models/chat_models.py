@@ -8,6 +8,8 @@ class ChatRequest(BaseModel):
     """Chat message request model."""
     message: str = Field(..., min_length=1, max_length=2000, description="User message")
     conversation_id: Optional[str] = Field(None, description="Optional conversation ID for context")
+    document_id: Optional[str] = Field(None, description="Corpus document to answer from (defaults to the primary PDF)")
+    search_corpus: bool = Field(False, description="Answer from the most relevant documents across the whole corpus")
     
     @validator('message')
     def validate_message(cls, v):
@@ -22,6 +24,13 @@ class ChatRequest(BaseModel):
         if v is not None and len(v.strip()) == 0:
             return None
         return v
+    
+    @validator('document_id')
+    def validate_document_id(cls, v):
+        """Normalize an empty document ID to None."""
+        if v is not None and len(v.strip()) == 0:
+            return None
+        return v.strip() if v else v
 
 
 class ChatMessage(BaseModel):
@@ -69,16 +78,17 @@ class ConversationHistory(BaseModel):
 
 class StreamingResponse(BaseModel):
     """Streaming response chunk model."""
-    type: str = Field(..., description="Response type: 'content', 'error', or 'done'")
+    type: str = Field(..., description="Response type: 'content', 'citations', 'error', or 'done'")
     content: Optional[str] = Field(None, description="Response content")
     conversation_id: Optional[str] = Field(None, description="Conversation ID")
     message_id: Optional[str] = Field(None, description="Message ID")
+    citations: Optional[List[Dict[str, Any]]] = Field(None, description="Sources of the answer, with page and character spans")
     
     @validator('type')
     def validate_type(cls, v):
         """Validate response type."""
-        if v not in ['content', 'error', 'done']:
-            raise ValueError("Type must be 'content', 'error', or 'done'")
+        if v not in ['content', 'citations', 'error', 'done']:
+            raise ValueError("Type must be 'content', 'citations', 'error', or 'done'")
         return v
 
 
@@ -137,16 +147,21 @@ class AppStatus(BaseModel):
     status: str = Field(..., description="Overall status")
     components: Dict[str, bool] = Field(..., description="Component status")
     pdf_info: Optional[PDFInfo] = Field(None, description="PDF document information")
+    query_cache: Optional[Dict[str, Any]] = Field(None, description="Query result cache statistics")
     timestamp: datetime = Field(default_factory=datetime.now, description="Status timestamp")
 
 
-# Bonus Feature Models (for later implementation)
+# Bonus Feature Models
 
 class TokenUsage(BaseModel):
     """Token usage tracking model."""
-    prompt_tokens: int = Field(..., description="Tokens used in prompt")
+    prompt_tokens: int = Field(..., description="Uncached input tokens used in prompt")
     completion_tokens: int = Field(..., description="Tokens used in completion")
+    cache_creation_tokens: int = Field(default=0, description="Input tokens written to the prompt cache")
+    cache_read_tokens: int = Field(default=0, description="Input tokens read from the prompt cache")
     total_tokens: int = Field(..., description="Total tokens used")
+    context_tokens_saved: int = Field(default=0, description="Estimated excerpt tokens left out as near-duplicates")
+    model: Optional[str] = Field(None, description="Model that served the request")
     estimated_cost: Optional[float] = Field(None, description="Estimated API cost")
 
 
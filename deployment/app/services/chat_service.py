@@ -1,7 +1,7 @@
 import logging
 import time
 import uuid
-from typing import Dict, List, Optional, AsyncGenerator
+from typing import Callable, Dict, List, Optional, AsyncGenerator
 from datetime import datetime, timedelta  
 import json
 
@@ -13,6 +13,7 @@ from models.chat_models import (
     ConversationExport
 )
 from core.ai_client import get_ai_client
+from core.token_usage import get_usage_tracker
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,7 @@ class ChatService:
         """Initialize chat service."""
         self.conversations: Dict[str, ConversationHistory] = {}
         self.ai_client = get_ai_client()
+        self.usage_tracker = get_usage_tracker()
         self.token_usage_stats = {
             "total_conversations": 0,
             "total_messages": 0,
@@ -34,10 +36,28 @@ class ChatService:
             "session_start": datetime.now()
         }
         
-    async def process_message_stream(self, message: str, conversation_id: str) -> AsyncGenerator[str, None]:
+    def _usage_recorder(self, conversation_id: str, client_ip: Optional[str] = None):
+        """Build a callback that records response usage against a conversation and client."""
+        def record(usage: TokenUsage):
+            self.usage_tracker.record(usage, conversation_id=conversation_id, client_ip=client_ip)
+            self._sync_token_totals()
+        return record
+    
+    def _sync_token_totals(self):
+        """Mirror tracker totals into the token usage statistics."""
+        totals = self.usage_tracker.get_totals()
+        self.token_usage_stats["total_tokens"] = totals["total_tokens"]
+        self.token_usage_stats["total_cost"] = totals["total_cost"]
+    
+    async def process_message_stream(self, message: str, conversation_id: str,
+                                     client_ip: Optional[str] = None, document_id: Optional[str] = None,
+                                     search_corpus: bool = False,
+                                     on_citations: Optional[Callable[[List[Dict]], None]] = None
+                                     ) -> AsyncGenerator[str, None]:
         """
         Process a user message and return streaming AI response.
-        This is the core method for handling chat interactions.
+        This is the core method for handling chat interactions; on_citations
+        receives the sources the answer draws on.
         """
         try:
             # Get or create conversation
@@ -54,7 +74,10 @@ class ChatService:
             response_content = ""
             start_time = time.time()
             
-            async for chunk in self.ai_client.generate_streaming_response(message, conversation_history):
+            async for chunk in self.ai_client.generate_streaming_response(
+                message, conversation_history, on_usage=self._usage_recorder(conversation_id, client_ip),
+                document_id=document_id, search_corpus=search_corpus, on_citations=on_citations
+            ):
                 if chunk:
                     response_content += chunk
                     yield chunk
@@ -77,7 +100,8 @@ class ChatService:
             logger.error(f"Error in process_message_stream: {e}")
             yield f"I encountered an error: {str(e)}. Please try again."
     
-    async def process_message(self, message: str, conversation_id: str) -> str:
+    async def process_message(self, message: str, conversation_id: str, client_ip: Optional[str] = None,
+                              document_id: Optional[str] = None, search_corpus: bool = False) -> str:
         """
         Process a user message and return complete AI response (non-streaming).
         """
@@ -93,7 +117,10 @@ class ChatService:
             
             # Generate AI response
             start_time = time.time()
-            response = await self.ai_client.generate_response(message, conversation_history)
+            response = await self.ai_client.generate_response(
+                message, conversation_history, on_usage=self._usage_recorder(conversation_id, client_ip),
+                document_id=document_id, search_corpus=search_corpus
+            )
             
             if response:
                 # Add AI response to conversation
@@ -278,8 +305,9 @@ class ChatService:
         
         return "\n".join(lines)
     
-    def get_token_usage_stats(self) -> Dict:
-        """Get token usage statistics (bonus feature)."""
+    def get_token_usage_stats(self, bucket_seconds: Optional[int] = None, top: int = 10) -> Dict:
+        """Get token usage statistics with per-dimension breakdowns and time-bucketed rollups."""
+        self._sync_token_totals()
         uptime = (datetime.now() - self.token_usage_stats["session_start"]).total_seconds()
         
         return {
@@ -288,7 +316,12 @@ class ChatService:
             "avg_messages_per_conversation": (
                 self.token_usage_stats["total_messages"] / max(1, self.token_usage_stats["total_conversations"])
             ),
-            "conversations_active": len(self.conversations)
+            "conversations_active": len(self.conversations),
+            "usage_totals": self.usage_tracker.get_totals(),
+            "by_model": self.usage_tracker.get_breakdown("model", top),
+            "by_conversation": self.usage_tracker.get_breakdown("conversation", top),
+            "by_client": self.usage_tracker.get_breakdown("client", top),
+            "rollups": self.usage_tracker.get_rollups(bucket_seconds)
         }
     
     def get_conversation_count(self) -> int:
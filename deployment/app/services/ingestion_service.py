@@ -0,0 +1,216 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from core.config import get_settings
+from core.corpus import get_corpus_manager
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TERMINAL_STATES = ("completed", "failed")
+
+
+class IngestionJob:
+    """Progress of one uploaded PDF through extraction, chunking and indexing."""
+
+    def __init__(self, document_id: str, path: str, filename: str, size_bytes: int,
+                 extractor: Optional[str] = None):
+        """Initialize a queued job."""
+        self.job_id = str(uuid.uuid4())
+        self.document_id = document_id
+        self.path = path
+        self.filename = filename
+        self.size_bytes = size_bytes
+        self.extractor = extractor
+        self.status = "queued"  # queued, extracting, indexing, completed or failed
+        self.pages_processed = 0
+        self.total_pages = 0
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # Incremented on every change so progress streams know when to emit
+        self.revision = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> Dict:
+        """Serialize for API responses and progress events."""
+        return {
+            "job_id": self.job_id,
+            "document_id": self.document_id,
+            "filename": self.filename,
+            "size_bytes": self.size_bytes,
+            "extractor": self.extractor,
+            "status": self.status,
+            "pages_processed": self.pages_processed,
+            "total_pages": self.total_pages,
+            "progress": round(self.progress, 4),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class IngestionService:
+    """
+    Runs PDF ingestion jobs in a thread pool so uploads return immediately.
+    Each job registers the file with the corpus, extracts it (into the shared
+    extraction cache) and builds its retrieval index; the document is
+    queryable as soon as the job completes.
+    """
+
+    def __init__(self, workers: int, job_history: int):
+        """Initialize the worker pool and job registry."""
+        self.job_history = job_history
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ingestion")
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        # Documents whose upload is being saved; their job is submitted once it is on disk
+        self._reserved: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def reserve(self, document_id: str) -> bool:
+        """
+        Claim a document for an upload about to be saved, so a concurrent
+        upload of the same document is refused before it overwrites the file.
+        Returns False when the document is already reserved or being ingested.
+        """
+        with self._lock:
+            if document_id in self._reserved or self._has_active_job(document_id):
+                return False
+            self._reserved.add(document_id)
+            return True
+
+    def release(self, document_id: str):
+        """Give up a reservation whose upload was not submitted."""
+        with self._lock:
+            self._reserved.discard(document_id)
+
+    def submit(self, document_id: str, path: str, filename: str, size_bytes: int,
+               extractor: Optional[str] = None) -> IngestionJob:
+        """
+        Queue a saved PDF for ingestion, optionally with a specific extraction
+        backend, taking over the document's reservation if it has one.
+        Raises ValueError when the document already has an unfinished job.
+        """
+        job = IngestionJob(document_id, path, filename, size_bytes, extractor)
+        with self._lock:
+            self._reserved.discard(document_id)
+            if self._has_active_job(document_id):
+                raise ValueError(f"Document is already being ingested: {document_id}")
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        logger.info(f"Queued ingestion job {job.job_id} for document {document_id}")
+        return job
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the history limit."""
+        excess = len(self._jobs) - self.job_history
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _update(self, job: IngestionJob, **changes):
+        """Apply changes to a job, bumping its revision if anything changed."""
+        with self._lock:
+            changed = {name: value for name, value in changes.items() if getattr(job, name) != value}
+            for name, value in changed.items():
+                setattr(job, name, value)
+            if changed:
+                job.revision += 1
+
+    def _run(self, job: IngestionJob):
+        """Ingest one document on a worker thread."""
+        self._update(job, status="extracting", started_at=datetime.now())
+
+        def on_progress(stage: str, load_progress: Dict):
+            self._update(
+                job,
+                status=stage,
+                pages_processed=load_progress["pages_processed"],
+                total_pages=load_progress["total_pages"],
+                progress=load_progress["progress"]
+            )
+
+        try:
+            document = get_corpus_manager().ingest(
+                job.path, job.document_id, on_progress=on_progress, extractor=job.extractor
+            )
+            self._update(
+                job,
+                status="completed",
+                pages_processed=document.total_pages or job.pages_processed,
+                total_pages=document.total_pages or job.total_pages,
+                progress=1.0,
+                finished_at=datetime.now()
+            )
+            logger.info(f"Ingestion job {job.job_id} completed: {job.document_id}")
+
+        except Exception as e:
+            logger.error(f"Ingestion job {job.job_id} failed: {e}")
+            self._update(job, status="failed", error=str(e), finished_at=datetime.now())
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        """Get a job by id."""
+        return self._jobs.get(job_id)
+
+    def has_active_job(self, document_id: str) -> bool:
+        """Whether a document already has an unfinished ingestion job."""
+        with self._lock:
+            return self._has_active_job(document_id)
+
+    def _has_active_job(self, document_id: str) -> bool:
+        """has_active_job, with the lock held."""
+        return any(job.document_id == document_id and not job.finished for job in self._jobs.values())
+
+    def list_jobs(self) -> List[Dict]:
+        """List known jobs, newest first."""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def shutdown(self):
+        """Stop accepting jobs and abandon queued ones."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Ingestion service stopped")
+
+
+# Global ingestion service instance
+_ingestion_service: Optional[IngestionService] = None
+
+
+def get_ingestion_service() -> IngestionService:
+    """Get the global ingestion service instance."""
+    global _ingestion_service
+
+    if _ingestion_service is None:
+        _ingestion_service = IngestionService(settings.ingestion_workers, settings.ingestion_job_history)
+        logger.info("Ingestion service initialized")
+
+    return _ingestion_service
+
+
+def initialize_ingestion_service() -> IngestionService:
+    """Initialize and return the ingestion service."""
+    global _ingestion_service
+    _ingestion_service = IngestionService(settings.ingestion_workers, settings.ingestion_job_history)
+    logger.info("Ingestion service initialized")
+    return _ingestion_service
+
+
+def shutdown_ingestion_service():
+    """Stop the global ingestion service, if running."""
+    if _ingestion_service is not None:
+        _ingestion_service.shutdown()
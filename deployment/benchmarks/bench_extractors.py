@@ -0,0 +1,139 @@
+"""
+Benchmark the PDF text extraction backends for throughput and fidelity.
+
+Runs every installed backend (pdfplumber, pdfminer, pypdf) over the bundled
+accessibility_guide.pdf and over generated PDFs (200 and 1000 pages by
+default), cleaning the output the way PDFProcessor does. Fidelity is scored
+against a reference text: the known generated text for synthetic PDFs and
+pdfplumber's output for the bundled guide.
+
+  token F1   overlap of the word multisets (missing or garbled words)
+  bigram F1  overlap of adjacent word pairs (reading order and run-together words)
+
+Usage:
+    python deployment/benchmarks/bench_extractors.py [--pages 200,1000] [--pdf other.pdf]
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+import pdfplumber
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from core.extractors import available_extractors, get_extractor
+from core.pdf_processor import PDFProcessor
+
+
+GUIDE_PATH = Path(__file__).resolve().parent.parent / "documents" / "accessibility_guide.pdf"
+
+WORDS = (
+    "accessible travel wheelchair ramp airline airport hotel service animal regulation law "
+    "passenger assistance boarding elevator signage braille transport rail station cruise"
+).split()
+
+
+def generate_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 42) -> Dict[int, str]:
+    """Write a text-heavy PDF and return the exact text drawn on each page."""
+    rng = random.Random(seed)
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    expected = {}
+    for page in range(1, pages + 1):
+        lines = [f"Section {page}: {rng.choice(WORDS).title()} requirements"]
+        lines += [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+        y = 750
+        for line in lines:
+            pdf.drawString(40, y, line)
+            y -= 15
+        pdf.showPage()
+        expected[page] = "\n".join(lines)
+    pdf.save()
+    return expected
+
+
+def extract(backend: str, pdf_path: Path, page_count: int) -> tuple:
+    """Extract and clean every page with a backend; returns (seconds, {page: text})."""
+    extractor = get_extractor(backend)
+    start = time.perf_counter()
+    texts = {
+        page_num: PDFProcessor._clean_text(raw_text or "")
+        for page_num, raw_text in extractor.extract(str(pdf_path), range(1, page_count + 1))
+    }
+    return time.perf_counter() - start, texts
+
+
+def f1(reference: Counter, candidate: Counter) -> float:
+    """F1 of two multisets."""
+    overlap = sum((reference & candidate).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate.values())
+    recall = overlap / sum(reference.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def fidelity(reference: Dict[int, str], candidate: Dict[int, str]) -> tuple:
+    """Token and bigram F1 of candidate page texts against reference texts."""
+    reference_tokens: List[str] = []
+    candidate_tokens: List[str] = []
+    reference_bigrams: Counter = Counter()
+    candidate_bigrams: Counter = Counter()
+    for page_num, text in reference.items():
+        words = text.split()
+        other = candidate.get(page_num, "").split()
+        reference_tokens += words
+        candidate_tokens += other
+        reference_bigrams.update(zip(words, words[1:]))
+        candidate_bigrams.update(zip(other, other[1:]))
+    return f1(Counter(reference_tokens), Counter(candidate_tokens)), f1(reference_bigrams, candidate_bigrams)
+
+
+def run(label: str, pdf_path: Path, reference: Optional[Dict[int, str]], backends: List[str]):
+    """Benchmark every backend on one PDF."""
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+
+    print(f"\n{label}: {page_count} pages")
+    print(f"{'backend':>11} {'seconds':>9} {'pages/s':>9} {'token F1':>9} {'bigram F1':>10}")
+    results = {}
+    for backend in backends:
+        results[backend] = extract(backend, pdf_path, page_count)
+    if reference is None:
+        reference = results.get("pdfplumber", next(iter(results.values())))[1]
+
+    for backend, (seconds, texts) in results.items():
+        token_f1, bigram_f1 = fidelity(reference, texts)
+        print(f"{backend:>11} {seconds:>9.2f} {page_count / seconds:>9.1f} {token_f1:>9.3f} {bigram_f1:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="200,1000", help="comma-separated page counts of synthetic PDFs")
+    parser.add_argument("--backends", default=",".join(available_extractors()))
+    parser.add_argument("--pdf", help="additional PDF to benchmark (scored against pdfplumber)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    backends = [name for name in args.backends.split(",") if name.strip()]
+
+    run("accessibility_guide.pdf (reference: pdfplumber)", GUIDE_PATH, None, backends)
+    if args.pdf:
+        run(f"{Path(args.pdf).name} (reference: pdfplumber)", Path(args.pdf), None, backends)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in [int(value) for value in args.pages.split(",") if value.strip()]:
+            pdf_path = Path(tmp) / f"synthetic-{pages}.pdf"
+            expected = generate_pdf(pdf_path, pages)
+            run(f"synthetic-{pages}.pdf (reference: generated text)", pdf_path, expected, backends)
+
+
+if __name__ == "__main__":
+    main()
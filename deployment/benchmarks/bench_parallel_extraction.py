@@ -0,0 +1,91 @@
+"""
+Benchmark serial vs. process-pool page extraction in PDFProcessor.
+
+Generates a multi-page text PDF (500 pages by default) and times load_pdf
+for each worker count, with the extraction cache disabled.
+
+Usage:
+    python deployment/benchmarks/bench_parallel_extraction.py [--pages 500] [--workers 1,2,4]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from core.pdf_processor import PDFProcessor
+
+
+WORDS = (
+    "accessible travel wheelchair ramp airline airport hotel service animal regulation law "
+    "passenger assistance boarding elevator signage braille transport rail station cruise"
+).split()
+
+
+def generate_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 42):
+    """Write a text-heavy PDF with the given number of pages."""
+    rng = random.Random(seed)
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for page in range(1, pages + 1):
+        y = 750
+        pdf.drawString(40, y, f"Section {page}: {rng.choice(WORDS).title()} requirements")
+        for _ in range(lines_per_page):
+            y -= 15
+            pdf.drawString(40, y, " ".join(rng.choice(WORDS) for _ in range(14)))
+        pdf.showPage()
+    pdf.save()
+
+
+def time_extraction(pdf_path: Path, workers: int) -> tuple:
+    """Load the PDF with the given worker count and return (seconds, pages)."""
+    processor = PDFProcessor(str(pdf_path), extraction_cache=None, workers=workers, parallel_min_pages=0)
+    start = time.perf_counter()
+    if not processor.load_pdf():
+        raise RuntimeError("Extraction failed")
+    return time.perf_counter() - start, processor.get_pages()
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, *[2 ** i for i in range(1, cpu_count.bit_length()) if 2 ** i <= cpu_count], cpu_count})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)),
+                        help="comma-separated worker counts to compare")
+    parser.add_argument("--pdf", help="existing PDF to use instead of generating one")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    worker_counts = [int(value) for value in args.workers.split(",") if value.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(args.pdf) if args.pdf else Path(tmp) / "benchmark.pdf"
+        if not args.pdf:
+            print(f"Generating {args.pages}-page PDF...")
+            generate_pdf(pdf_path, args.pages)
+
+        print(f"CPU cores: {cpu_count}")
+        print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+
+        baseline_seconds = None
+        baseline_pages = None
+        for workers in worker_counts:
+            seconds, pages = time_extraction(pdf_path, workers)
+            if baseline_seconds is None:
+                baseline_seconds, baseline_pages = seconds, pages
+            elif pages != baseline_pages:
+                raise RuntimeError(f"Output with {workers} workers differs from the baseline")
+            print(f"{workers:>8} {seconds:>9.2f} {len(pages) / seconds:>9.1f} {baseline_seconds / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark the PDF pipeline end to end on a synthetic corpus.
+
+Generates a seeded corpus with backend/create_full_pdf.py (or reuses one
+given with --corpus), then for every document measures:
+
+  extraction   pages/sec of PDFProcessor.load_pdf (no extraction cache)
+  index build  seconds to chunk and index the document for retrieval
+  queries      retrieval latency percentiles over the manifest's questions,
+               and how often a result lands in the section that answers it
+
+Peak RSS covers this process and, separately, extraction worker processes.
+
+Usage:
+    python deployment/benchmarks/bench_pipeline.py [--documents 3] [--pages 300] [--sections 30]
+    python deployment/benchmarks/bench_pipeline.py --corpus path/to/corpus [--extractor pypdf]
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT / "deployment" / "app"))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from create_full_pdf import create_corpus
+
+from core.config import get_settings
+from core.pdf_processor import PDFProcessor
+from core.retriever import DocumentRetriever
+
+
+settings = get_settings()
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB (ru_maxrss is in KB on Linux)."""
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(corpus_dir: Path, extractor: str, workers: int, vector_dimensions: int):
+    """Ingest every document in a corpus and time extraction, indexing and queries."""
+    manifest = json.loads((corpus_dir / "manifest.json").read_text())
+    queries = {}
+    for query in manifest["queries"]:
+        queries.setdefault(query["document"], []).append(query)
+
+    print(f"Extractor: {extractor}, workers: {workers}, vector dimensions: {vector_dimensions or 'off'}")
+    print(f"{'document':>14} {'pages':>6} {'extract s':>10} {'pages/s':>8} {'index s':>8} {'chunks':>7} "
+          f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'hit rate':>9}")
+
+    latencies = []
+    hits = 0
+    total_pages = 0
+    total_extract = 0.0
+    for document in manifest["documents"]:
+        start = time.perf_counter()
+        processor = PDFProcessor(str(corpus_dir / document["file"]), None, workers=workers,
+                                 parallel_min_pages=settings.pdf_parallel_min_pages, extractor=extractor)
+        if not processor.load_pdf():
+            print(f"{document['file']:>14} failed: {processor.load_error}")
+            continue
+        extract_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        retriever = DocumentRetriever(processor, settings.retrieval_chunk_tokens,
+                                      settings.retrieval_chunk_overlap_tokens, vector_dimensions)
+        index_seconds = time.perf_counter() - start
+
+        document_latencies = []
+        document_hits = 0
+        for query in queries.get(document["file"], []):
+            start = time.perf_counter()
+            chunks = retriever.retrieve(query["query"])
+            document_latencies.append((time.perf_counter() - start) * 1000)
+            first, last = query["pages"]
+            if any(chunk.start_page is not None and chunk.start_page <= last and (chunk.end_page or chunk.start_page) >= first
+                   for chunk in chunks):
+                document_hits += 1
+
+        pages = processor.get_summary_stats().get("total_pages", 0)
+        total_pages += pages
+        total_extract += extract_seconds
+        latencies += document_latencies
+        hits += document_hits
+        timing = (f"{statistics.median(document_latencies):>7.2f} {percentile(document_latencies, 0.95):>7.2f} "
+                  f"{percentile(document_latencies, 0.99):>7.2f} {document_hits / len(document_latencies):>9.2%}"
+                  if document_latencies else f"{'-':>7} {'-':>7} {'-':>7} {'-':>9}")
+        print(f"{document['file']:>14} {pages:>6} {extract_seconds:>10.2f} {pages / extract_seconds:>8.1f} "
+              f"{index_seconds:>8.2f} {retriever.get_stats()['chunks']:>7} {timing}")
+
+    if latencies:
+        print(f"\nAll documents: {total_pages / total_extract:.1f} pages/s, query p50 {statistics.median(latencies):.2f} ms, "
+              f"p95 {percentile(latencies, 0.95):.2f} ms, p99 {percentile(latencies, 0.99):.2f} ms, "
+              f"hit rate {hits / len(latencies):.2%}")
+    print(f"Peak RSS: {peak_rss_mb(resource.RUSAGE_SELF):.1f} MB (this process), "
+          f"{peak_rss_mb(resource.RUSAGE_CHILDREN):.1f} MB (largest extraction worker)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="existing corpus directory with manifest.json (default: generate one)")
+    parser.add_argument("--documents", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=300, help="pages per generated document")
+    parser.add_argument("--sections", type=int, default=30, help="sections per generated document")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--extractor", default=settings.pdf_extractor)
+    parser.add_argument("--workers", type=int, default=settings.pdf_extraction_workers or os.cpu_count() or 1)
+    parser.add_argument("--vector-dimensions", type=int,
+                        default=settings.vector_dimensions if settings.vector_search_enabled else 0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.corpus:
+        run(Path(args.corpus), args.extractor, args.workers, args.vector_dimensions)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        create_corpus(tmp, args.documents, args.pages, args.sections, args.seed)
+        print(f"Generated corpus in {time.perf_counter() - start:.1f} s\n")
+        run(Path(tmp), args.extractor, args.workers, args.vector_dimensions)
+
+
+if __name__ == "__main__":
+    main()
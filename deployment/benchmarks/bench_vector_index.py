@@ -0,0 +1,92 @@
+"""
+Benchmark building and querying the local chunk vector index.
+
+Generates synthetic chunks (1k, 10k and 100k by default), builds a
+memory-mapped VectorIndex for each size and reports build time, file size
+and query latency percentiles.
+
+Usage:
+    python deployment/benchmarks/bench_vector_index.py [--sizes 1000,10000,100000] [--dimensions 1024]
+"""
+import argparse
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from core.vector_index import VectorIndex
+
+
+WORDS = (
+    "accessible travel wheelchair ramp airline airport hotel service animal regulation law "
+    "passenger assistance boarding elevator signage braille transport rail station cruise "
+    "museum gallery tactile audio guide hearing loop captioning seating restroom parking "
+    "europe canada australia japan disability rights complaint booking notice companion"
+).split()
+
+QUERIES = [
+    "wheelchair boarding assistance at the airport",
+    "service animals on cruise ships",
+    "tactile and audio guides in museums",
+    "how do I file a disability complaint",
+    "accessible hotel rooms with roll-in showers",
+    "rail station elevators and ramps",
+]
+
+
+def generate_chunks(count: int, words_per_chunk: int, seed: int = 42) -> list:
+    """Random chunks of text drawn from the travel vocabulary."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_chunk)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated chunk counts")
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--words", type=int, default=80, help="words per synthetic chunk")
+    parser.add_argument("--queries", type=int, default=200, help="queries timed per size")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+
+    print(f"Dimensions: {args.dimensions}, words per chunk: {args.words}")
+    print(f"{'chunks':>8} {'build s':>9} {'file MB':>8} {'load ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            chunks = generate_chunks(size, args.words)
+            path = Path(tmp) / f"vectors-{size}.npy"
+
+            start = time.perf_counter()
+            VectorIndex(args.dimensions).build(size, chunks.__getitem__, path)
+            build_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index = VectorIndex.load(path, args.dimensions)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            # Warm the page cache and the query term memo before timing
+            index.search(QUERIES[0], top_k=5)
+            latencies = []
+            for i in range(args.queries):
+                start = time.perf_counter()
+                index.search(QUERIES[i % len(QUERIES)], top_k=5)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+
+            print(
+                f"{size:>8} {build_seconds:>9.2f} {path.stat().st_size / 1024 / 1024:>8.1f} {load_ms:>8.2f} "
+                f"{statistics.median(latencies):>8.2f} {latencies[int(len(latencies) * 0.95) - 1]:>8.2f}"
+            )
+            del index
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other relative to the app directory, as under uvicorn
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
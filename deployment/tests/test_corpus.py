@@ -0,0 +1,52 @@
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from core import corpus
+from core.corpus import CorpusManager
+from core.extraction_cache import ExtractionCache
+
+
+def _write_pdf(path, lines):
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for line in lines:
+        pdf.drawString(40, 750, line)
+        pdf.showPage()
+    pdf.save()
+
+
+def _corpus(tmp_path, monkeypatch, memory_limit_bytes=1024 * 1024 * 1024):
+    """A corpus over three PDFs in one directory, with its own extraction cache and registry."""
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(corpus, "get_extraction_cache", lambda: cache)
+    directory = tmp_path / "pdfs"
+    directory.mkdir()
+    # Ferries are on every page of one document, so they score low there, and on two pages of another
+    _write_pdf(directory / "ferries.pdf", [f"Ferry boarding rule {n} for ferry passengers." for n in range(6)])
+    ramp_pages = [f"Ramp width rule {n} at stations." for n in range(3)]
+    _write_pdf(directory / "ramps.pdf", ["A ferry gangway needs a ramp."] + ramp_pages + ["Ferry ramps fold away."] + ramp_pages)
+    _write_pdf(directory / "taxis.pdf", ["Taxi fares for accessible taxis."])
+    manager = CorpusManager(memory_limit_bytes, str(tmp_path / "registry.json"))
+    manager.scan_directory(str(directory))
+    return manager
+
+
+def test_scanned_documents_are_routed_without_staying_loaded(tmp_path, monkeypatch):
+    manager = _corpus(tmp_path, monkeypatch, memory_limit_bytes=0)
+
+    assert manager.get_stats()["resident_documents"] == 0
+
+    results = manager.retrieve("taxi fares")
+
+    assert {chunk.document_id for chunk in results} == {"taxis"}
+    assert [manager._documents[document_id].loads for document_id in ("ferries", "ramps")] == [0, 0]
+
+
+def test_corpus_ranking_merges_documents_by_rank(tmp_path, monkeypatch):
+    monkeypatch.setattr(corpus.settings, "vector_search_enabled", False)
+    monkeypatch.setattr(corpus.settings, "retrieval_chunk_tokens", 12)
+    monkeypatch.setattr(corpus.settings, "retrieval_chunk_overlap_tokens", 0)
+    manager = _corpus(tmp_path, monkeypatch)
+
+    results = manager.retrieve("ferry", top_k=2)
+
+    assert sorted(chunk.document_id for chunk in results) == ["ferries", "ramps"]
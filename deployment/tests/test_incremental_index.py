@@ -0,0 +1,180 @@
+import pickle
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from core import pdf_processor, retriever
+from core.extraction_cache import ExtractionCache
+from core.pdf_processor import PDFProcessor
+from core.retriever import DocumentRetriever
+from core.search_index import InvertedIndex
+
+TOPICS = ["service animals", "wheelchair trains", "hotel ramps", "cruise ships", "taxi rules", "museum signage"]
+
+
+def _write_pdf(path, pages=12, revised=(), inserted_at=None):
+    """A PDF with one topic per page; revised pages mention zeppelins, an inserted page gondolas."""
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for page in range(pages):
+        if page == inserted_at:
+            pdf.drawString(40, 750, "Inserted page about gondola lifts.")
+            pdf.showPage()
+        extra = " Revised for zeppelin travel." if page in revised else ""
+        pdf.drawString(40, 750, f"Section {page} covers {TOPICS[page % len(TOPICS)]} for passengers.{extra}")
+        pdf.showPage()
+    pdf.save()
+
+
+def _index_of(documents):
+    index = InvertedIndex()
+    for doc_id, text in documents.items():
+        index.add_document(doc_id, text)
+    return index
+
+
+def _ranking(processor, query):
+    return [(hit["page_number"], round(hit["score"], 6)) for hit in processor.search_text(query)]
+
+
+def _assert_matches_full_extraction(processor, path):
+    fresh = PDFProcessor(str(path))
+    assert fresh.load_pdf()
+    assert processor.get_pages() == fresh.get_pages()
+    for query in ["cruise ships", "zeppelin", "gondola", '"hotel ramps"']:
+        assert _ranking(processor, query) == _ranking(fresh, query)
+
+
+def test_remove_document_drops_only_its_postings():
+    index = InvertedIndex()
+    index.add_document(1, "wheelchair ramps at the station")
+    index.add_document(2, "ramps on the cruise ship")
+
+    index.remove_document(1)
+
+    assert index.terms() == _index_of({2: "ramps on the cruise ship"}).terms()
+    assert index.get_stats() == _index_of({2: "ramps on the cruise ship"}).get_stats()
+    assert [hit.doc_id for hit in index.search("ramps")] == [2]
+
+
+def test_re_adding_a_document_replaces_it():
+    index = _index_of({1: "wheelchair ramps", 2: "cruise ship cabins"})
+
+    index.add_document(1, "guide dogs on trains")
+
+    expected = _index_of({1: "guide dogs on trains", 2: "cruise ship cabins"})
+    assert index.get_stats() == expected.get_stats()
+    assert index.search("wheelchair") == []
+    assert [hit.doc_id for hit in index.search("trains")] == [1]
+
+
+def test_copy_is_updated_independently():
+    index = _index_of({1: "wheelchair ramps", 2: "cruise ship cabins"})
+
+    clone = index.copy()
+    clone.remove_document(1)
+    clone.add_document(3, "wheelchair taxis")
+
+    assert [hit.doc_id for hit in index.search("wheelchair")] == [1]
+    assert [hit.doc_id for hit in clone.search("wheelchair")] == [3]
+    assert index.get_stats()["documents"] == 2
+
+
+def test_index_pickled_without_term_lists_can_remove_documents():
+    index = _index_of({1: "wheelchair ramps", 2: "cruise ship ramps"})
+    del index._doc_terms
+
+    restored = pickle.loads(pickle.dumps(index))
+    restored.remove_document(2)
+
+    assert restored.get_stats() == _index_of({1: "wheelchair ramps"}).get_stats()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "cache"))
+
+
+def test_reload_from_cache_reextracts_only_changed_pages(tmp_path, cache):
+    path = tmp_path / "guide.pdf"
+    _write_pdf(path)
+    assert PDFProcessor(str(path), cache).load_pdf()
+
+    _write_pdf(path, revised=(3,), inserted_at=6)
+    processor = PDFProcessor(str(path), cache)
+    assert processor.load_pdf()
+
+    assert processor.get_load_progress()["pages_reused"] == 11
+    _assert_matches_full_extraction(processor, path)
+
+
+@pytest.mark.parametrize("extractor, workers", [("pdfminer", 1), ("pypdf", 1), ("pypdf", 2)])
+def test_other_backends_hash_pages_without_pdfplumber(tmp_path, cache, monkeypatch, extractor, workers):
+    def fail_open(*args, **kwargs):
+        raise AssertionError("pdfplumber opened")
+    monkeypatch.setattr(pdf_processor.pdfplumber, "open", fail_open)
+    path = tmp_path / "guide.pdf"
+    _write_pdf(path)
+    first = PDFProcessor(str(path), cache, workers=workers, parallel_min_pages=2, extractor=extractor)
+    assert first.load_pdf()
+    assert first.get_metadata()["total_pages"] == 12
+
+    _write_pdf(path, revised=(3,), inserted_at=6)
+    processor = PDFProcessor(str(path), cache, extractor=extractor)
+    assert processor.load_pdf()
+
+    assert processor.get_load_progress()["pages_reused"] == 11
+
+
+def test_in_memory_reload_swaps_index_and_pages_together(tmp_path, cache):
+    path = tmp_path / "guide.pdf"
+    _write_pdf(path)
+    processor = PDFProcessor(str(path), cache)
+    assert processor.load_pdf()
+    live_index = processor._search_index
+    live_store = processor._page_store
+    live_terms = live_index.terms()
+
+    _write_pdf(path, revised=(3, 8))
+    assert processor.load_pdf()
+
+    # The index searched before the reload was never modified
+    assert processor._search_index is not live_index
+    assert live_index.terms() == live_terms
+    assert live_store._file.closed
+    _assert_matches_full_extraction(processor, path)
+
+
+def test_reload_from_cache_closes_the_replaced_page_store(tmp_path, cache):
+    path = tmp_path / "guide.pdf"
+    _write_pdf(path)
+    processor = PDFProcessor(str(path), cache)
+    assert processor.load_pdf()
+    live_store = processor._page_store
+
+    assert processor.load_pdf()
+
+    assert processor._page_store is not live_store
+    assert live_store._file.closed
+    assert "service animals" in processor.get_page_text(1)
+
+
+def test_replaced_pages_rebuild_the_retriever_while_loading(tmp_path, cache, monkeypatch):
+    monkeypatch.setattr(retriever.settings, "retriever_rebuild_pages", 1000)
+    monkeypatch.setattr(retriever.settings, "retriever_rebuild_seconds", 3600)
+    path = tmp_path / "guide.pdf"
+    _write_pdf(path)
+    processor = PDFProcessor(str(path), cache)
+    assert processor.load_pdf()
+    built = DocumentRetriever(processor, 200, 20)
+
+    # Appending a page mid-load waits for more pages
+    processor.load_state = "loading"
+    processor._add_pages([{"page_number": 13, "text": "Appendix on ferry docks.", "word_count": 4}], 13)
+    assert not retriever._rebuild_due(built, processor)
+
+    # An incremental reload, still marked as loading, replaces the pages the retriever's offsets point into
+    _write_pdf(path, inserted_at=2)
+    assert processor.load_pdf()
+    processor.load_state = "loading"
+    assert retriever._rebuild_due(built, processor)
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from api import ingestion
+from services import ingestion_service
+from services.ingestion_service import IngestionService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """An ingestion service whose jobs stay active until the test ends."""
+    release = threading.Event()
+    corpus = SimpleNamespace(list_documents=lambda: [], ingest=lambda *args, **kwargs: release.wait(5))
+    monkeypatch.setattr(ingestion_service, "get_corpus_manager", lambda: corpus)
+    monkeypatch.setattr(ingestion, "get_corpus_manager", lambda: corpus)
+    monkeypatch.setattr(ingestion.settings, "upload_dir", str(tmp_path / "uploads"))
+    service = IngestionService(2, 10)
+    monkeypatch.setattr(ingestion, "get_ingestion_service", lambda: service)
+    yield service
+    release.set()
+    service.shutdown()
+
+
+def _upload(content):
+    return ingestion.upload_document(UploadFile(BytesIO(content), filename="guide.pdf"), None, None)
+
+
+def test_concurrent_uploads_of_one_document_queue_one_job(service):
+    async def upload_twice():
+        return await asyncio.gather(_upload(b"%PDF-1.4 first"), _upload(b"%PDF-1.4 second"), return_exceptions=True)
+
+    results = asyncio.run(upload_twice())
+
+    accepted = [result for result in results if not isinstance(result, Exception)]
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    assert len(accepted) == 1 and [error.status_code for error in rejected] == [409]
+    assert len(service.list_jobs()) == 1
+
+
+def test_failed_upload_releases_the_document(service):
+    with pytest.raises(HTTPException):
+        asyncio.run(_upload(b"not a pdf"))
+
+    assert asyncio.run(_upload(b"%PDF-1.4 retry"))["job"]["document_id"] == "guide"
+    with pytest.raises(ValueError):
+        service.submit("guide", "guide.pdf", "guide.pdf", 10)